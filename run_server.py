@@ -3,68 +3,11 @@ import os
 import sys
 import subprocess
 import logging
-import django
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-def init_db():
-    """Initialize the database with migrations."""
-    try:
-        # Setup Django environment
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sign_language_project.settings')
-        django.setup()
-        
-        from django.db import connection
-        
-        # Check existing tables
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
-            logger.info(f"Existing tables: {[t[0] for t in tables]}")
-        
-        # Apply migrations
-        from django.core.management import execute_from_command_line
-        
-        logger.info("Creating migrations...")
-        execute_from_command_line(['manage.py', 'makemigrations', 'translator'])
-        
-        logger.info("Applying migrations...")
-        execute_from_command_line(['manage.py', 'migrate'])
-        
-        # Verify tables after migration
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-            tables = cursor.fetchall()
-            logger.info(f"Tables after migration: {[t[0] for t in tables]}")
-        
-        # Check if required tables exist
-        required_tables = ['translator_trainedmodel', 'translator_translationsession', 'translator_signvideo']
-        missing_tables = [table for table in required_tables if table not in [t[0] for t in tables]]
-        
-        if missing_tables:
-            logger.error(f"Missing required tables: {missing_tables}")
-            return False
-        else:
-            logger.info("All required tables exist!")
-            
-        # Create default admin user
-        from django.contrib.auth.models import User
-        if not User.objects.filter(username='BEKFURR').exists():
-            user = User.objects.create_superuser('BEKFURR', 'bekfurr@example.com', 'BEKFURR')
-            logger.info("Created default admin user: BEKFURR")
-        else:
-            logger.info("Default admin user already exists.")
-            
-        logger.info("Database initialization completed successfully!")
-        return True
-    except Exception as e:
-        logger.error(f"Error initializing database: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return False
-
 def create_static_directory():
     """Create the static directory if it doesn't exist."""
     try:
@@ -81,10 +24,13 @@ def create_static_directory():
         return False
 
 def main():
-    """Run the Django server with Daphne for WebSocket support."""
-    # Initialize database
-    logger.info("Initializing database...")
-    init_db()
+    """
+    Run the Django server with Daphne for WebSocket support.
+    The server process migrates (only when needed) and warms up on import of
+    the application; see translator/startup.py.
+    """
+    # Set Django settings module
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sign_language_project.settings')
     
     # Create static directory
     create_static_directory()
@@ -97,10 +43,6 @@ def main():
         daphne_path = subprocess.check_output(['which', 'daphne']).decode().strip()
         logger.info(f"Found Daphne at: {daphne_path}")
         
-        # Initialize Django before starting Daphne
-        os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sign_language_project.settings')
-        django.setup()
-        
         logger.info(f"Starting server with Daphne for WebSocket support on port {port}...")
         
         # Run Daphne server with the PORT environment variable
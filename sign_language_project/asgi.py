@@ -8,14 +8,23 @@ django.setup()  # This is the key line that was missing
 # Now import the rest after Django is set up
 from django.core.asgi import get_asgi_application
 from channels.routing import ProtocolTypeRouter, URLRouter
-from channels.auth import AuthMiddlewareStack
 import translator.routing
+from django.conf import settings
+from translator.jobs import job_queue
+from translator.startup import startup
+
+# Migrate only if needed and resolve the auto-login user once; detectors and
+# models are warmed in the background so the server binds immediately
+startup.run()
+
+# Resume jobs queued or interrupted before the last restart
+if settings.JOB_RUN_IN_PROCESS:
+    job_queue.start()
 
 application = ProtocolTypeRouter({
     "http": get_asgi_application(),
-    "websocket": AuthMiddlewareStack(
-        URLRouter(
-            translator.routing.websocket_urlpatterns
-        )
+    # No session or user lookup per connection: realtime sessions use the default user
+    "websocket": URLRouter(
+        translator.routing.websocket_urlpatterns
     ),
 })
@@ -1,31 +1,22 @@
-from django.contrib.auth.models import User
+from django.conf import settings
 from django.contrib.auth import login
+from translator.schema import default_user
 
 class AutoLoginMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.exempt_paths = tuple(settings.AUTO_LOGIN_EXEMPT_PATHS)
 
     def __call__(self, request):
-        # Auto-login if not authenticated
-        if not request.user.is_authenticated:
+        # Hot endpoints never touch the session or the user tables
+        if not request.path.startswith(self.exempt_paths) and not request.user.is_authenticated:
             try:
-                # Get or create default user
-                user, created = User.objects.get_or_create(
-                    username='BEKFURR',
-                    defaults={
-                        'email': 'bekfurr@example.com',
-                        'is_staff': True,
-                        'is_superuser': True,
-                    }
-                )
-                if created:
-                    user.set_password('BEKFURR')
-                    user.save()
-                
-                # Login the user
-                login(request, user)
+                # Default user is resolved once per process
+                user = default_user()
+                if user is not None:
+                    login(request, user)
             except Exception as e:
                 print(f"Auto-login error: {e}")
-        
+
         response = self.get_response(request)
         return response
@@ -70,9 +70,21 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open between requests so the PRAGMAs below are applied once per thread
+        'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# SQLite tuning applied to every new connection (translator/signals.py), in this order
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),  # ms a writer waits for the lock instead of failing
+    'journal_mode': os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),  # readers and the writer no longer block each other
+    'synchronous': 'NORMAL',  # durable with WAL; fsync only at checkpoints
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),  # bytes of the file read through mmap
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_KB', 64 * 1024)),  # page cache per connection (negative: KiB)
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -127,11 +139,82 @@ CHANNEL_LAYERS = {
 SESSION_COOKIE_SECURE = False  # Changed to False for better compatibility
 SESSION_COOKIE_SAMESITE = 'Lax'  # Changed to Lax for better compatibility
 
-# Session settings
-SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+# Session settings: 'cached_db' reads sessions from the cache and writes through to the
+# database, 'signed_cookies' keeps them in the cookie with no database access, 'db' is uncached
+SESSION_STORE = os.environ.get('SESSION_STORE', 'cached_db')
+SESSION_ENGINE = f'django.contrib.sessions.backends.{SESSION_STORE}'
 SESSION_COOKIE_AGE = 86400  # 24 hours in seconds
 
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
     'django.contrib.auth.backends.ModelBackend',
 ]
+
+# Rows per page on the dashboard, data processor and model trainer lists
+LIST_PAGE_SIZE = 20
+
+# Trained model cache (shared by all inference paths)
+MODEL_CACHE_MAX_BYTES = int(os.environ.get('MODEL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+# Serve RandomForest predictions from flattened node arrays instead of sklearn (legacy pickled models)
+MODEL_COMPILE_FORESTS = os.environ.get('MODEL_COMPILE_FORESTS', '1') == '1'
+# Still load legacy pickled model files; set to 0 once `manage.py convert_models` has run
+MODEL_ALLOW_PICKLE = os.environ.get('MODEL_ALLOW_PICKLE', '1') == '1'
+
+# MediaPipe detector pools
+DETECTOR_POOL_STATIC_SIZE = int(os.environ.get('DETECTOR_POOL_STATIC_SIZE', 4))
+DETECTOR_POOL_TRACKING_SIZE = int(os.environ.get('DETECTOR_POOL_TRACKING_SIZE', 8))
+DETECTOR_POOL_TIMEOUT = 30.0  # seconds a request/job waits for a free detector
+DETECTOR_SESSION_TIMEOUT = 5.0  # seconds a WebSocket session waits before being rejected
+DETECTOR_WARMUP = os.environ.get('DETECTOR_WARMUP', '1') == '1'
+DETECTOR_WARMUP_STATIC = 1
+DETECTOR_WARMUP_TRACKING = 1
+
+# Realtime WebSocket flow control
+REALTIME_FRAME_WINDOW = 2  # unacknowledged frames a client may have in flight
+REALTIME_MAX_FRAME_AGE = 0.5  # seconds; older frames are dropped instead of processed
+REALTIME_STATS_INTERVAL = 2.0  # seconds between stats messages pushed to the client
+
+# Landmark history averaged into each realtime prediction (per session, overridable with `set_history`)
+REALTIME_HISTORY_FRAMES = int(os.environ.get('REALTIME_HISTORY_FRAMES', 30))  # frames in the rolling window
+REALTIME_SMOOTHING_FACTOR = float(os.environ.get('REALTIME_SMOOTHING_FACTOR', 0.0))  # exponential smoothing (0: off, 0.7: as in training)
+
+# Paths served without auto-login or any session access (per-frame and stats endpoints, files)
+AUTO_LOGIN_EXEMPT_PATHS = ('/api/translate-frame/', '/api/stats/', '/api/ready/', '/static/', '/media/')
+
+# Inference worker threads for realtime sessions (default: one per CPU core)
+INFERENCE_WORKERS = int(os.environ.get('INFERENCE_WORKERS', 0)) or None
+
+# Cross-session micro-batching of realtime predictions on the same model
+PREDICTION_BATCH_WINDOW = float(os.environ.get('PREDICTION_BATCH_WINDOW_MS', 3)) / 1000  # seconds a request waits for others (0: off)
+PREDICTION_BATCH_MAX_SIZE = int(os.environ.get('PREDICTION_BATCH_MAX_SIZE', 32))  # a full batch runs at once
+PREDICTION_BATCH_WORKERS = int(os.environ.get('PREDICTION_BATCH_WORKERS', 1))  # threads running batched predicts
+
+# Recording of realtime sessions: predictions are buffered and written in batches
+RECORD_TRANSLATIONS = os.environ.get('RECORD_TRANSLATIONS', '1') == '1'
+RECORDING_FLUSH_WORDS = int(os.environ.get('RECORDING_FLUSH_WORDS', 10))  # buffered words that trigger a write
+RECORDING_FLUSH_INTERVAL = float(os.environ.get('RECORDING_FLUSH_INTERVAL', 5.0))  # seconds a buffered word waits at most
+
+# Background jobs (data processing, training)
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 1))  # concurrent CPU-heavy jobs
+JOB_RUN_IN_PROCESS = os.environ.get('JOB_RUN_IN_PROCESS', '1') == '1'  # set to 0 when using `manage.py run_jobs`
+JOB_POLL_INTERVAL = 2.0  # seconds an idle worker waits before checking the queue again
+JOB_PROGRESS_INTERVAL = 0.5  # minimum seconds between progress writes
+JOB_HEARTBEAT_INTERVAL = 10.0  # seconds between a worker's heartbeats for its running jobs
+JOB_HEARTBEAT_TIMEOUT = 60.0  # a running job without a heartbeat for this long is re-queued
+
+# Processes used to extract landmarks when building a dataset (default: one per CPU core)
+DATA_PROCESSING_WORKERS = int(os.environ.get('DATA_PROCESSING_WORKERS', 0)) or os.cpu_count() or 1
+
+# Per-frame landmark store, also the per-video cache of dataset builds (set to None to disable)
+LANDMARK_CACHE_DIR = os.path.join(MEDIA_ROOT, 'landmark_cache')
+
+# RandomForest training threads (-1: all cores)
+TRAINING_N_JOBS = int(os.environ.get('TRAINING_N_JOBS', -1))
+
+# Startup warm-up: newest models preloaded into the model cache, and the longest a
+# readiness request (api/ready/) waits for warm-up before answering 503
+MODEL_WARMUP_COUNT = int(os.environ.get('MODEL_WARMUP_COUNT', 3))
+READINESS_TIMEOUT = float(os.environ.get('READINESS_TIMEOUT', 30.0))
+
+# Accuracy (%) a model needs for realtime "fastest model" selection (model_id=auto)
+REALTIME_MIN_ACCURACY = float(os.environ.get('REALTIME_MIN_ACCURACY', 80.0))
@@ -4,3 +4,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'sign_language_project.settings')
 
 application = get_wsgi_application()
+
+# Same startup path as the ASGI application
+from translator.startup import startup  # noqa: E402
+
+startup.run()
@@ -1,11 +1,11 @@
 from django.contrib import admin
-from .models import TrainedModel, SignVideo, TranslationSession
+from .models import TrainedModel, SignVideo, TranslationSession, TranslationPrediction, Job
 
 @admin.register(TrainedModel)
 class TrainedModelAdmin(admin.ModelAdmin):
-    list_display = ('name', 'created_by', 'created_at', 'accuracy')
+    list_display = ('name', 'created_by', 'created_at', 'accuracy', 'backend', 'inference_ms', 'model_size', 'training_seconds', 'parent')
     search_fields = ('name', 'description')
-    list_filter = ('created_at', 'created_by')
+    list_filter = ('created_at', 'created_by', 'backend')
 
 @admin.register(SignVideo)
 class SignVideoAdmin(admin.ModelAdmin):
@@ -13,8 +13,21 @@ class SignVideoAdmin(admin.ModelAdmin):
     search_fields = ('word',)
     list_filter = ('uploaded_at', 'uploaded_by')
 
+class TranslationPredictionInline(admin.TabularInline):
+    model = TranslationPrediction
+    fields = ('word', 'confidence', 'predicted_at')
+    readonly_fields = fields
+    extra = 0
+
 @admin.register(TranslationSession)
 class TranslationSessionAdmin(admin.ModelAdmin):
     list_display = ('user', 'model', 'start_time', 'end_time')
+    inlines = [TranslationPredictionInline]
     search_fields = ('user__username', 'translation_text')
     list_filter = ('start_time', 'user')
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'state', 'progress', 'created_by', 'created_at', 'finished_at')
+    search_fields = ('message', 'error')
+    list_filter = ('kind', 'state', 'created_at')
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class TranslatorConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'translator'
+
+    def ready(self):
+        # Register signal handlers (model cache invalidation)
+        from . import signals  # noqa: F401
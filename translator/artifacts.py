@@ -0,0 +1,505 @@
+"""
+Model artifact format.
+
+A trained model is a single uncompressed zip (.npz, like datasets) with:
+
+    manifest.json   format name and version, backend, predictor kind and
+                    parameters, feature spec, label map, the dtype/shape/sha256
+                    of every array and a checksum over that table
+    <name>.npy      one member per entry of manifest['arrays']
+
+Nothing in an artifact is executable. Arrays are read with allow_pickle=False
+or memory-mapped in place, and the predictor is rebuilt from them by kind:
+
+    forest    CompiledForest node arrays (see compiled_forest), plus sklearn's
+              own tree state so the forest can be restored for warm-starting
+    linear    standardization + logistic regression coefficients
+    mlp       standardization + layer weights
+    knn       standardization + reference samples (the index is rebuilt on load)
+
+Legacy pickled models are converted with `manage.py convert_models`.
+"""
+import os
+import json
+import hashlib
+import zipfile
+import logging
+import numpy as np
+import sklearn
+from scipy.special import expit
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from .compiled_forest import CompiledForest, _NORMALIZE_LEAVES
+from .datasets import write_npy_member, mmap_npy_member
+from .features import FEATURE_LENGTH, FEATURE_VERSION
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT = 'sign-language-model'
+MODEL_VERSION = 1
+MODEL_EXTENSION = '.npz'
+MANIFEST_MEMBER = 'manifest.json'
+
+PREDICTOR_FOREST = 'forest'
+PREDICTOR_LINEAR = 'linear'
+PREDICTOR_MLP = 'mlp'
+PREDICTOR_KNN = 'knn'
+
+# What tree_.value holds in this sklearn; restored trees must use the same convention
+TREE_VALUES = 'counts' if _NORMALIZE_LEAVES else 'fractions'
+
+
+class InvalidArtifact(ValueError):
+    """The file is not a usable model artifact."""
+
+
+def _array_digest(array):
+    return hashlib.sha256(np.ascontiguousarray(array).tobytes()).hexdigest()
+
+
+def _descr(dtype):
+    # JSON form of the .npy dtype description (structured fields become lists)
+    return json.loads(json.dumps(np.lib.format.dtype_to_descr(dtype)))
+
+
+def _dtype(descr):
+    return np.lib.format.descr_to_dtype(descr if isinstance(descr, str) else [tuple(field) for field in descr])
+
+
+def _arrays_checksum(table):
+    return hashlib.sha256(json.dumps(table, sort_keys=True).encode()).hexdigest()
+
+
+class Artifact:
+    """A model artifact's manifest and arrays (possibly memory-mapped)."""
+
+    def __init__(self, manifest, arrays):
+        self.manifest = manifest
+        self.arrays = arrays
+
+    @property
+    def backend(self):
+        return self.manifest['backend']
+
+    @property
+    def label_mapping(self):
+        return self.manifest['label_mapping']
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def predictor(self):
+        """Rebuild the inference object; it has predict(X) like a fitted estimator."""
+        builder = PREDICTORS.get(self.manifest['predictor'])
+        if builder is None:
+            raise InvalidArtifact(f"Unknown predictor kind: {self.manifest['predictor']}")
+        return builder(self.arrays, self.manifest['params'])
+
+    def estimator(self):
+        """The sklearn estimator for retraining, restored from the arrays; None if unavailable."""
+        if self.manifest['predictor'] != PREDICTOR_FOREST:
+            return None
+        return restore_forest(self.arrays, self.manifest['params'])
+
+
+# Standardization shared by the non-forest predictors
+
+def _scaler_arrays(scaler):
+    if scaler is None:
+        return {}
+    arrays = {}
+    if scaler.with_mean:
+        arrays['scaler_mean'] = scaler.mean_
+    if scaler.with_std:
+        arrays['scaler_scale'] = scaler.scale_
+    return arrays
+
+
+def _standardize(X, arrays):
+    # Same operations as StandardScaler.transform
+    X = np.array(X, dtype=np.float64, ndmin=2)
+    if 'scaler_mean' in arrays:
+        X -= arrays['scaler_mean']
+    if 'scaler_scale' in arrays:
+        X /= arrays['scaler_scale']
+    return X
+
+
+class LinearPredictor:
+    def __init__(self, arrays, params):
+        self.arrays = arrays
+        self.classes_ = arrays['classes']
+        self.coef = arrays['coef']
+        self.intercept = arrays['intercept']
+
+    def decision_function(self, X):
+        return _standardize(X, self.arrays) @ self.coef.T + self.intercept
+
+    def predict(self, X):
+        # Same as LinearClassifierMixin.predict
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            indices = (scores.ravel() > 0).astype(int)
+        else:
+            indices = scores.argmax(axis=1)
+        return self.classes_.take(indices, axis=0)
+
+    def predict_proba(self, X):
+        # Same as LogisticRegression.predict_proba: one-vs-rest when binary, multinomial otherwise
+        scores = self.decision_function(X)
+        if scores.shape[1] == 1:
+            positive = expit(scores.ravel())
+            return np.column_stack([1 - positive, positive])
+        return _softmax(scores)
+
+
+def _softmax(X):
+    tmp = X - X.max(axis=1)[:, np.newaxis]
+    np.exp(tmp, out=X)
+    X /= X.sum(axis=1)[:, np.newaxis]
+    return X
+
+
+HIDDEN_ACTIVATIONS = {
+    'identity': lambda X: X,
+    'relu': lambda X: np.maximum(X, 0, out=X),
+    'tanh': lambda X: np.tanh(X, out=X),
+    'logistic': lambda X: expit(X, out=X),
+}
+
+
+class MLPPredictor:
+    def __init__(self, arrays, params):
+        self.arrays = arrays
+        self.classes_ = arrays['classes']
+        self.layers = [(arrays[f'coef_{i}'], arrays[f'intercept_{i}']) for i in range(params['layers'])]
+        self.activation = HIDDEN_ACTIVATIONS[params['activation']]
+        self.out_activation = params['out_activation']
+
+    def _forward(self, X):
+        # Same forward pass as MLPClassifier._forward_pass_fast
+        activation = _standardize(X, self.arrays)
+        for i, (coef, intercept) in enumerate(self.layers):
+            activation = activation @ coef
+            activation += intercept
+            if i != len(self.layers) - 1:
+                activation = self.activation(activation)
+        if self.out_activation == 'softmax':
+            return _softmax(activation)
+        return expit(activation)
+
+    def predict(self, X):
+        output = self._forward(X)
+        if self.out_activation == 'softmax':
+            return self.classes_.take(np.argmax(output, axis=1), axis=0)
+        # Binary: one logistic output, thresholded like LabelBinarizer
+        return self.classes_.take((output.ravel() > 0.5).astype(int), axis=0)
+
+    def predict_proba(self, X):
+        output = self._forward(X)
+        if self.out_activation == 'softmax':
+            return output
+        positive = output.ravel()
+        return np.column_stack([1 - positive, positive])
+
+
+class KNeighborsPredictor:
+    def __init__(self, arrays, params):
+        self.arrays = arrays
+        self.classes_ = arrays['classes']
+        # Rebuilding the index from the reference samples is deterministic and avoids storing it
+        self.model = KNeighborsClassifier(**params['knn']).fit(
+            np.asarray(arrays['fit_x']), self.classes_.take(arrays['fit_y'], axis=0),
+        )
+
+    def predict(self, X):
+        return self.model.predict(_standardize(X, self.arrays))
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(_standardize(X, self.arrays))
+
+
+def _forest_predictor(arrays, params):
+    return CompiledForest.from_arrays(arrays, arrays['classes'], params['depth'], params['n_features'])
+
+
+PREDICTORS = {
+    PREDICTOR_FOREST: _forest_predictor,
+    PREDICTOR_LINEAR: LinearPredictor,
+    PREDICTOR_MLP: MLPPredictor,
+    PREDICTOR_KNN: KNeighborsPredictor,
+}
+
+
+# Export from fitted estimators
+
+def _json_params(estimator):
+    params = estimator.get_params(deep=False)
+    json.dumps(params)
+    return params
+
+
+def _export_forest(model):
+    compiled = CompiledForest.from_sklearn(model)
+    arrays = dict(compiled.arrays(), classes=model.classes_)
+    params = {'depth': int(compiled.depth), 'n_features': int(model.n_features_in_)}
+    try:
+        # sklearn's own tree state, enough to restore the forest for warm-starting
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        state = [tree.__getstate__() for tree in trees]
+        arrays['tree_nodes'] = np.concatenate([s['nodes'] for s in state])
+        arrays['tree_values'] = np.concatenate([s['values'][:, 0, :] for s in state])
+        arrays['tree_node_counts'] = np.array([s['node_count'] for s in state], dtype=np.int64)
+        arrays['tree_depths'] = np.array([s['max_depth'] for s in state], dtype=np.int64)
+        arrays['tree_random_states'] = np.array([e.random_state for e in model.estimators_], dtype=np.int64)
+        params['sklearn_forest'] = {
+            'params': _json_params(model),
+            'max_features': int(model.estimators_[0].max_features_),
+            'tree_values': TREE_VALUES,
+        }
+    except (TypeError, ValueError, AttributeError, KeyError) as e:
+        logger.warning(f"Forest state not exported, the model cannot be warm-started: {e}")
+    return PREDICTOR_FOREST, arrays, params
+
+
+def _split_pipeline(model):
+    """Return (scaler or None, final estimator) for a bare estimator or a scaler pipeline."""
+    if isinstance(model, Pipeline):
+        steps = [step for _, step in model.steps if step is not None and step != 'passthrough']
+        if len(steps) == 2 and isinstance(steps[0], StandardScaler):
+            return steps[0], steps[1]
+        if len(steps) == 1:
+            return None, steps[0]
+        raise InvalidArtifact(f"Unsupported pipeline: {[type(step).__name__ for step in steps]}")
+    return None, model
+
+
+def export_model(model):
+    """Return (predictor kind, arrays, params) for a fitted estimator; raises InvalidArtifact if unsupported."""
+    if isinstance(model, RandomForestClassifier):
+        return _export_forest(model)
+    scaler, estimator = _split_pipeline(model)
+    arrays = _scaler_arrays(scaler)
+    if isinstance(estimator, LogisticRegression):
+        arrays.update(coef=estimator.coef_, intercept=estimator.intercept_)
+        kind, params = PREDICTOR_LINEAR, {}
+    elif isinstance(estimator, MLPClassifier):
+        for i, (coef, intercept) in enumerate(zip(estimator.coefs_, estimator.intercepts_)):
+            arrays[f'coef_{i}'] = coef
+            arrays[f'intercept_{i}'] = intercept
+        kind = PREDICTOR_MLP
+        params = {
+            'layers': len(estimator.coefs_),
+            'activation': estimator.activation,
+            'out_activation': estimator.out_activation_,
+        }
+    elif isinstance(estimator, KNeighborsClassifier):
+        arrays.update(fit_x=estimator._fit_X, fit_y=estimator._y)
+        kind = PREDICTOR_KNN
+        params = {'knn': {key: value for key, value in _json_params(estimator).items() if key != 'n_jobs'}}
+    else:
+        raise InvalidArtifact(f"Unsupported model type: {type(estimator).__name__}")
+    arrays['classes'] = estimator.classes_
+    return kind, arrays, params
+
+
+def _plain_array(array):
+    array = np.asarray(array)
+    if array.dtype.hasobject:
+        # Object arrays would need pickle; class labels become strings
+        array = array.astype(str)
+    return array
+
+
+def save_artifact(model, label_mapping, path, backend, metadata=None):
+    """Export a fitted estimator and write it atomically; returns the manifest."""
+    kind, arrays, params = export_model(model)
+    arrays = {name: _plain_array(array) for name, array in arrays.items()}
+    table = {
+        name: {
+            'dtype': _descr(array.dtype),
+            'shape': list(array.shape),
+            'sha256': _array_digest(array),
+        }
+        for name, array in arrays.items()
+    }
+    manifest = {
+        'format': MODEL_FORMAT,
+        'version': MODEL_VERSION,
+        'backend': backend,
+        'predictor': kind,
+        'params': params,
+        'features': {'length': FEATURE_LENGTH, 'version': FEATURE_VERSION},
+        'label_mapping': {str(name): int(index) for name, index in label_mapping.items()},
+        'arrays': table,
+        'checksum': _arrays_checksum(table),
+        'metadata': dict(metadata or {}, sklearn=sklearn.__version__),
+    }
+    tmp_path = f"{path}.tmp"
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr(MANIFEST_MEMBER, json.dumps(manifest, ensure_ascii=False))
+        for name, array in arrays.items():
+            write_npy_member(archive, f'{name}.npy', array)
+    os.replace(tmp_path, path)
+    return manifest
+
+
+def _read_manifest(archive):
+    try:
+        manifest = json.loads(archive.read(MANIFEST_MEMBER))
+    except KeyError:
+        raise InvalidArtifact("No manifest.json; not a model artifact")
+    except ValueError as e:
+        raise InvalidArtifact(f"Corrupt manifest: {e}")
+    if manifest.get('format') != MODEL_FORMAT:
+        raise InvalidArtifact(f"Not a model artifact (format={manifest.get('format')})")
+    if manifest.get('version') != MODEL_VERSION:
+        raise InvalidArtifact(f"Unsupported model artifact version {manifest.get('version')}")
+    for key in ('backend', 'predictor', 'params', 'features', 'label_mapping', 'arrays', 'checksum'):
+        if key not in manifest:
+            raise InvalidArtifact(f"Manifest is missing '{key}'")
+    if manifest['predictor'] not in PREDICTORS:
+        raise InvalidArtifact(f"Unknown predictor kind: {manifest['predictor']}")
+    length = manifest['features'].get('length')
+    if length != FEATURE_LENGTH:
+        raise InvalidArtifact(f"Model expects {length} features, extraction produces {FEATURE_LENGTH}")
+    if manifest['features'].get('version') != FEATURE_VERSION:
+        logger.warning(f"Model was trained on feature version {manifest['features'].get('version')}, current is {FEATURE_VERSION}")
+    if _arrays_checksum(manifest['arrays']) != manifest['checksum']:
+        raise InvalidArtifact("Manifest checksum mismatch")
+    return manifest
+
+
+def _read_array(archive, name, spec, path, mmap_mode):
+    member = f'{name}.npy'
+    if member not in archive.namelist():
+        raise InvalidArtifact(f"Missing array {member}")
+    try:
+        if _dtype(spec['dtype']).hasobject:
+            raise InvalidArtifact(f"Array {name} has an object dtype")
+        if mmap_mode and path is not None and archive.getinfo(member).compress_type == zipfile.ZIP_STORED:
+            array = mmap_npy_member(path, archive, member, mmap_mode)
+        else:
+            with archive.open(member) as f:
+                array = np.lib.format.read_array(f, allow_pickle=False)
+    except (ValueError, TypeError) as e:
+        raise InvalidArtifact(f"Unreadable array {name}: {e}")
+    if _descr(array.dtype) != spec['dtype'] or list(array.shape) != spec['shape']:
+        raise InvalidArtifact(f"Array {name} does not match the manifest")
+    return array
+
+
+def load_artifact(source, mmap_mode='r', verify=True):
+    """
+    Read a model artifact from a path or file object.
+
+    Arrays of a path are memory-mapped with mmap_mode (None reads them). With
+    verify each array is hashed against the manifest. Raises InvalidArtifact.
+    """
+    path = source if isinstance(source, (str, os.PathLike)) else None
+    try:
+        with zipfile.ZipFile(source) as archive:
+            manifest = _read_manifest(archive)
+            arrays = {
+                name: _read_array(archive, name, spec, path, mmap_mode)
+                for name, spec in manifest['arrays'].items()
+            }
+    except zipfile.BadZipFile as e:
+        raise InvalidArtifact(f"Not a model artifact or corrupt (expected a .npz model file): {e}")
+    if verify:
+        for name, spec in manifest['arrays'].items():
+            if _array_digest(arrays[name]) != spec['sha256']:
+                raise InvalidArtifact(f"Checksum mismatch for array {name}")
+    return Artifact(manifest, arrays)
+
+
+def is_artifact(path):
+    return zipfile.is_zipfile(path)
+
+
+def validate_artifact(source):
+    """
+    Fully check an artifact (e.g. an upload) and return it: manifest, array
+    checksums, and a prediction on a zero sample. Raises InvalidArtifact.
+    """
+    artifact = load_artifact(source, mmap_mode=None)
+    try:
+        prediction = artifact.predictor().predict(np.zeros((1, FEATURE_LENGTH)))
+    except InvalidArtifact:
+        raise
+    except Exception as e:
+        raise InvalidArtifact(f"Model cannot predict: {e}")
+    if len(prediction) != 1:
+        raise InvalidArtifact("Model returned an unexpected prediction shape")
+    known = set(artifact.label_mapping.values())
+    unknown = [label for label in np.asarray(artifact.arrays['classes']).tolist() if label not in known]
+    if unknown:
+        raise InvalidArtifact(f"Classes {unknown[:5]} are missing from the label map")
+    return artifact
+
+
+# Restoring a forest for retraining
+
+def restore_forest(arrays, params):
+    """
+    Rebuild a fitted RandomForestClassifier from an artifact's tree state, or
+    None when the artifact has none or was written by an incompatible sklearn.
+    """
+    state = params.get('sklearn_forest')
+    if state is None or 'tree_nodes' not in arrays:
+        return None
+    if state['tree_values'] != TREE_VALUES:
+        logger.warning("Forest artifact stores tree values in another sklearn convention; it cannot be warm-started")
+        return None
+    from sklearn.tree import DecisionTreeClassifier
+    from sklearn.tree._tree import Tree, NODE_DTYPE
+
+    stored = arrays['tree_nodes']
+    missing = [name for name in NODE_DTYPE.names if name not in stored.dtype.names and name != 'missing_go_to_left']
+    if missing:
+        logger.warning(f"Forest artifact lacks tree fields {missing}; it cannot be warm-started")
+        return None
+    nodes = np.zeros(len(stored), dtype=NODE_DTYPE)
+    for name in NODE_DTYPE.names:
+        if name in stored.dtype.names:
+            nodes[name] = stored[name]
+
+    classes = np.asarray(arrays['classes'])
+    n_classes = len(classes)
+    n_features = params['n_features']
+    forest = RandomForestClassifier(**state['params'])
+    estimator_params = {name: getattr(forest, name) for name in forest.estimator_params}
+    values = np.asarray(arrays['tree_values'], dtype=np.float64)
+    estimators = []
+    offset = 0
+    for count, depth, random_state in zip(arrays['tree_node_counts'], arrays['tree_depths'], arrays['tree_random_states']):
+        count = int(count)
+        tree = Tree(n_features, np.array([n_classes], dtype=np.intp), 1)
+        tree.__setstate__({
+            'max_depth': int(depth),
+            'node_count': count,
+            'nodes': np.ascontiguousarray(nodes[offset:offset + count]),
+            'values': np.ascontiguousarray(values[offset:offset + count]).reshape(count, 1, n_classes),
+        })
+        offset += count
+        estimator = DecisionTreeClassifier(**dict(estimator_params, random_state=int(random_state)))
+        estimator.tree_ = tree
+        estimator.n_features_in_ = n_features
+        estimator.n_outputs_ = 1
+        estimator.classes_ = classes
+        estimator.n_classes_ = np.intp(n_classes)
+        estimator.max_features_ = state['max_features']
+        estimators.append(estimator)
+
+    forest.estimator_ = DecisionTreeClassifier(**estimator_params)
+    forest.estimators_ = estimators
+    forest.n_features_in_ = n_features
+    forest.n_outputs_ = 1
+    forest.classes_ = classes
+    forest.n_classes_ = n_classes
+    return forest
@@ -0,0 +1,136 @@
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+def predict_with_confidence(predictor, X):
+    """
+    Labels of the rows of X, as predict() gives them, and the probability of
+    each; confidences are None for predictors without predict_proba.
+    """
+    if not hasattr(predictor, 'predict_proba'):
+        return predictor.predict(X), [None] * len(X)
+    proba = predictor.predict_proba(X)
+    indices = np.argmax(proba, axis=1)
+    return predictor.classes_.take(indices, axis=0), proba[np.arange(len(indices)), indices]
+
+
+class _PendingBatch:
+    """Requests for one predictor waiting to be run together."""
+
+    def __init__(self, predictor):
+        self.predictor = predictor
+        self.items = []  # (features, future, enqueued_at)
+        self.timer = None
+
+
+class PredictionBatcher:
+    """
+    Micro-batches single-sample predictions across realtime sessions.
+
+    Requests for the same predictor (sessions on the same cached model share
+    one) are held for at most `window` seconds, or until `max_batch_size` are
+    waiting, and then answered by one vectorized predict on a batch thread.
+    All coordination happens on the event loop; only the predict call leaves
+    it. A window of 0 sends every request on its own.
+    """
+
+    def __init__(self, window, max_batch_size, workers=1):
+        self.window = window
+        self.max_batch_size = max(1, max_batch_size)
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='predict-batch')
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.batches = 0
+        self.full_batches = 0
+        self.largest_batch = 0
+        self.errors = 0
+        self.queue_total = 0.0
+        self.predict_total = 0.0
+
+    async def predict(self, predictor, features):
+        """Predict (label, confidence) of one feature vector, batched with concurrent callers."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # The pending batch holds the predictor, so its id cannot be reused meanwhile
+        key = id(predictor)
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _PendingBatch(predictor)
+        pending.items.append((np.asarray(features, dtype=np.float64), future, time.perf_counter()))
+
+        if len(pending.items) >= self.max_batch_size or self.window <= 0:
+            self._flush(key, full=len(pending.items) >= self.max_batch_size)
+        elif pending.timer is None:
+            pending.timer = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key, full=False):
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        asyncio.get_running_loop().create_task(self._run(pending, full))
+
+    def _predict(self, predictor, batch):
+        started = time.perf_counter()
+        labels, confidences = predict_with_confidence(predictor, batch)
+        return labels, confidences, started, time.perf_counter() - started
+
+    async def _run(self, pending, full):
+        items = pending.items
+        try:
+            labels, confidences, started, predict_seconds = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._predict, pending.predictor, np.stack([item[0] for item in items])
+            )
+        except Exception as e:
+            logger.error(f"Batched prediction of {len(items)} samples failed: {e}")
+            with self._lock:
+                self.errors += 1
+            for _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        with self._lock:
+            self.requests += len(items)
+            self.batches += 1
+            self.full_batches += int(full)
+            self.largest_batch = max(self.largest_batch, len(items))
+            self.queue_total += sum(started - enqueued_at for _, _, enqueued_at in items)
+            self.predict_total += predict_seconds
+        for (_, future, _), label, confidence in zip(items, labels, confidences):
+            # A session that disconnected meanwhile has cancelled its future
+            if not future.done():
+                future.set_result((label, None if confidence is None else float(confidence)))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'window_ms': round(self.window * 1000, 3),
+                'max_batch_size': self.max_batch_size,
+                'pending': sum(len(pending.items) for pending in list(self._pending.values())),
+                'requests': self.requests,
+                'batches': self.batches,
+                'full_batches': self.full_batches,
+                'largest_batch': self.largest_batch,
+                'avg_batch_size': round(self.requests / self.batches, 2) if self.batches else 0.0,
+                'avg_queue_ms': round(self.queue_total * 1000 / self.requests, 3) if self.requests else 0.0,
+                'avg_predict_ms': round(self.predict_total * 1000 / self.batches, 3) if self.batches else 0.0,
+                'errors': self.errors,
+            }
+
+
+prediction_batcher = PredictionBatcher(
+    settings.PREDICTION_BATCH_WINDOW,
+    settings.PREDICTION_BATCH_MAX_SIZE,
+    settings.PREDICTION_BATCH_WORKERS,
+)
@@ -0,0 +1,358 @@
+"""
+Micro-benchmarks for the inference hot paths.
+
+Run with `python manage.py benchmark <name>`. Each benchmark returns a dict of
+results that the command prints as JSON.
+"""
+import time
+import random
+from types import SimpleNamespace
+import cv2
+import numpy as np
+from .features import extract_features, extract_features_batch, landmark_array
+from .compiled_forest import CompiledForest
+from .protocol import pack_frame, unpack_frame
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _timeit(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations
+
+
+def _float32(value):
+    # MediaPipe landmarks are float32 protobuf fields
+    return float(np.float32(value))
+
+
+def fake_results(n_hands=2, has_pose=True, seed=0):
+    """Build objects shaped like MediaPipe Hands/Pose results."""
+    rng = random.Random(seed)
+
+    def landmarks(count):
+        return SimpleNamespace(landmark=[
+            SimpleNamespace(x=_float32(rng.random()), y=_float32(rng.random()), z=0.0)
+            for _ in range(count)
+        ])
+
+    hand_results = SimpleNamespace(
+        multi_hand_landmarks=[landmarks(21) for _ in range(n_hands)] or None
+    )
+    pose_results = SimpleNamespace(pose_landmarks=landmarks(33) if has_pose else None)
+    return hand_results, pose_results
+
+
+def legacy_extract_features(hand_results, pose_results, w, h):
+    """The original per-landmark loop, kept as the reference implementation."""
+    data_aux = []
+    if hand_results.multi_hand_landmarks:
+        for hand_landmarks in hand_results.multi_hand_landmarks:
+            x_ = [landmark.x for landmark in hand_landmarks.landmark]
+            y_ = [landmark.y for landmark in hand_landmarks.landmark]
+            if x_ and y_:
+                for i in range(len(hand_landmarks.landmark)):
+                    x = hand_landmarks.landmark[i].x
+                    y = hand_landmarks.landmark[i].y
+                    data_aux.append(x - min(x_))
+                    data_aux.append(y - min(y_))
+
+    if pose_results.pose_landmarks:
+        pose_landmarks = pose_results.pose_landmarks.landmark
+        left_elbow = pose_landmarks[13]
+        data_aux.append(left_elbow.x * w)
+        data_aux.append(left_elbow.y * h)
+        right_elbow = pose_landmarks[14]
+        data_aux.append(right_elbow.x * w)
+        data_aux.append(right_elbow.y * h)
+
+    if len(data_aux) < 88:
+        data_aux.extend([0.0] * (88 - len(data_aux)))
+    return data_aux
+
+
+@benchmark('features')
+def bench_features(iterations=2000):
+    w, h = 640, 480
+    cases = [fake_results(n, pose, seed=i) for i, (n, pose) in enumerate(
+        [(0, False), (0, True), (1, False), (1, True), (2, False), (2, True)]
+    )]
+
+    # Bit-identical check against the legacy loop, single and batch
+    for hand_results, pose_results in cases:
+        expected = np.array(legacy_extract_features(hand_results, pose_results, w, h))
+        if not np.array_equal(extract_features(hand_results, pose_results, w, h), expected):
+            raise AssertionError("extract_features differs from the legacy implementation")
+    batch = extract_features_batch([(hr, pr, w, h) for hr, pr in cases])
+    legacy_batch = np.array([legacy_extract_features(hr, pr, w, h) for hr, pr in cases])
+    if not np.array_equal(batch, legacy_batch):
+        raise AssertionError("extract_features_batch differs from the legacy implementation")
+
+    hand_results, pose_results = cases[-1]
+    frames = [(hand_results, pose_results, w, h)] * 100
+    legacy = _timeit(lambda: legacy_extract_features(hand_results, pose_results, w, h), iterations)
+    vectorized = _timeit(lambda: extract_features(hand_results, pose_results, w, h), iterations)
+    batched = _timeit(lambda: extract_features_batch(frames), max(iterations // 100, 1)) / len(frames)
+    return {
+        'identical': True,
+        'legacy_us': round(legacy * 1e6, 2),
+        'vectorized_us': round(vectorized * 1e6, 2),
+        'batch_per_frame_us': round(batched * 1e6, 2),
+        'speedup': round(legacy / vectorized, 2),
+        'batch_speedup': round(legacy / batched, 2),
+    }
+
+
+@benchmark('protocol')
+def bench_protocol(iterations=200):
+    w, h = 640, 480
+    # Smooth synthetic camera frame with some sensor noise
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, w, dtype=np.float32)[None, :, None]
+    frame = np.clip(gradient + rng.normal(0, 8, (h, w, 3)), 0, 255).astype(np.uint8)
+
+    hand_results, pose_results = fake_results(2, True)
+    hands = [landmark_array(hand) for hand in hand_results.multi_hand_landmarks]
+    pose = landmark_array(pose_results.pose_landmarks)
+    boxes = [(100, 120, 220, 260), (400, 110, 520, 250)]
+
+    jpeg = cv2.imencode('.jpg', frame)[1].tobytes()
+    payload = pack_frame(w, h, 1, hands=hands, pose=pose, boxes=boxes, word='salom')
+    jpeg_encode = _timeit(lambda: cv2.imencode('.jpg', frame), iterations)
+    jpeg_decode = _timeit(lambda: cv2.imdecode(np.frombuffer(jpeg, np.uint8), cv2.IMREAD_COLOR), iterations)
+    landmarks_encode = _timeit(
+        lambda: pack_frame(w, h, 1, hands=hands, pose=pose, boxes=boxes, word='salom'), iterations * 10
+    )
+    landmarks_decode = _timeit(lambda: unpack_frame(payload), iterations * 10)
+    return {
+        'jpeg_bytes': len(jpeg),
+        'landmarks_bytes': len(payload),
+        'size_ratio': round(len(jpeg) / len(payload), 1),
+        'jpeg_encode_ms': round(jpeg_encode * 1000, 3),
+        'jpeg_decode_ms': round(jpeg_decode * 1000, 3),
+        'landmarks_encode_ms': round(landmarks_encode * 1000, 4),
+        'landmarks_decode_ms': round(landmarks_decode * 1000, 4),
+    }
+
+
+@benchmark('forest')
+def bench_forest(iterations=200, n_estimators=200, n_classes=10):
+    from sklearn.ensemble import RandomForestClassifier
+
+    # Class-dependent synthetic features with the real feature length
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, n_classes, 2000)
+    X = rng.normal(size=(len(labels), 88)) + labels[:, None] * rng.normal(0, 0.2, 88)
+    model = RandomForestClassifier(n_estimators=n_estimators, random_state=0).fit(X, labels)
+
+    start = time.perf_counter()
+    compiled = CompiledForest.from_sklearn(model)
+    compile_seconds = time.perf_counter() - start
+
+    # Identical probabilities and labels on unseen rows, batched and one at a time
+    test = rng.normal(size=(1000, 88)) + rng.integers(0, n_classes, 1000)[:, None] * 0.2
+    if not np.array_equal(compiled.predict_proba(test), model.predict_proba(test)):
+        raise AssertionError("compiled predict_proba differs from sklearn")
+    if not np.array_equal(compiled.predict(test), model.predict(test)):
+        raise AssertionError("compiled predict differs from sklearn")
+    for row in test[:50]:
+        if compiled.predict([row])[0] != model.predict([row])[0]:
+            raise AssertionError("compiled single-sample predict differs from sklearn")
+
+    sample = [test[0].tolist()]
+    batch = test[:100]
+    sklearn_single = _timeit(lambda: model.predict(sample), max(iterations // 10, 1))
+    compiled_single = _timeit(lambda: compiled.predict(sample), iterations)
+    sklearn_batch = _timeit(lambda: model.predict(batch), max(iterations // 20, 1)) / len(batch)
+    compiled_batch = _timeit(lambda: compiled.predict(batch), max(iterations // 10, 1)) / len(batch)
+    return {
+        'identical': True,
+        'trees': n_estimators,
+        'nodes': len(compiled.feature),
+        'depth': compiled.depth,
+        'compile_ms': round(compile_seconds * 1000, 2),
+        'compiled_bytes': compiled.nbytes,
+        'sklearn_single_ms': round(sklearn_single * 1000, 3),
+        'compiled_single_ms': round(compiled_single * 1000, 3),
+        'single_speedup': round(sklearn_single / compiled_single, 1),
+        'sklearn_batch_per_sample_ms': round(sklearn_batch * 1000, 4),
+        'compiled_batch_per_sample_ms': round(compiled_batch * 1000, 4),
+        'batch_speedup': round(sklearn_batch / compiled_batch, 1),
+    }
+
+
+@benchmark('batching')
+def bench_batching(iterations=20, sessions=32, window_ms=3.0, max_batch_size=32):
+    import asyncio
+    from sklearn.ensemble import RandomForestClassifier
+    from .batching import PredictionBatcher
+
+    rng = np.random.default_rng(0)
+    labels = rng.integers(0, 10, 2000)
+    X = rng.normal(size=(len(labels), 88)) + labels[:, None] * 0.2
+    model = CompiledForest.from_sklearn(RandomForestClassifier(n_estimators=100, random_state=0).fit(X, labels))
+    samples = rng.normal(size=(sessions, 88))
+
+    def run(window):
+        batcher = PredictionBatcher(window / 1000, max_batch_size)
+
+        async def session(index, latencies):
+            for _ in range(iterations):
+                started = time.perf_counter()
+                await batcher.predict(model, samples[index])
+                latencies.append(time.perf_counter() - started)
+
+        async def main():
+            latencies = []
+            started = time.perf_counter()
+            await asyncio.gather(*(session(i, latencies) for i in range(sessions)))
+            return time.perf_counter() - started, latencies
+
+        elapsed, latencies = asyncio.run(main())
+        batcher.executor.shutdown()
+        stats = batcher.stats()
+        return {
+            'predictions_per_s': round(sessions * iterations / elapsed, 1),
+            'p50_latency_ms': round(float(np.percentile(latencies, 50)) * 1000, 3),
+            'p99_latency_ms': round(float(np.percentile(latencies, 99)) * 1000, 3),
+            'avg_batch_size': stats['avg_batch_size'],
+            'avg_queue_ms': stats['avg_queue_ms'],
+        }
+
+    # Batched results must match one-by-one predictions
+    expected = model.predict(samples)
+    got = asyncio.run(_gather_predictions(PredictionBatcher(window_ms / 1000, max_batch_size), model, samples))
+    if not np.array_equal(np.asarray([label for label, _ in got]), expected):
+        raise AssertionError("batched predictions differ from direct predictions")
+
+    unbatched = run(0)
+    batched = run(window_ms)
+    return {
+        'sessions': sessions,
+        'unbatched': unbatched,
+        'batched': batched,
+        'throughput_gain': round(batched['predictions_per_s'] / unbatched['predictions_per_s'], 2),
+    }
+
+
+async def _gather_predictions(batcher, model, samples):
+    import asyncio
+    return await asyncio.gather(*(batcher.predict(model, sample) for sample in samples))
+
+
+@benchmark('history')
+def bench_history(iterations=5000, window=30):
+    from .segmentation import LandmarkHistory
+
+    frames = np.random.default_rng(0).normal(size=(iterations, 88))
+
+    def legacy():
+        history = []
+        for features in frames:
+            history.append(features)
+            if len(history) > window:
+                history.pop(0)
+            np.mean(history, axis=0)
+
+    def ring():
+        history = LandmarkHistory(window)
+        for features in frames:
+            history.add(features)
+            history.mean()
+
+    # The running mean must match averaging the last `window` frames
+    history = LandmarkHistory(window)
+    for features in frames:
+        history.add(features)
+    if not np.allclose(history.mean(), frames[-window:].mean(axis=0)):
+        raise AssertionError("ring buffer mean differs from the mean of the last frames")
+
+    legacy_us = _timeit(legacy, 1) / iterations * 1e6
+    ring_us = _timeit(ring, 1) / iterations * 1e6
+    return {
+        'window': window,
+        'legacy_us_per_frame': round(legacy_us, 2),
+        'ring_buffer_us_per_frame': round(ring_us, 2),
+        'speedup': round(legacy_us / ring_us, 1),
+    }
+
+
+@benchmark('sqlite')
+def bench_sqlite(seconds=2.0, writers=2, readers=4):
+    import sqlite3
+    import tempfile
+    import threading
+    from django.conf import settings
+
+    def run(pragmas):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = f"{tmp}/bench.sqlite3"
+
+            def connect():
+                # Autocommit statements and the driver's default 5 s timeout, as Django uses them
+                conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+                for name, value in pragmas.items():
+                    conn.execute(f"PRAGMA {name} = {value}")
+                return conn
+
+            setup = connect()
+            setup.execute("CREATE TABLE job (id INTEGER PRIMARY KEY, progress REAL, message TEXT)")
+            setup.executemany("INSERT INTO job (progress, message) VALUES (?, ?)", [(0.0, '')] * 100)
+            setup.close()
+
+            waits = {'write': [], 'read': []}
+            errors = []
+            deadline = time.perf_counter() + seconds
+
+            def worker(kind, seed):
+                conn = connect()
+                rng = random.Random(seed)
+                timings = []
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        if kind == 'write':
+                            # Job progress and session saves: small single-row updates
+                            conn.execute("UPDATE job SET progress = ?, message = ? WHERE id = ?",
+                                         (rng.random(), 'x' * 100, rng.randint(1, 100)))
+                        else:
+                            conn.execute("SELECT COUNT(*), SUM(progress) FROM job").fetchone()
+                    except sqlite3.OperationalError:
+                        errors.append(kind)
+                    timings.append(time.perf_counter() - started)
+                conn.close()
+                waits[kind].extend(timings)
+
+            threads = [threading.Thread(target=worker, args=('write', i)) for i in range(writers)]
+            threads += [threading.Thread(target=worker, args=('read', writers + i)) for i in range(readers)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        result = {'errors': len(errors)}
+        for kind, timings in waits.items():
+            result[f'{kind}s_per_s'] = round(len(timings) / seconds, 1)
+            result[f'{kind}_p50_ms'] = round(float(np.percentile(timings, 50)) * 1000, 3) if timings else None
+            result[f'{kind}_p99_ms'] = round(float(np.percentile(timings, 99)) * 1000, 3) if timings else None
+        return result
+
+    default = run({})
+    tuned = run(settings.SQLITE_PRAGMAS)
+    return {
+        'writers': writers,
+        'readers': readers,
+        'default': default,
+        'tuned': tuned,
+        'write_p99_reduction': round(default['write_p99_ms'] / tuned['write_p99_ms'], 2) if tuned['write_p99_ms'] else None,
+        'read_p99_reduction': round(default['read_p99_ms'] / tuned['read_p99_ms'], 2) if tuned['read_p99_ms'] else None,
+    }
@@ -0,0 +1,160 @@
+"""
+Flattened RandomForest evaluator.
+
+sklearn's predict spends most of a single-sample call on input validation
+and dispatching to every tree in turn. A compiled forest keeps all trees in
+a few contiguous node arrays and walks every tree for every sample at once,
+one NumPy step per tree level:
+
+    feature      int32 (n_nodes,)              split feature (0 at leaves)
+    threshold    float64 (n_nodes,)            go left when x[feature] <= threshold
+    left, right  int32 (n_nodes,)              child node indices; leaves point to themselves
+    value        float64 (n_nodes, n_classes)  class probabilities of each leaf
+    roots        int32 (n_trees,)              root node of each tree
+
+Inputs are cast to float32 and leaf probabilities are summed over the trees
+in order, exactly as sklearn does, so predictions and probabilities are
+bit-identical to the original forest.
+"""
+import logging
+import numpy as np
+import sklearn
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.utils.fixes import parse_version
+
+logger = logging.getLogger(__name__)
+
+# Before 1.4 tree_.value held weighted class counts that predict_proba normalized
+# per call; since then it holds the normalized proportions
+_NORMALIZE_LEAVES = parse_version(sklearn.__version__) < parse_version('1.4')
+
+# Random rows checked against sklearn when compiling
+VERIFY_SAMPLES = 64
+
+
+def _leaf_probabilities(tree, n_classes):
+    value = tree.value[:, 0, :n_classes].astype(np.float64)
+    if _NORMALIZE_LEAVES:
+        # Same arithmetic as DecisionTreeClassifier.predict_proba
+        normalizer = value.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        value /= normalizer
+    return value
+
+
+class CompiledForest:
+    """A RandomForestClassifier flattened into node arrays; see the module docstring."""
+
+    ARRAYS = ('feature', 'threshold', 'left', 'right', 'value', 'roots')
+
+    def __init__(self, feature, threshold, left, right, value, roots, classes, depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.depth = depth
+        self.n_features_in_ = None
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Flatten a fitted single-output RandomForestClassifier."""
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be compiled")
+        n_classes = len(model.classes_)
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for offset, tree in zip(offsets, trees):
+            nodes = np.arange(tree.node_count, dtype=np.int64) + offset
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(np.where(is_leaf, 0.0, tree.threshold))
+            left.append(np.where(is_leaf, nodes, tree.children_left + offset))
+            right.append(np.where(is_leaf, nodes, tree.children_right + offset))
+            value.append(_leaf_probabilities(tree, n_classes))
+
+        compiled = cls(
+            feature=np.ascontiguousarray(np.concatenate(feature), dtype=np.int32),
+            threshold=np.ascontiguousarray(np.concatenate(threshold), dtype=np.float64),
+            left=np.ascontiguousarray(np.concatenate(left), dtype=np.int32),
+            right=np.ascontiguousarray(np.concatenate(right), dtype=np.int32),
+            value=np.ascontiguousarray(np.concatenate(value), dtype=np.float64),
+            roots=np.ascontiguousarray(offsets[:-1], dtype=np.int32),
+            classes=np.asarray(model.classes_),
+            depth=max(tree.max_depth for tree in trees),
+        )
+        compiled.n_features_in_ = model.n_features_in_
+        return compiled
+
+    @classmethod
+    def from_arrays(cls, arrays, classes, depth, n_features):
+        """Rebuild from the node arrays of arrays(), e.g. memory-mapped from a model artifact."""
+        compiled = cls(*(arrays[name] for name in cls.ARRAYS), classes=classes, depth=depth)
+        compiled.n_features_in_ = n_features
+        return compiled
+
+    def arrays(self):
+        return {name: getattr(self, name) for name in self.ARRAYS}
+
+    @property
+    def n_estimators(self):
+        return len(self.roots)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self.arrays().values())
+
+    def apply(self, X):
+        """Leaf node index of every (sample, tree) pair, shape (n_samples, n_trees)."""
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim == 1:
+            X = X[np.newaxis, :]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots)))
+        rows = np.arange(len(X))[:, np.newaxis]
+        # Leaves point to themselves, so every path can take `depth` steps
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        # Reducing over the tree axis adds the trees one after another, like sklearn's accumulation
+        proba = self.value[self.apply(X)].sum(axis=1)
+        proba /= len(self.roots)
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1), axis=0)
+
+
+def _verification_rows(model, samples):
+    # Values around the split thresholds exercise both branches of most nodes
+    thresholds = np.concatenate([e.tree_.threshold[e.tree_.children_left != -1] for e in model.estimators_])
+    low, high = (thresholds.min(), thresholds.max()) if len(thresholds) else (0.0, 1.0)
+    rng = np.random.default_rng(0)
+    return rng.uniform(low, high, (samples, model.n_features_in_)).astype(np.float32)
+
+
+def compile_model(model, verify=True):
+    """
+    Return a CompiledForest for a RandomForestClassifier, or the model itself
+    for anything else. With verify, the compiled forest is checked against
+    sklearn on random rows and the original model is kept on any mismatch.
+    """
+    if not isinstance(model, RandomForestClassifier):
+        return model
+    try:
+        compiled = CompiledForest.from_sklearn(model)
+        if verify:
+            rows = _verification_rows(model, VERIFY_SAMPLES)
+            if not np.array_equal(compiled.predict_proba(rows), model.predict_proba(rows)):
+                logger.warning("Compiled forest differs from sklearn; using the sklearn model")
+                return model
+        return compiled
+    except Exception as e:
+        logger.warning(f"Could not compile forest, using the sklearn model: {e}")
+        return model
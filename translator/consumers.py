@@ -1,17 +1,25 @@
 import json
-import base64
+import asyncio
 import cv2
 import numpy as np
-import pickle
 import mediapipe as mp
 import logging
-import threading
 import time
-import os
 from channels.generic.websocket import AsyncWebsocketConsumer
 from asgiref.sync import sync_to_async
-from django.contrib.auth.models import User
-from .models import TrainedModel, TranslationSession
+from .models import TrainedModel
+from .model_cache import model_cache
+from .schema import default_user
+from .recording import SessionRecorder
+from .detectors import tracking_detectors, acquire_on
+from .inference import inference_executor
+from .batching import prediction_batcher
+from .features import extract_features, landmark_array
+from .segmentation import LandmarkHistory
+from .protocol import (
+    pack_frame, unpack_client_frame, FrameAgeTracker, PayloadStats,
+    PROTOCOLS, PROTOCOL_JPEG, PROTOCOL_LANDMARKS
+)
 from django.conf import settings
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -27,24 +35,68 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        # Initialize MediaPipe
-        self.mp_hands = mp.solutions.hands
-        self.mp_pose = mp.solutions.pose
-        self.hands = self.mp_hands.Hands(static_image_mode=False, max_num_hands=2, min_detection_confidence=0.3)
-        self.pose = self.mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.3)
-        self.mp_drawing = mp.solutions.drawing_utils
-        
-        # Initialize model variables
+        # Per-session state comes first: disconnect() also runs for a session
+        # rejected below
         self.model = None
         self.label_mapping = {}
         self.inverse_label_mapping = {}
         self.last_prediction_time = time.time()
         self.prediction_interval = 3.0  # seconds
-        self.landmarks_history = []
+        self.history = LandmarkHistory(
+            settings.REALTIME_HISTORY_FRAMES,
+            smoothing_factor=settings.REALTIME_SMOOTHING_FACTOR
+        )
         self.text_output = ""
+        self.recorder = None
+        
+        # Response protocol: re-encoded JPEG frames or compact landmark payloads
+        self.protocol = PROTOCOL_JPEG
+        self.frame_seq = 0
+        self.payload_stats = PayloadStats()
+        
+        # Credit-based flow control: the client may have at most `frame_window`
+        # unacknowledged frames in flight
+        self.frame_window = getattr(settings, 'REALTIME_FRAME_WINDOW', 2)
+        self.max_frame_age = getattr(settings, 'REALTIME_MAX_FRAME_AGE', 0.5)
+        self.frame_ages = FrameAgeTracker()
+        self.frames_stale = 0
+        
+        # One-slot mailbox: while a frame is being processed only the newest
+        # incoming frame is kept, older ones are dropped
+        self.pending_frame = None
+        self.frame_task = None
+        self.frames_processed = 0
+        self.frames_dropped = 0
+        self.stats_interval = getattr(settings, 'REALTIME_STATS_INTERVAL', 2.0)
+        self.last_stats_time = time.monotonic()
+        
+        # Check out a tracking detector for the lifetime of the session
+        self.mp_hands = mp.solutions.hands
+        self.mp_pose = mp.solutions.pose
+        self.mp_drawing = mp.solutions.drawing_utils
+        self.detector = None
+        try:
+            # Waits for a free detector off the session's worker thread
+            self.detector = await acquire_on(
+                tracking_detectors,
+                self.run_inference,
+                getattr(settings, 'DETECTOR_SESSION_TIMEOUT', 5.0)
+            )
+        except TimeoutError as e:
+            logging.warning(f"Rejecting session {self.session_id}: {e}")
+            inference_executor.release_session(self.channel_name)
+            await self.close()
+            return
+        self.hands = self.detector.hands
+        self.pose = self.detector.pose
         
         logging.debug(f"WebSocket connection established for session {self.session_id}")
         await self.accept()
+        await self.send(text_data=json.dumps({
+            'type': 'flow',
+            'window': self.frame_window,
+            'max_frame_age': self.max_frame_age
+        }))
     
     async def disconnect(self, close_code):
         logging.debug(f"WebSocket disconnected with code {close_code}")
@@ -54,11 +106,23 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
         
-        # Clean up resources
-        if hasattr(self, 'hands'):
-            self.hands.close()
-        if hasattr(self, 'pose'):
-            self.pose.close()
+        # Let the in-flight frame finish before the detector goes back to the pool
+        self.pending_frame = None
+        if getattr(self, 'frame_task', None) is not None:
+            try:
+                await self.frame_task
+            except Exception as e:
+                logging.error(f"Error finishing frame on disconnect: {e}")
+        
+        # Write the words still buffered and close the recorded session
+        if getattr(self, 'recorder', None) is not None:
+            await self.recorder.close()
+        
+        # Return the detector to the pool from the worker thread that acquired it
+        if getattr(self, 'detector', None) is not None:
+            await self.run_inference(tracking_detectors.release, self.detector)
+            self.detector = None
+        inference_executor.release_session(self.channel_name)
     
     async def receive(self, text_data=None, bytes_data=None):
         if text_data:
@@ -68,10 +132,16 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
             
             if message_type == 'load_model':
                 model_id = text_data_json.get('model_id')
-                success = await self.load_model(model_id)
+                model_obj = await self.load_model(model_id, text_data_json.get('min_accuracy'))
+                success = model_obj is not None
+                if success:
+                    await self.start_recording(model_obj)
                 await self.send(text_data=json.dumps({
                     'type': 'model_loaded',
-                    'success': success
+                    'success': success,
+                    'model_id': model_obj.id if success else None,
+                    'model_name': model_obj.name if success else None,
+                    'inference_ms': model_obj.inference_ms if success else None
                 }))
                 logging.debug(f"Model {model_id} loaded: {success}")
             
@@ -83,69 +153,204 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
                 }))
                 logging.debug(f"Interval set to {self.prediction_interval}")
             
+            elif message_type == 'set_history':
+                try:
+                    window = int(text_data_json.get('window', self.history.window))
+                    smoothing_factor = text_data_json.get('smoothing_factor', self.history.smoothing_factor)
+                    history = LandmarkHistory(
+                        min(max(window, 1), 300),
+                        smoothing_factor=float(smoothing_factor) if smoothing_factor else None
+                    )
+                except (TypeError, ValueError, OverflowError) as e:
+                    await self.send_error(f"Invalid history settings: {e}")
+                    return
+                self.history = history
+                await self.send(text_data=json.dumps({
+                    'type': 'history_set',
+                    'window': self.history.window,
+                    'smoothing_factor': self.history.smoothing_factor
+                }))
+                logging.debug(f"History set to {self.history.window} frames, smoothing {self.history.smoothing_factor}")
+            
             elif message_type == 'clear_output':
                 self.text_output = ""
                 await self.send(text_data=json.dumps({
                     'type': 'output_cleared'
                 }))
                 logging.debug("Output cleared")
-        
-        elif bytes_data:
-            # Process frame data
-            if self.model is None:
+            
+            elif message_type == 'set_protocol':
+                protocol = text_data_json.get('protocol', PROTOCOL_JPEG)
+                if protocol in PROTOCOLS:
+                    self.protocol = protocol
+                    self.payload_stats = PayloadStats()
                 await self.send(text_data=json.dumps({
-                    'type': 'error',
-                    'message': 'Model not loaded'
+                    'type': 'protocol_set',
+                    'protocol': self.protocol
                 }))
-                return
+                logging.debug(f"Protocol set to {self.protocol}")
             
-            # Convert bytes to numpy array
-            frame = await self.bytes_to_frame(bytes_data)
-            if frame is None:
+            elif message_type == 'get_stats':
+                await self.send_stats()
+        
+        elif bytes_data:
+            # Every frame gets exactly one binary response or ack
+            try:
+                frame_data = unpack_client_frame(bytes_data)
+            except ValueError as e:
+                await self.send_error(str(e))
                 return
             
-            # Extract landmarks
-            landmarks, frame_with_skeleton, _, hands_detected = await self.extract_landmarks(frame)
+            # Latest frame wins: replace a frame that is still waiting
+            if self.pending_frame is not None:
+                self.frames_dropped += 1
+                await self.send_ack(self.pending_frame[0], dropped=True)
+            seq = frame_data[0] if frame_data[0] is not None else self.frame_seq + 1
+            self.frame_seq = seq
+            self.pending_frame = (seq,) + frame_data[1:]
             
-            # Send processed frame back
-            processed_frame_bytes = await self.frame_to_bytes(frame_with_skeleton)
-            await self.send(bytes_data=processed_frame_bytes)
+            if self.frame_task is None or self.frame_task.done():
+                self.frame_task = asyncio.create_task(self.drain_frames())
+    
+    async def drain_frames(self):
+        # Process the mailbox until no newer frame arrived in the meantime
+        while self.pending_frame is not None:
+            seq, captured_at, jpeg_bytes = self.pending_frame
+            self.pending_frame = None
+            try:
+                await self.process_frame(seq, captured_at, jpeg_bytes)
+            except Exception as e:
+                logging.error(f"Error processing frame {seq}: {e}")
+                await self.send_ack(seq, dropped=True)
             
-            # Check if it's time to make a prediction
-            current_time = time.time()
-            if hands_detected and landmarks and current_time - self.last_prediction_time >= self.prediction_interval:
-                # Make prediction
-                prediction = await self.predict(landmarks)
-                if prediction:
-                    self.text_output += prediction + " "
-                    self.last_prediction_time = current_time
-                    
-                    # Send prediction
-                    await self.send(text_data=json.dumps({
-                        'type': 'prediction',
-                        'word': prediction,
-                        'full_text': self.text_output
-                    }))
-                    logging.debug(f"Prediction: {prediction}")
+            if time.monotonic() - self.last_stats_time >= self.stats_interval:
+                await self.send_stats()
+    
+    async def process_frame(self, seq, captured_at, jpeg_bytes):
+        if self.model is None:
+            await self.send_error('Model not loaded', seq)
+            return
+        
+        # Drop frames that waited too long behind slower inference
+        if self.frame_ages.age(captured_at) > self.max_frame_age:
+            self.frames_stale += 1
+            await self.send_ack(seq, dropped=True)
+            return
+        
+        # Convert bytes to numpy array
+        frame = await self.run_inference(self.bytes_to_frame, jpeg_bytes)
+        if frame is None:
+            await self.send_ack(seq, dropped=True)
+            return
+        
+        landmarks_mode = self.protocol == PROTOCOL_LANDMARKS
+        
+        # Extract landmarks (the browser draws the overlay in landmarks mode)
+        landmarks, frame_with_skeleton, bounding_boxes, hands_detected, skeleton = await self.run_inference(
+            self.extract_landmarks, frame, draw_skeleton=not landmarks_mode
+        )
+        
+        # Send processed frame back
+        if not landmarks_mode:
+            started = time.perf_counter()
+            processed_frame_bytes = await self.run_inference(self.frame_to_bytes, frame_with_skeleton)
+            self.payload_stats.record(processed_frame_bytes, started)
+            await self.send(bytes_data=processed_frame_bytes)
+        
+        # Every frame with hands goes into the rolling history that predictions average
+        if hands_detected and landmarks:
+            self.history.add(landmarks[0])
+        
+        # Check if it's time to make a prediction
+        prediction = None
+        current_time = time.time()
+        if hands_detected and landmarks and current_time - self.last_prediction_time >= self.prediction_interval:
+            # Make prediction (batched with other sessions on the same model)
+            prediction, confidence = await self.predict()
+            if prediction:
+                self.text_output += prediction + " "
+                self.last_prediction_time = current_time
+                
+                # Buffered; written to the database in batches
+                if self.recorder is not None:
+                    self.recorder.record(prediction, confidence)
+                
+                # Send prediction
+                await self.send(text_data=json.dumps({
+                    'type': 'prediction',
+                    'word': prediction,
+                    'confidence': confidence,
+                    'full_text': self.text_output
+                }))
+                logging.debug(f"Prediction: {prediction}")
+        
+        # Send the landmark payload, carrying this frame's prediction if any
+        if landmarks_mode:
+            started = time.perf_counter()
+            h, w = frame.shape[:2]
+            payload = pack_frame(
+                w, h, seq,
+                hands=skeleton['hands'],
+                pose=skeleton['pose'],
+                boxes=bounding_boxes,
+                word=prediction
+            )
+            self.payload_stats.record(payload, started)
+            await self.send(bytes_data=payload)
+        
+        self.frames_processed += 1
+    
+    async def run_inference(self, func, *args, **kwargs):
+        # CPU-heavy work runs on this session's dedicated inference thread
+        return await inference_executor.run(self.channel_name, func, *args, **kwargs)
+    
+    async def send_stats(self):
+        self.last_stats_time = time.monotonic()
+        await self.send(text_data=json.dumps({
+            'type': 'stats',
+            'protocol': self.protocol,
+            'payload': self.payload_stats.as_dict(),
+            'frames_processed': self.frames_processed,
+            'frames_dropped': self.frames_dropped,
+            'frames_stale': self.frames_stale,
+            'batching': prediction_batcher.stats(),
+            'recording': self.recorder.stats() if self.recorder is not None else None
+        }))
+    
+    async def send_ack(self, seq, dropped=False):
+        await self.send(text_data=json.dumps({
+            'type': 'ack',
+            'seq': seq,
+            'dropped': dropped
+        }))
+    
+    async def send_error(self, message, seq=None):
+        await self.send(text_data=json.dumps({
+            'type': 'error',
+            'message': message
+        }))
+        if seq is not None:
+            await self.send_ack(seq, dropped=True)
     
     @sync_to_async
-    def load_model(self, model_id):
+    def load_model(self, model_id, min_accuracy=None):
+        """Load a model (or the fastest accurate-enough one for 'auto'); returns its TrainedModel or None."""
         try:
-            model_obj = TrainedModel.objects.get(id=model_id)
-            model_path = os.path.join(settings.MEDIA_ROOT, model_obj.file.name)
-            
-            with open(model_path, 'rb') as f:
-                model_data = pickle.load(f)
-                self.model = model_data['model']
-                self.label_mapping = model_data.get('label_mapping', {})
-                self.inverse_label_mapping = {v: k for k, v in self.label_mapping.items()}
+            model_obj = TrainedModel.resolve(
+                model_id,
+                user=default_user(),
+                min_accuracy=float(min_accuracy) if min_accuracy is not None else None,
+            )
+            loaded = model_cache.get(model_obj)
+            self.model = loaded.predictor
+            self.label_mapping = loaded.label_mapping
+            self.inverse_label_mapping = loaded.inverse_label_mapping
             
-            return True
+            return model_obj
         except Exception as e:
             logging.error(f"Error loading model: {str(e)}")
-            return False
+            return None
     
-    @sync_to_async
     def bytes_to_frame(self, bytes_data):
         try:
             # Decode image
@@ -156,7 +361,6 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
             logging.error(f"Error converting bytes to frame: {str(e)}")
             return None
     
-    @sync_to_async
     def frame_to_bytes(self, frame):
         try:
             # Encode frame to bytes
@@ -166,7 +370,6 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
             logging.error(f"Error converting frame to bytes: {str(e)}")
             return b''
     
-    @sync_to_async
     def extract_landmarks(self, frame, draw_skeleton=True):
         try:
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -176,46 +379,32 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
             hand_results = self.hands.process(frame_rgb)
             pose_results = self.pose.process(frame_rgb)
             landmarks_list = []
-            frame_with_skeleton = frame.copy()
+            frame_with_skeleton = frame.copy() if draw_skeleton else frame
             bounding_boxes = []
             hands_detected = False
+            skeleton = {'hands': [], 'pose': None}
 
-            data_aux = []
             if hand_results.multi_hand_landmarks:
                 hands_detected = True
-                for hand_idx, hand_landmarks in enumerate(hand_results.multi_hand_landmarks):
+                for hand_landmarks in hand_results.multi_hand_landmarks:
                     if draw_skeleton:
                         self.mp_drawing.draw_landmarks(
                             frame_with_skeleton,
                             hand_landmarks,
                             self.mp_hands.HAND_CONNECTIONS
                         )
-                    x_coords = [landmark.x for landmark in hand_landmarks.landmark]
-                    y_coords = [landmark.y for landmark in hand_landmarks.landmark]
-                    x_min = int(min(x_coords) * w) - 20
-                    x_max = int(max(x_coords) * w) + 20
-                    y_min = int(min(y_coords) * h) - 20
-                    y_max = int(max(y_coords) * h) + 20
+                    coords = landmark_array(hand_landmarks)
+                    skeleton['hands'].append(coords)
+                    x_min = int(coords[:, 0].min() * w) - 20
+                    x_max = int(coords[:, 0].max() * w) + 20
+                    y_min = int(coords[:, 1].min() * h) - 20
+                    y_max = int(coords[:, 1].max() * h) + 20
                     bounding_boxes.append((x_min, y_min, x_max, y_max))
                     if draw_skeleton:
                         cv2.rectangle(frame_with_skeleton, (x_min, y_min), (x_max, y_max), (0, 255, 0), 2)
-                    x_ = [landmark.x for landmark in hand_landmarks.landmark]
-                    y_ = [landmark.y for landmark in hand_landmarks.landmark]
-                    if x_ and y_:
-                        for i in range(len(hand_landmarks.landmark)):
-                            x = hand_landmarks.landmark[i].x
-                            y = hand_landmarks.landmark[i].y
-                            data_aux.append(x - min(x_))
-                            data_aux.append(y - min(y_))
 
             if pose_results.pose_landmarks:
-                pose_landmarks = pose_results.pose_landmarks.landmark
-                left_elbow = pose_landmarks[13]
-                data_aux.append(left_elbow.x * w)
-                data_aux.append(left_elbow.y * h)
-                right_elbow = pose_landmarks[14]
-                data_aux.append(right_elbow.x * w)
-                data_aux.append(right_elbow.y * h)
+                skeleton['pose'] = landmark_array(pose_results.pose_landmarks)
                 if draw_skeleton:
                     self.mp_drawing.draw_landmarks(
                         frame_with_skeleton,
@@ -223,35 +412,40 @@ class TranslatorConsumer(AsyncWebsocketConsumer):
                         self.mp_pose.POSE_CONNECTIONS
                     )
 
-            if len(data_aux) < 88:
-                data_aux.extend([0.0] * (88 - len(data_aux)))
-
-            landmarks_list.append(data_aux)
-            return landmarks_list, frame_with_skeleton, bounding_boxes, hands_detected
+            landmarks_list.append(extract_features(hand_results, pose_results, w, h))
+            return landmarks_list, frame_with_skeleton, bounding_boxes, hands_detected, skeleton
         except Exception as e:
             logging.error(f"Error extracting landmarks: {e}")
-            return [], frame, [], False
+            return [], frame, [], False, {'hands': [], 'pose': None}
     
-    @sync_to_async
-    def predict(self, landmarks):
+    async def predict(self):
+        """Returns (word, confidence), or (None, None) when nothing can be predicted."""
         try:
-            if not landmarks or not self.model:
-                return None
-            
-            # Store landmarks for motion detection
-            self.landmarks_history.append(landmarks[0])
-            if len(self.landmarks_history) > 30:  # Keep only last 30 frames
-                self.landmarks_history.pop(0)
+            if not self.model:
+                return None, None
             
-            # Use average of recent landmarks for prediction
-            avg_features = np.mean(self.landmarks_history, axis=0)
-            if len(avg_features) == 88:  # Expected feature length
-                prediction = self.model.predict([avg_features])
-                predicted_idx = prediction[0]
-                predicted_word = self.inverse_label_mapping.get(predicted_idx, "Unknown")
-                return predicted_word
-            
-            return None
+            # Running mean of the recent frames, O(1) in the window length
+            avg_features = self.history.mean()
+            if avg_features is None:
+                return None, None
+            predicted_idx, confidence = await prediction_batcher.predict(self.model, avg_features)
+            predicted_word = self.inverse_label_mapping.get(predicted_idx, "Unknown")
+            return predicted_word, confidence
         except Exception as e:
             logging.error(f"Error making prediction: {str(e)}")
-            return None
+            return None, None
+    
+    async def start_recording(self, model_obj):
+        # Loading a different model closes the recorded session and starts a new one
+        if self.recorder is not None:
+            if self.recorder.model_obj.id == model_obj.id:
+                return
+            await self.recorder.close()
+            self.recorder = None
+        if settings.RECORD_TRANSLATIONS:
+            self.recorder = SessionRecorder(
+                await sync_to_async(default_user)(),
+                model_obj,
+                settings.RECORDING_FLUSH_WORDS,
+                settings.RECORDING_FLUSH_INTERVAL
+            )
@@ -0,0 +1,193 @@
+"""
+Columnar training dataset format.
+
+A dataset is a single uncompressed zip (.npz) with three members:
+
+    header.json     format name, version, feature length/version, class table,
+                    sample count and free-form build metadata
+    features.npy    float32 (n_samples, feature_length), C order
+    labels.npy      int32 (n_samples,), indices into header['classes']
+
+Members are stored without compression, so load_dataset(..., mmap_mode='r')
+maps the arrays straight out of the file without reading or copying them.
+The file is also readable with plain np.load. Legacy pickles ({'data',
+'labels', 'class_names'} lists) are converted on load or with
+`manage.py convert_datasets`.
+"""
+import os
+import json
+import pickle
+import zipfile
+import logging
+from collections import Counter
+import numpy as np
+from .features import FEATURE_VERSION
+
+logger = logging.getLogger(__name__)
+
+DATASET_FORMAT = 'sign-language-dataset'
+DATASET_VERSION = 1
+DATASET_EXTENSION = '.npz'
+
+HEADER_MEMBER = 'header.json'
+FEATURES_MEMBER = 'features.npy'
+LABELS_MEMBER = 'labels.npy'
+
+
+class Dataset:
+    """Feature matrix, label indices and class table of one training set."""
+
+    def __init__(self, features, labels, classes, metadata=None):
+        self.features = features
+        self.labels = labels
+        self.classes = list(classes)
+        self.metadata = metadata or {}
+
+    def __len__(self):
+        return len(self.labels)
+
+    @property
+    def feature_length(self):
+        return self.features.shape[1]
+
+    @property
+    def label_names(self):
+        return np.asarray(self.classes, dtype=object)[self.labels]
+
+    @property
+    def sample_keys(self):
+        """Landmark store key of each row, for per-frame sequences (None where unknown)."""
+        return self.metadata.get('sample_keys') or [None] * len(self)
+
+    @property
+    def label_mapping(self):
+        return {name: index for index, name in enumerate(self.classes)}
+
+    def header(self):
+        return {
+            'format': DATASET_FORMAT,
+            'version': DATASET_VERSION,
+            'feature_length': self.feature_length,
+            'feature_version': FEATURE_VERSION,
+            'samples': len(self),
+            'classes': self.classes,
+            'metadata': self.metadata,
+        }
+
+    @classmethod
+    def from_samples(cls, samples, label_names, metadata=None, sample_keys=None):
+        """
+        Build a dataset from per-sample feature vectors and label strings.
+
+        Samples whose length differs from the most common length are dropped.
+        Classes are sorted, so label indices match sklearn's LabelEncoder.
+        `sample_keys` are the samples' landmark store keys, kept in the
+        metadata aligned with the rows.
+        """
+        lengths = Counter(len(sample) for sample in samples)
+        if not lengths:
+            return cls(np.zeros((0, 0), dtype=np.float32), np.zeros(0, dtype=np.int32), [], metadata)
+        feature_length = lengths.most_common(1)[0][0]
+        keep = [i for i, sample in enumerate(samples) if len(sample) == feature_length]
+        if len(keep) < len(samples):
+            logger.warning(f"Dropping {len(samples) - len(keep)} samples whose length is not {feature_length}")
+
+        features = np.empty((len(keep), feature_length), dtype=np.float32)
+        for row, i in enumerate(keep):
+            features[row] = samples[i]
+        kept_names = [label_names[i] for i in keep]
+        classes = sorted(set(kept_names))
+        index = {name: i for i, name in enumerate(classes)}
+        labels = np.fromiter((index[name] for name in kept_names), dtype=np.int32, count=len(kept_names))
+        if sample_keys is not None:
+            metadata = dict(metadata or {}, sample_keys=[sample_keys[i] for i in keep])
+        return cls(features, labels, classes, metadata)
+
+
+def write_npy_member(archive, name, array):
+    with archive.open(name, 'w', force_zip64=True) as f:
+        np.lib.format.write_array(f, np.ascontiguousarray(array), allow_pickle=False)
+
+
+def save_dataset(dataset, path):
+    """Write a dataset atomically; returns the path."""
+    tmp_path = f"{path}.tmp"
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_STORED) as archive:
+        archive.writestr(HEADER_MEMBER, json.dumps(dataset.header(), ensure_ascii=False))
+        write_npy_member(archive, FEATURES_MEMBER, dataset.features.astype(np.float32, copy=False))
+        write_npy_member(archive, LABELS_MEMBER, dataset.labels.astype(np.int32, copy=False))
+    os.replace(tmp_path, path)
+    return path
+
+
+def mmap_npy_member(path, archive, name, mode):
+    """Memory-map an uncompressed .npy member of a zip file in place."""
+    info = archive.getinfo(name)
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(f"{name} is compressed and cannot be memory-mapped")
+    with open(path, 'rb') as f:
+        # Skip the local file header to reach the member's data
+        f.seek(info.header_offset)
+        local_header = f.read(30)
+        name_length = int.from_bytes(local_header[26:28], 'little')
+        extra_length = int.from_bytes(local_header[28:30], 'little')
+        f.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        elif version == (2, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        else:
+            raise ValueError(f"Unsupported .npy version {version} in {name}")
+        offset = f.tell()
+    return np.memmap(path, dtype=dtype, mode=mode, offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
+
+
+def _load_npz(path, mmap_mode=None):
+    with zipfile.ZipFile(path) as archive:
+        header = json.loads(archive.read(HEADER_MEMBER))
+        if header.get('format') != DATASET_FORMAT or header.get('version') != DATASET_VERSION:
+            raise ValueError(f"Unsupported dataset {path} (format={header.get('format')}, version={header.get('version')})")
+        if mmap_mode:
+            features = mmap_npy_member(path, archive, FEATURES_MEMBER, mmap_mode)
+            labels = mmap_npy_member(path, archive, LABELS_MEMBER, mmap_mode)
+        else:
+            with archive.open(FEATURES_MEMBER) as f:
+                features = np.lib.format.read_array(f, allow_pickle=False)
+            with archive.open(LABELS_MEMBER) as f:
+                labels = np.lib.format.read_array(f, allow_pickle=False)
+    if header.get('feature_version') != FEATURE_VERSION:
+        logger.warning(f"Dataset {path} was built with feature version {header.get('feature_version')}, current is {FEATURE_VERSION}")
+    return Dataset(features, labels, header['classes'], header.get('metadata'))
+
+
+def load_legacy_pickle(path):
+    """Read an old {'data', 'labels', 'class_names'} pickle into a Dataset."""
+    with open(path, 'rb') as f:
+        data_dict = pickle.load(f)
+    metadata = {key: value for key, value in data_dict.items() if key not in ('data', 'labels', 'class_names')}
+    metadata['converted_from'] = os.path.basename(path)
+    return Dataset.from_samples(data_dict['data'], data_dict['labels'], metadata)
+
+
+def load_dataset(path, mmap_mode=None):
+    """
+    Load a dataset file.
+
+    With mmap_mode ('r' or 'c') the feature and label arrays are memory-mapped
+    instead of read. Legacy pickles are converted in memory.
+    """
+    if zipfile.is_zipfile(path):
+        return _load_npz(path, mmap_mode)
+    return load_legacy_pickle(path)
+
+
+def convert_legacy_dataset(pickle_path, out_path=None):
+    """Convert a legacy pickle to the columnar format; returns the new path."""
+    if out_path is None:
+        out_path = os.path.splitext(pickle_path)[0] + DATASET_EXTENSION
+    dataset = load_legacy_pickle(pickle_path)
+    save_dataset(dataset, out_path)
+    logger.info(f"Converted {pickle_path} -> {out_path} ({len(dataset)} samples, {len(dataset.classes)} classes)")
+    return out_path
@@ -0,0 +1,254 @@
+import time
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+import numpy as np
+import mediapipe as mp
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+mp_hands = mp.solutions.hands
+mp_pose = mp.solutions.pose
+
+
+class Detector:
+    """One MediaPipe Hands + Pose graph pair."""
+
+    def __init__(self, static_image_mode, min_detection_confidence):
+        self.hands = mp_hands.Hands(
+            static_image_mode=static_image_mode,
+            max_num_hands=2,
+            min_detection_confidence=min_detection_confidence
+        )
+        self.pose = mp_pose.Pose(
+            static_image_mode=static_image_mode,
+            min_detection_confidence=min_detection_confidence
+        )
+        self.owner = None
+
+    def process(self, frame_rgb):
+        return self.hands.process(frame_rgb), self.pose.process(frame_rgb)
+
+    def reset(self):
+        # Restart the graphs so tracking state does not leak to the next owner
+        self.hands.reset()
+        self.pose.reset()
+
+    def close(self):
+        self.hands.close()
+        self.pose.close()
+
+
+class DetectorPool:
+    """
+    Bounded pool of reusable Detector instances.
+
+    A detector is owned by the thread that acquired it until that same thread
+    releases it. Tracking detectors (static_image_mode=False) are reset on
+    release so every checkout starts a fresh stream.
+    """
+
+    def __init__(self, name, static_image_mode, min_detection_confidence, max_size):
+        self.name = name
+        self.static_image_mode = static_image_mode
+        self.min_detection_confidence = min_detection_confidence
+        self.max_size = max_size
+        self._idle = []
+        self._size = 0
+        self._cond = threading.Condition()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _create(self):
+        return Detector(self.static_image_mode, self.min_detection_confidence)
+
+    def _free(self):
+        # Caller holds self._cond
+        return bool(self._idle) or self._size < self.max_size
+
+    def _wait_free(self, deadline):
+        # Caller holds self._cond
+        while not self._free():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            self._cond.wait(remaining)
+        return True
+
+    def acquire(self, timeout=None):
+        """Check out a detector, blocking up to `timeout` seconds if the pool is exhausted."""
+        if timeout is None:
+            timeout = getattr(settings, 'DETECTOR_POOL_TIMEOUT', 30.0)
+        start = time.monotonic()
+        with self._cond:
+            if not self._wait_free(start + timeout):
+                self.timeouts += 1
+                raise TimeoutError(f"No free {self.name} detector after {timeout}s")
+            detector = self._take()
+        # Time spent blocked on the pool; graph construction is not counted
+        return self._checked_out(detector, time.monotonic() - start)
+
+    def try_acquire(self, waited=0.0):
+        """
+        Check out a detector only if one is free right now, else return None.
+        `waited` is time already spent waiting for one elsewhere, for the stats.
+        """
+        with self._cond:
+            if not self._free():
+                return None
+            detector = self._take()
+        return self._checked_out(detector, waited)
+
+    def wait_free(self, timeout):
+        """Block until a detector is free, up to `timeout` seconds, without taking it; returns whether one is."""
+        with self._cond:
+            return self._wait_free(time.monotonic() + timeout)
+
+    def _take(self):
+        # Caller holds self._cond and has checked _free(); None means "create one"
+        if self._idle:
+            return self._idle.pop()
+        self._size += 1
+        return None
+
+    def _checked_out(self, detector, waited):
+        if detector is None:
+            try:
+                detector = self._create()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify_all()
+                raise
+            logger.debug(f"Created {self.name} detector ({self._size}/{self.max_size})")
+
+        with self._cond:
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        detector.owner = threading.get_ident()
+        return detector
+
+    def release(self, detector):
+        if detector.owner != threading.get_ident():
+            raise RuntimeError(f"{self.name} detector released by a thread that does not own it")
+        detector.owner = None
+        try:
+            if not self.static_image_mode:
+                detector.reset()
+        except Exception as e:
+            logger.error(f"Error resetting {self.name} detector, discarding it: {e}")
+            detector.close()
+            with self._cond:
+                self._size -= 1
+                self._cond.notify_all()
+            return
+        with self._cond:
+            self._idle.append(detector)
+            self._cond.notify_all()
+
+    @contextmanager
+    def checkout(self, timeout=None):
+        detector = self.acquire(timeout)
+        try:
+            yield detector
+        finally:
+            self.release(detector)
+
+    def warm_up(self, count):
+        """Build up to `count` detectors and run one blank frame through each."""
+        count = min(count, self.max_size)
+        blank = np.zeros((64, 64, 3), dtype=np.uint8)
+        detectors = []
+        try:
+            for _ in range(count):
+                detector = self.acquire()
+                detectors.append(detector)
+                detector.process(blank)
+        finally:
+            for detector in detectors:
+                self.release(detector)
+
+    def close_all(self):
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for detector in idle:
+            detector.close()
+
+    def stats(self):
+        with self._cond:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'max_size': self.max_size,
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_total_ms': round(self.wait_total * 1000, 3),
+                'wait_avg_ms': round(self.wait_total * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+
+
+# Single still images (translate_frame)
+static_detectors = DetectorPool(
+    'static',
+    static_image_mode=True,
+    min_detection_confidence=0.2,
+    max_size=getattr(settings, 'DETECTOR_POOL_STATIC_SIZE', 4)
+)
+
+# Video streams (video translation, data processing, WebSocket sessions)
+tracking_detectors = DetectorPool(
+    'tracking',
+    static_image_mode=False,
+    min_detection_confidence=0.3,
+    max_size=getattr(settings, 'DETECTOR_POOL_TRACKING_SIZE', 8)
+)
+
+
+async def acquire_on(pool, run, timeout=None):
+    """
+    Check out a detector on an inference worker without blocking that worker.
+
+    `run(func, *args)` runs func on the worker thread that will own the
+    detector. The wait for a free detector happens on a separate thread, so
+    the other sessions pinned to the same worker keep going; the checkout on
+    the worker itself never waits. Raises TimeoutError after `timeout` seconds.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'DETECTOR_POOL_TIMEOUT', 30.0)
+    start = time.monotonic()
+    deadline = start + timeout
+    while True:
+        if not await asyncio.to_thread(pool.wait_free, max(deadline - time.monotonic(), 0)):
+            with pool._cond:
+                pool.timeouts += 1
+            raise TimeoutError(f"No free {pool.name} detector after {timeout}s")
+        detector = await run(pool.try_acquire, time.monotonic() - start)
+        if detector is not None:
+            return detector
+        # Another thread took it in between; wait for the next one
+
+
+def warm_up():
+    """Pre-build detectors so the first requests don't pay graph construction."""
+    try:
+        start = time.monotonic()
+        static_detectors.warm_up(getattr(settings, 'DETECTOR_WARMUP_STATIC', 1))
+        tracking_detectors.warm_up(getattr(settings, 'DETECTOR_WARMUP_TRACKING', 1))
+        logger.info(f"Detector warm-up finished in {time.monotonic() - start:.2f}s")
+    except Exception as e:
+        logger.error(f"Error warming up detectors: {e}")
+
+
+def detector_stats():
+    return {
+        'static': static_detectors.stats(),
+        'tracking': tracking_detectors.stats(),
+    }
@@ -0,0 +1,281 @@
+"""
+Landmark extraction for dataset builds.
+
+Nothing here touches the database, so the functions can run in worker
+processes started with the 'spawn' method while the web process keeps its
+own threads and MediaPipe graphs.
+"""
+import os
+import time
+import logging
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import cv2
+import numpy as np
+from .features import extract_features, FEATURE_LENGTH, FEATURE_VERSION
+
+logger = logging.getLogger(__name__)
+
+# Same detector settings as the tracking pool
+MIN_DETECTION_CONFIDENCE = 0.3
+
+
+def detect_hand_and_elbow_movement(video_path, hands, pose):
+    cap = cv2.VideoCapture(video_path)
+    cap.set(cv2.CAP_PROP_FPS, 60)
+    landmarks_history = []
+    motion_detected = False
+    start_frame = None
+    end_frame = None
+    expected_length = None
+    min_frames = 30
+    prev_landmarks = None
+    smoothing_factor = 0.7
+
+    while cap.isOpened():
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        h, w, _ = frame.shape
+        frame_rgb = cv2.convertScaleAbs(frame_rgb, alpha=1.5, beta=15)
+
+        hand_results = hands.process(frame_rgb)
+        pose_results = pose.process(frame_rgb)
+
+        data_aux = extract_features(hand_results, pose_results, w, h)
+
+        if expected_length is None and len(data_aux):
+            expected_length = len(data_aux)
+        if len(data_aux) == expected_length:
+            if prev_landmarks is not None:
+                data_aux = smoothing_factor * prev_landmarks + (1 - smoothing_factor) * data_aux
+            landmarks_history.append(data_aux)
+            if len(landmarks_history) > 1 and len(landmarks_history) >= min_frames:
+                prev_data = landmarks_history[-2]
+                curr_data = data_aux
+                if len(curr_data) == len(prev_data):
+                    diff = np.linalg.norm(curr_data - prev_data)
+                    if diff > 0.01:
+                        if not motion_detected:
+                            start_frame = len(landmarks_history) - 1
+                            motion_detected = True
+                    elif motion_detected and diff < 0.002:
+                        end_frame = len(landmarks_history) - 1
+                        break
+            prev_landmarks = data_aux
+        else:
+            if motion_detected and end_frame is None and len(landmarks_history) >= min_frames:
+                end_frame = len(landmarks_history) - 1
+                break
+
+    cap.release()
+    if not motion_detected:
+        if landmarks_history:
+            start_frame = 0
+            end_frame = len(landmarks_history) - 1
+        else:
+            landmarks_history = [np.zeros(88).tolist()]
+            start_frame = 0
+            end_frame = 0
+            logger.warning(f"No landmarks detected in video: {video_path}, using default zero features.")
+
+    return start_frame, end_frame, landmarks_history
+
+
+def sample_features(start_frame, end_frame, landmarks_history):
+    """Average the frames of the detected sign into one training sample (None if empty)."""
+    if not len(landmarks_history):
+        return None
+    frame_features = landmarks_history[start_frame:end_frame + 1] if start_frame is not None and end_frame is not None else landmarks_history
+    if not len(frame_features):
+        return None
+    expected_length = len(frame_features[0])
+    frame_features = [f for f in frame_features if len(f) == expected_length]
+    if len(frame_features) == 0:
+        logger.warning("No consistent features extracted, using default zero features.")
+        frame_features = [np.zeros(FEATURE_LENGTH).tolist()]
+    return np.mean(frame_features, axis=0)
+
+
+def extraction_config():
+    """Everything that affects extracted landmarks; part of the landmark cache key."""
+    import mediapipe
+    return {
+        'mediapipe': mediapipe.__version__,
+        'static_image_mode': False,
+        'max_num_hands': 2,
+        'min_detection_confidence': MIN_DETECTION_CONFIDENCE,
+        'contrast': [1.5, 15],
+        'smoothing_factor': 0.7,
+        'feature_version': FEATURE_VERSION,
+    }
+
+
+def extract_video(index, video_path, word, hands=None, pose=None, cached=None, keep_landmarks=False):
+    """
+    Extract one training sample from a video and report how it went.
+
+    `cached` is a (start_frame, end_frame, frames) landmark store entry; when
+    given, the video is not decoded at all. With keep_landmarks, freshly
+    extracted (start_frame, end_frame, frames) are returned under 'landmarks'
+    for the caller to store.
+
+    Returns a dict with the sample under 'features' (None if the video was
+    missing or failed) plus 'status', 'cached', 'frames', 'seconds' and 'error'.
+    """
+    report = {
+        'index': index,
+        'video': os.path.basename(video_path),
+        'word': word,
+        'status': 'ok',
+        'cached': cached is not None,
+        'frames': 0,
+        'seconds': 0.0,
+        'error': '',
+        'features': None,
+    }
+    started = time.perf_counter()
+    try:
+        if cached is not None:
+            start_frame, end_frame, landmarks_history = cached
+        elif not os.path.exists(video_path):
+            logger.warning(f"Video file not found: {video_path}")
+            report.update(status='missing', error='Video file not found')
+            return report
+        else:
+            start_frame, end_frame, landmarks_history = detect_hand_and_elbow_movement(video_path, hands, pose)
+            # Frames are stored as float32; average the same values a cache hit would see
+            landmarks_history = np.asarray(landmarks_history, dtype=np.float32)
+            if keep_landmarks:
+                report['landmarks'] = (start_frame, end_frame, landmarks_history)
+        report['frames'] = len(landmarks_history)
+        features = sample_features(start_frame, end_frame, landmarks_history)
+        if features is None:
+            logger.warning(f"No valid features extracted from video: {video_path}, using default zero features.")
+            features = np.zeros(FEATURE_LENGTH)
+            report['status'] = 'empty'
+        report['features'] = np.asarray(features, dtype=np.float64)
+    except Exception as e:
+        logger.error(f"Error extracting {video_path}: {e}")
+        logger.error(traceback.format_exc())
+        report.update(status='error', error=str(e) or e.__class__.__name__)
+    finally:
+        report['seconds'] = round(time.perf_counter() - started, 3)
+    return report
+
+
+def stage_video(video_path, staging_dir):
+    """
+    Hard-link a source video into staging_dir and return the path to read.
+
+    The link pins the file's contents for the job without copying any bytes.
+    Where linking is not possible (another filesystem, missing source) the
+    source path itself is returned and the video is read in place.
+    """
+    os.makedirs(staging_dir, exist_ok=True)
+    staged_path = os.path.join(staging_dir, os.path.basename(video_path))
+    try:
+        os.link(video_path, staged_path)
+        return staged_path
+    except FileExistsError:
+        return staged_path
+    except OSError as e:
+        logger.debug(f"Reading {video_path} in place: {e}")
+        return video_path
+
+
+# Per-process detector, created once by the pool initializer
+_worker_detector = None
+
+
+def _init_worker():
+    global _worker_detector
+    from .detectors import Detector
+    _worker_detector = Detector(static_image_mode=False, min_detection_confidence=MIN_DETECTION_CONFIDENCE)
+
+
+def _extract_in_worker(index, video_path, word, keep_landmarks):
+    # Every video is a new stream; drop tracking state from the previous one
+    _worker_detector.reset()
+    return extract_video(index, video_path, word, _worker_detector.hands, _worker_detector.pose,
+                         keep_landmarks=keep_landmarks)
+
+
+def _lookup(cache, video_path):
+    """Return (key, cached_entry) for a video; (None, None) if it cannot be hashed."""
+    try:
+        key = cache.key_for(video_path)
+    except OSError:
+        # Missing or unreadable; extract_video reports it
+        return None, None
+    return key, cache.get(key)
+
+
+def extract_videos(items, workers, detector_pool, progress=None, cache=None):
+    """
+    Extract samples for (video_path, word) items, fanning out over processes.
+
+    Videos found in the landmark `cache` are assembled from it without being
+    decoded. The rest run in this process on a detector checked out of
+    `detector_pool` when workers <= 1 or only one is left, otherwise in
+    worker processes that each own their own MediaPipe graphs; their
+    per-frame landmarks are added to the cache here, by the single writer.
+    Reports come back in input order regardless of completion order, with
+    the cache key under 'key'. progress(done, total) is called after each video.
+    """
+    total = len(items)
+    reports = [None] * total
+    pending = []
+    for index, (video_path, word) in enumerate(items):
+        key, cached = _lookup(cache, video_path) if cache is not None else (None, None)
+        if cached is not None:
+            reports[index] = extract_video(index, video_path, word, cached=cached)
+            reports[index]['key'] = key
+        else:
+            pending.append((index, video_path, word, key))
+    done = total - len(pending)
+    if progress and done:
+        progress(done, total)
+
+    keys = {index: key for index, _, _, key in pending}
+
+    def finish(report):
+        nonlocal done
+        landmarks = report.pop('landmarks', None)
+        key = keys[report['index']]
+        if landmarks is not None and key is not None:
+            cache.put(key, *landmarks, video=report['video'])
+        report['key'] = key if landmarks is not None else None
+        reports[report['index']] = report
+        done += 1
+        if progress:
+            progress(done, total)
+
+    if not pending:
+        return reports
+    keep_landmarks = cache is not None
+    if workers <= 1 or len(pending) == 1:
+        # Not worth starting processes
+        with detector_pool.checkout() as detector:
+            for index, video_path, word, key in pending:
+                detector.reset()
+                finish(extract_video(index, video_path, word, detector.hands, detector.pose,
+                                     keep_landmarks=keep_landmarks))
+        return reports
+
+    executor = ProcessPoolExecutor(
+        max_workers=min(workers, len(pending)),
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_worker,
+    )
+    try:
+        futures = [executor.submit(_extract_in_worker, index, video_path, word, keep_landmarks)
+                   for index, video_path, word, key in pending]
+        for future in as_completed(futures):
+            finish(future.result())
+    finally:
+        # Cancellation or failure: drop the videos that have not started yet
+        executor.shutdown(wait=True, cancel_futures=True)
+    return reports
@@ -0,0 +1,99 @@
+import numpy as np
+
+# Layout of the hand + elbow feature vector used for training and inference:
+#   per detected hand: 21 landmarks as (x - min(x), y - min(y)) pairs
+#   then, if a pose is detected: left elbow (x*w, y*h), right elbow (x*w, y*h)
+#   zero-padded to FEATURE_LENGTH
+FEATURE_LENGTH = 88
+HAND_LANDMARKS = 21
+HAND_FEATURES = HAND_LANDMARKS * 2
+LEFT_ELBOW = 13
+RIGHT_ELBOW = 14
+
+# Bumped whenever the layout or arithmetic above changes
+FEATURE_VERSION = 1
+
+
+def landmark_array(landmark_list):
+    """Return the (n, 2) float64 array of normalized x/y coordinates of a landmark list."""
+    landmarks = landmark_list.landmark
+    coords = np.fromiter(
+        (v for lm in landmarks for v in (lm.x, lm.y)),
+        dtype=np.float64,
+        count=len(landmarks) * 2
+    )
+    return coords.reshape(-1, 2)
+
+
+def _elbow_features(pose_results, w, h):
+    pose_landmarks = pose_results.pose_landmarks.landmark
+    left_elbow = pose_landmarks[LEFT_ELBOW]
+    right_elbow = pose_landmarks[RIGHT_ELBOW]
+    return np.array([left_elbow.x, left_elbow.y, right_elbow.x, right_elbow.y]) * np.array([w, h, w, h])
+
+
+def extract_features(hand_results, pose_results, w, h, out=None):
+    """
+    Build the hand + elbow feature vector for one frame of MediaPipe results.
+
+    Writes into `out` (a float64 array of FEATURE_LENGTH) when given, otherwise
+    into a fresh zeroed array. The values are bit-identical to the original
+    per-landmark Python loops.
+    """
+    hands = hand_results.multi_hand_landmarks or []
+    n_hands = len(hands)
+    has_pose = pose_results.pose_landmarks is not None
+    length = max(FEATURE_LENGTH, n_hands * HAND_FEATURES + (4 if has_pose else 0))
+
+    if out is None or len(out) != length:
+        out = np.zeros(length, dtype=np.float64)
+    else:
+        out[:] = 0.0
+
+    offset = 0
+    for hand_landmarks in hands:
+        coords = landmark_array(hand_landmarks)
+        size = coords.size
+        out[offset:offset + size] = (coords - coords.min(axis=0)).ravel()
+        offset += size
+
+    if has_pose:
+        out[offset:offset + 4] = _elbow_features(pose_results, w, h)
+
+    return out
+
+
+def extract_features_batch(frames):
+    """
+    Build feature vectors for many frames at once.
+
+    `frames` is a sequence of (hand_results, pose_results, w, h) tuples. Returns
+    an (n, FEATURE_LENGTH) float64 matrix; the min-subtraction for every hand
+    of every frame is done in a single array operation.
+    """
+    n = len(frames)
+    out = np.zeros((n, FEATURE_LENGTH), dtype=np.float64)
+
+    hand_coords = []
+    hand_slots = []
+    for row, (hand_results, pose_results, w, h) in enumerate(frames):
+        hands = hand_results.multi_hand_landmarks or []
+        offset = 0
+        for hand_landmarks in hands:
+            if offset + HAND_FEATURES > FEATURE_LENGTH:
+                raise ValueError(f"Frame {row} has more features than {FEATURE_LENGTH}")
+            hand_coords.append(landmark_array(hand_landmarks))
+            hand_slots.append((row, offset))
+            offset += HAND_FEATURES
+        if pose_results.pose_landmarks is not None:
+            if offset + 4 > FEATURE_LENGTH:
+                raise ValueError(f"Frame {row} has more features than {FEATURE_LENGTH}")
+            out[row, offset:offset + 4] = _elbow_features(pose_results, w, h)
+
+    if hand_coords:
+        stacked = np.stack(hand_coords)
+        relative = (stacked - stacked.min(axis=1, keepdims=True)).reshape(len(hand_coords), -1)
+        for (row, offset), values in zip(hand_slots, relative):
+            out[row, offset:offset + HAND_FEATURES] = values
+
+    return out
@@ -1,5 +1,7 @@
 from django import forms
 from .models import SignVideo, TrainedModel
+from .training import BACKEND_CHOICES, BACKEND_FOREST
+from .artifacts import InvalidArtifact, validate_artifact
 
 class VideoUploadForm(forms.ModelForm):
     class Meta:
@@ -10,6 +12,20 @@ class ModelUploadForm(forms.ModelForm):
     class Meta:
         model = TrainedModel
         fields = ['name', 'description', 'file', 'accuracy']
+        help_texts = {
+            'file': "A model artifact (.npz) exported by this application",
+        }
+    
+    def clean_file(self):
+        """Validate the artifact before anything is stored; the parsed artifact is kept on self.artifact."""
+        upload = self.cleaned_data['file']
+        try:
+            self.artifact = validate_artifact(upload)
+        except InvalidArtifact as e:
+            raise forms.ValidationError(f"Invalid model file: {e}")
+        finally:
+            upload.seek(0)
+        return upload
 
 class DataProcessorForm(forms.Form):
     data_file = forms.FileField(
@@ -18,4 +34,37 @@ class DataProcessorForm(forms.Form):
     )
 
 class ModelTrainerForm(forms.Form):
-    pickle_file = forms.FileField()
+    pickle_file = forms.FileField(
+        label="Dataset File",
+        help_text="Upload a processed dataset (.npz, or a legacy .pickle)"
+    )
+    backend = forms.ChoiceField(
+        choices=BACKEND_CHOICES, initial=BACKEND_FOREST,
+        label="Classifier",
+        help_text="Compact classifiers predict faster and are smaller; compare their latency and accuracy after training"
+    )
+    parent_model = forms.ModelChoiceField(
+        queryset=TrainedModel.objects.none(),
+        required=False,
+        label="Retrain From",
+        help_text="Optional forest to continue from; its trees are kept when the classes are unchanged"
+    )
+    n_estimators = forms.IntegerField(
+        initial=200, min_value=10, max_value=1000, required=False,
+        label="Trees",
+        help_text="Number of trees; with early stopping, the most trees that are grown"
+    )
+    max_depth = forms.IntegerField(
+        min_value=2, max_value=64, required=False,
+        label="Maximum Tree Depth",
+        help_text="Forests only; empty means unlimited (12 for the depth-limited forest)"
+    )
+    early_stopping = forms.BooleanField(
+        initial=True, required=False,
+        label="Stop early when the out-of-bag score stops improving"
+    )
+    
+    def __init__(self, *args, user=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if user is not None:
+            self.fields['parent_model'].queryset = TrainedModel.objects.filter(created_by=user).order_by('-created_at')
@@ -0,0 +1,97 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceWorker:
+    """A single inference thread with its own queue and counters."""
+
+    def __init__(self, index):
+        self.index = index
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'inference-{index}')
+        self.sessions = 0
+        self.queued = 0
+        self.completed = 0
+        self.wait_total = 0.0
+        self.busy_total = 0.0
+
+    def stats(self):
+        return {
+            'sessions': self.sessions,
+            'queue_depth': self.queued,
+            'completed': self.completed,
+            'avg_wait_ms': round(self.wait_total * 1000 / self.completed, 3) if self.completed else 0.0,
+            'busy_ms': round(self.busy_total * 1000, 1),
+        }
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-heavy MediaPipe/OpenCV/model work off the event loop.
+
+    Each realtime session is pinned to one worker thread for its whole
+    lifetime, so its tracking detector is always driven (and owned) by the
+    same thread and its frames are processed in order. New sessions go to
+    the worker with the fewest sessions.
+    """
+
+    def __init__(self, workers):
+        self.workers = [InferenceWorker(i) for i in range(max(1, workers))]
+        self._affinity = {}
+        self._lock = threading.Lock()
+
+    def worker_for(self, session_key):
+        with self._lock:
+            worker = self._affinity.get(session_key)
+            if worker is None:
+                worker = min(self.workers, key=lambda w: (w.sessions, w.queued))
+                worker.sessions += 1
+                self._affinity[session_key] = worker
+            return worker
+
+    def release_session(self, session_key):
+        with self._lock:
+            worker = self._affinity.pop(session_key, None)
+            if worker is not None:
+                worker.sessions -= 1
+
+    def _call(self, worker, submitted, func):
+        started = time.perf_counter()
+        try:
+            return func()
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                worker.queued -= 1
+                worker.completed += 1
+                worker.wait_total += started - submitted
+                worker.busy_total += finished - started
+
+    async def run(self, session_key, func, *args, **kwargs):
+        """Run func(*args, **kwargs) on the session's worker thread and await the result."""
+        worker = self.worker_for(session_key)
+        with self._lock:
+            worker.queued += 1
+        call = functools.partial(self._call, worker, time.perf_counter(), functools.partial(func, *args, **kwargs))
+        return await asyncio.get_running_loop().run_in_executor(worker.executor, call)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'workers': len(self.workers),
+                'sessions': len(self._affinity),
+                'queue_depth': sum(w.queued for w in self.workers),
+                'per_worker': [w.stats() for w in self.workers],
+            }
+
+
+inference_executor = InferenceExecutor(
+    getattr(settings, 'INFERENCE_WORKERS', None) or os.cpu_count() or 1
+)
@@ -0,0 +1,287 @@
+import os
+import time
+import socket
+import logging
+import threading
+import traceback
+from datetime import timedelta
+from importlib import import_module
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Modules that register job handlers with @job_handler
+HANDLER_MODULES = ('translator.views',)
+
+HANDLERS = {}
+
+# Per-kind cleanup for jobs that end without their handler running (cancelled while queued)
+CLEANUPS = {}
+
+
+def job_handler(kind):
+    def register(func):
+        HANDLERS[kind] = func
+        return func
+    return register
+
+
+def job_cleanup(kind):
+    def register(func):
+        CLEANUPS[kind] = func
+        return func
+    return register
+
+
+def load_handlers():
+    for module in HANDLER_MODULES:
+        import_module(module)
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class JobContext:
+    """Handed to a job handler; reports progress and checks for cancellation."""
+
+    def __init__(self, job, progress_interval):
+        self.job = job
+        self.progress_interval = progress_interval
+        self._last_write = 0.0
+
+    @property
+    def payload(self):
+        return self.job.payload
+
+    def progress(self, fraction, message=None):
+        """
+        Record progress (0..1) and raise JobCancelled if a cancel was requested.
+
+        Writes are throttled to one per progress_interval so tight loops can
+        call this freely.
+        """
+        now = time.monotonic()
+        if now - self._last_write < self.progress_interval and fraction < 1.0:
+            return
+        self._last_write = now
+        fields = {'progress': min(max(fraction, 0.0), 1.0)}
+        if message is not None:
+            fields['message'] = message[:255]
+        Job.objects.filter(pk=self.job.pk).update(**fields)
+        self.check_cancelled()
+
+    def check_cancelled(self):
+        if Job.objects.filter(pk=self.job.pk, cancel_requested=True).exists():
+            raise JobCancelled()
+
+
+class JobQueue:
+    """
+    Bounded pool of worker threads that run queued Job rows.
+
+    Jobs live in the database, so they survive restarts and can be executed
+    either by the web process (JOB_RUN_IN_PROCESS) or by separate
+    `manage.py run_jobs` workers, or both. Workers claim a job with a
+    conditional UPDATE, so a job is never run twice. A claimed job records its
+    owner ("host:pid") and a heartbeat the owner refreshes every
+    heartbeat_interval; a running job is only re-queued once its owner's
+    process is gone or its heartbeat is older than heartbeat_timeout.
+    """
+
+    def __init__(self, workers, poll_interval=2.0, progress_interval=0.5,
+                 heartbeat_interval=10.0, heartbeat_timeout=60.0):
+        self.workers = max(1, workers)
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.heartbeat_timeout = heartbeat_timeout
+        self.host = socket.gethostname()
+        self.owner = f"{self.host}:{os.getpid()}"[:255]
+        self._threads = []
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+
+    def start(self):
+        """Start the worker threads (idempotent) after re-queueing interrupted jobs."""
+        with self._lock:
+            if self._threads:
+                return
+            load_handlers()
+            self.recover()
+            self._stopping.clear()
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            thread = threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info(f"Job queue started with {self.workers} worker(s)")
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def _owner_gone(self, owner):
+        # Only processes on this host can be checked directly; signal 0 would
+        # not be a probe on Windows, so there the heartbeat decides
+        host, _, pid = owner.rpartition(':')
+        if host != self.host or os.name == 'nt':
+            return False
+        try:
+            os.kill(int(pid), 0)
+        except ProcessLookupError:
+            return True
+        except (ValueError, OverflowError, OSError):
+            return False
+        return False
+
+    def recover(self):
+        """Re-queue running jobs whose worker is gone: its process exited or its heartbeat is stale."""
+        stale = timezone.now() - timedelta(seconds=self.heartbeat_timeout)
+        running = Job.objects.filter(state=Job.STATE_RUNNING).exclude(owner=self.owner)
+        orphaned = [
+            pk for pk, owner, heartbeat_at in running.values_list('pk', 'owner', 'heartbeat_at')
+            if heartbeat_at is None or heartbeat_at < stale or self._owner_gone(owner)
+        ]
+        if not orphaned:
+            return 0
+        count = Job.objects.filter(pk__in=orphaned, state=Job.STATE_RUNNING).exclude(owner=self.owner).update(
+            state=Job.STATE_QUEUED, started_at=None, owner='', heartbeat_at=None,
+            message='Re-queued after its worker stopped'
+        )
+        if count:
+            logger.warning(f"Re-queued {count} interrupted job(s)")
+            self._wakeup.set()
+        return count
+
+    def _heartbeat(self):
+        # Keeps this process's running jobs alive and picks up other workers' orphans
+        while not self._stopping.wait(self.heartbeat_interval):
+            try:
+                Job.objects.filter(state=Job.STATE_RUNNING, owner=self.owner).update(heartbeat_at=timezone.now())
+                self.recover()
+            except Exception as e:
+                logger.error(f"Error updating job heartbeats: {e}")
+            finally:
+                close_old_connections()
+
+    def submit(self, kind, user, payload=None):
+        job = Job.objects.create(kind=kind, created_by=user, payload=payload or {}, message='Queued')
+        if getattr(settings, 'JOB_RUN_IN_PROCESS', True):
+            self.start()
+        self._wakeup.set()
+        logger.info(f"Queued {job}")
+        return job
+
+    def cancel(self, job):
+        """Cancel a queued job immediately, or ask a running one to stop."""
+        if Job.objects.filter(pk=job.pk, state=Job.STATE_QUEUED).update(
+            state=Job.STATE_CANCELLED, finished_at=timezone.now(), message='Cancelled'
+        ):
+            # The handler never runs, so release what the submitter set up for it
+            cleanup = CLEANUPS.get(job.kind)
+            if cleanup is not None:
+                try:
+                    cleanup(job)
+                except Exception as e:
+                    logger.error(f"Error cleaning up cancelled {job}: {e}")
+            return True
+        return bool(Job.objects.filter(pk=job.pk, state=Job.STATE_RUNNING).update(cancel_requested=True))
+
+    def claim(self):
+        while True:
+            job_id = Job.objects.filter(state=Job.STATE_QUEUED).order_by('created_at', 'id').values_list('id', flat=True).first()
+            if job_id is None:
+                return None
+            now = timezone.now()
+            if Job.objects.filter(pk=job_id, state=Job.STATE_QUEUED).update(
+                state=Job.STATE_RUNNING, started_at=now, owner=self.owner, heartbeat_at=now, message='Running'
+            ):
+                return Job.objects.get(pk=job_id)
+
+    def _worker(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.claim()
+            except Exception as e:
+                logger.error(f"Error claiming job: {e}")
+                job = None
+            if job is None:
+                close_old_connections()
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            try:
+                self.run_job(job)
+            finally:
+                close_old_connections()
+
+    def run_job(self, job):
+        with self._lock:
+            self.running += 1
+        state, result, error = Job.STATE_SUCCEEDED, {}, ''
+        try:
+            handler = HANDLERS.get(job.kind)
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind {job.kind!r}")
+            result = handler(JobContext(job, self.progress_interval)) or {}
+        except JobCancelled:
+            state = Job.STATE_CANCELLED
+        except Exception as e:
+            state, error = Job.STATE_FAILED, str(e) or e.__class__.__name__
+            logger.error(f"{job} failed: {error}")
+            logger.error(traceback.format_exc())
+
+        fields = {'state': state, 'result': result, 'error': error, 'finished_at': timezone.now()}
+        if state == Job.STATE_SUCCEEDED:
+            fields.update(progress=1.0, message='Done')
+        else:
+            fields['message'] = 'Cancelled' if state == Job.STATE_CANCELLED else 'Failed'
+        # A job re-queued from under a stalled worker belongs to its new owner
+        if not Job.objects.filter(pk=job.pk, owner=self.owner).update(**fields):
+            logger.warning(f"{job} was re-queued while running here; result discarded")
+
+        with self._lock:
+            self.running -= 1
+            if state == Job.STATE_SUCCEEDED:
+                self.completed += 1
+            elif state == Job.STATE_FAILED:
+                self.failed += 1
+            else:
+                self.cancelled += 1
+        logger.info(f"Job #{job.pk} finished: {state}")
+
+    def stats(self):
+        queued = Job.objects.filter(state=Job.STATE_QUEUED).count()
+        with self._lock:
+            return {
+                'workers': self.workers,
+                'started': bool(self._threads),
+                'running': self.running,
+                'completed': self.completed,
+                'failed': self.failed,
+                'cancelled': self.cancelled,
+                'queued': queued,
+            }
+
+
+job_queue = JobQueue(
+    getattr(settings, 'JOB_WORKERS', 1),
+    poll_interval=getattr(settings, 'JOB_POLL_INTERVAL', 2.0),
+    progress_interval=getattr(settings, 'JOB_PROGRESS_INTERVAL', 0.5),
+    heartbeat_interval=getattr(settings, 'JOB_HEARTBEAT_INTERVAL', 10.0),
+    heartbeat_timeout=getattr(settings, 'JOB_HEARTBEAT_TIMEOUT', 60.0),
+)
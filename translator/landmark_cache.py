@@ -0,0 +1,58 @@
+import json
+import hashlib
+import logging
+from .landmark_store import LandmarkStore
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_digest(path):
+    """sha256 of a file's contents, read in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LandmarkCache:
+    """
+    Per-video landmark cache on top of a LandmarkStore.
+
+    Entries are keyed by the video's content hash combined with a digest of
+    the extraction config (MediaPipe version and settings, feature version),
+    so a renamed or re-uploaded clip still hits and a config change misses.
+    Only the process that owns the cache writes to it; extraction workers
+    hand their landmarks back instead.
+    """
+
+    def __init__(self, root, config):
+        self.store = LandmarkStore(root)
+        self.config_digest = hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, video_path):
+        return f"{file_digest(video_path)}-{self.config_digest}"
+
+    def get(self, key):
+        """Return (start_frame, end_frame, frames) or None."""
+        entry = self.store.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, start_frame, end_frame, frames, **metadata):
+        self.store.append(key, frames, start_frame, end_frame, **metadata)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,146 @@
+"""
+Append-only, memory-mapped store of per-frame landmark features.
+
+    frames.f32     float32 rows of `width` features, appended back to back
+    index.jsonl    one JSON record per video: key, offset (row), frames,
+                   start_frame, end_frame (the detected sign)
+
+A video's frames are written before its index record, so the index is the
+commit log: rows without a record (from a crash mid-append) are never
+referenced. Readers memory-map frames.f32, so per-video sequences and
+sliding windows are zero-copy views and the store can be far larger than RAM.
+Appends are serialized with a lock (and flock where available), so the web
+process and a `run_jobs` worker can share one store.
+"""
+import os
+import json
+import logging
+import threading
+import numpy as np
+from .features import FEATURE_LENGTH
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+FRAMES_FILE = 'frames.f32'
+INDEX_FILE = 'index.jsonl'
+DTYPE = np.dtype('<f4')
+
+
+class LandmarkStore:
+    def __init__(self, root, width=FEATURE_LENGTH):
+        self.root = root
+        self.width = width
+        self.row_bytes = DTYPE.itemsize * width
+        self.frames_path = os.path.join(root, FRAMES_FILE)
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self._entries = {}
+        self._index_position = 0
+        self._frames = None
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.refresh()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def keys(self):
+        return list(self._entries)
+
+    def refresh(self):
+        """Pick up records appended since the last read (also by other processes)."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            f.seek(self._index_position)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Record still being written
+                    break
+                self._index_position += len(line)
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping corrupt landmark store record in {self.index_path}")
+                    continue
+                self._entries[entry['key']] = entry
+        self._frames = None
+
+    def _frame_array(self):
+        if self._frames is None:
+            rows = os.path.getsize(self.frames_path) // self.row_bytes if os.path.exists(self.frames_path) else 0
+            if rows == 0:
+                return np.empty((0, self.width), dtype=DTYPE)
+            self._frames = np.memmap(self.frames_path, dtype=DTYPE, mode='r', shape=(rows, self.width))
+        return self._frames
+
+    def get(self, key):
+        """Return (start_frame, end_frame, frames) for a video, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.refresh()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+        frames = self._frame_array()
+        if entry['offset'] + entry['frames'] > len(frames):
+            self._frames = None
+            frames = self._frame_array()
+        return entry['start_frame'], entry['end_frame'], frames[entry['offset']:entry['offset'] + entry['frames']]
+
+    def frames(self, key):
+        """The (n_frames, width) sequence of a video, as a read-only view."""
+        entry = self.get(key)
+        return None if entry is None else entry[2]
+
+    def windows(self, key, size, step=1):
+        """Sliding (n_windows, size, width) windows over a video's frames, without copying."""
+        frames = self.frames(key)
+        if frames is None or len(frames) < size:
+            return np.empty((0, size, self.width), dtype=DTYPE)
+        view = np.lib.stride_tricks.sliding_window_view(frames, size, axis=0)
+        return view.transpose(0, 2, 1)[::step]
+
+    def append(self, key, frames, start_frame, end_frame, **metadata):
+        """Append a video's frames; a key that is already stored is left as is."""
+        frames = np.ascontiguousarray(frames, dtype=DTYPE).reshape(-1, self.width)
+        with self._lock, open(self.index_path, 'a', encoding='utf-8') as index:
+            if fcntl is not None:
+                fcntl.flock(index, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                if key in self._entries:
+                    return self._entries[key]
+                if self._index_position < os.path.getsize(self.index_path):
+                    # Terminate a record torn by an interrupted append
+                    index.write('\n')
+                with open(self.frames_path, 'ab') as f:
+                    size = f.tell()
+                    if size % self.row_bytes:
+                        # Drop a torn row left by an interrupted append
+                        size -= size % self.row_bytes
+                        f.truncate(size)
+                    f.write(frames.tobytes())
+                entry = dict(metadata, key=key, offset=size // self.row_bytes, frames=len(frames),
+                             start_frame=start_frame, end_frame=end_frame)
+                index.write(json.dumps(entry) + '\n')
+                index.flush()
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(index, fcntl.LOCK_UN)
+        self.refresh()
+        return entry
+
+    def stats(self):
+        return {
+            'videos': len(self._entries),
+            'frames': sum(entry['frames'] for entry in self._entries.values()),
+            'bytes': os.path.getsize(self.frames_path) if os.path.exists(self.frames_path) else 0,
+        }
@@ -0,0 +1,25 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from translator.benchmarks import BENCHMARKS
+
+
+class Command(BaseCommand):
+    help = "Run inference micro-benchmarks and print the results as JSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help=f"Benchmarks to run (default: all of {sorted(BENCHMARKS)})")
+        parser.add_argument('--iterations', type=int, default=None, help="Override the iteration count")
+
+    def handle(self, *args, **options):
+        names = options['names'] or sorted(BENCHMARKS)
+        unknown = [name for name in names if name not in BENCHMARKS]
+        if unknown:
+            raise CommandError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+        results = {}
+        for name in names:
+            kwargs = {}
+            if options['iterations']:
+                kwargs['iterations'] = options['iterations']
+            results[name] = BENCHMARKS[name](**kwargs)
+        self.stdout.write(json.dumps(results, indent=2))
@@ -0,0 +1,24 @@
+import os
+import glob
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from translator.datasets import convert_legacy_dataset, load_dataset
+
+
+class Command(BaseCommand):
+    help = "Convert legacy pickled datasets to the columnar .npz format."
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', help="Pickles to convert (default: every *.pickle in MEDIA_ROOT/data)")
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or sorted(glob.glob(os.path.join(settings.MEDIA_ROOT, 'data', '*.pickle')))
+        if not paths:
+            self.stdout.write("No legacy datasets found.")
+            return
+        for path in paths:
+            if not os.path.exists(path):
+                raise CommandError(f"No such file: {path}")
+            out_path = convert_legacy_dataset(path)
+            dataset = load_dataset(out_path, mmap_mode='r')
+            self.stdout.write(f"{path} -> {out_path}: {len(dataset)} samples, {len(dataset.classes)} classes, {dataset.feature_length} features")
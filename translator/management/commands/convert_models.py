@@ -0,0 +1,49 @@
+import os
+import pickle
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from translator.artifacts import MODEL_EXTENSION, InvalidArtifact, is_artifact, save_artifact, load_artifact
+from translator.models import TrainedModel
+
+
+class Command(BaseCommand):
+    help = "Convert legacy pickled TrainedModel files to the model artifact format."
+
+    def add_arguments(self, parser):
+        parser.add_argument('ids', nargs='*', type=int, help="TrainedModel ids to convert (default: every pickled model)")
+        parser.add_argument('--delete-pickles', action='store_true', help="Remove each .p file once its artifact is written")
+
+    def handle(self, *args, **options):
+        models = TrainedModel.objects.order_by('id')
+        if options['ids']:
+            models = models.filter(id__in=options['ids'])
+        converted = 0
+        for model_obj in models:
+            path = os.path.join(settings.MEDIA_ROOT, model_obj.file.name)
+            if not os.path.exists(path):
+                self.stderr.write(f"Model {model_obj.id}: file {model_obj.file.name} is missing, skipped")
+                continue
+            if is_artifact(path):
+                continue
+
+            # The one deliberate unpickle: files already stored on this server
+            with open(path, 'rb') as f:
+                model_data = pickle.load(f)
+            out_path = os.path.splitext(path)[0] + MODEL_EXTENSION
+            try:
+                save_artifact(model_data['model'], model_data.get('label_mapping', {}), out_path, model_obj.backend,
+                              metadata={'converted_from': os.path.basename(path)})
+                load_artifact(out_path)
+            except InvalidArtifact as e:
+                if os.path.exists(out_path):
+                    os.remove(out_path)
+                raise CommandError(f"Model {model_obj.id}: {e}")
+
+            model_obj.file.name = os.path.relpath(out_path, settings.MEDIA_ROOT)
+            model_obj.model_size = os.path.getsize(out_path)
+            model_obj.save(update_fields=['file', 'model_size'])
+            if options['delete_pickles']:
+                os.remove(path)
+            converted += 1
+            self.stdout.write(f"Model {model_obj.id}: {path} -> {out_path}")
+        self.stdout.write(f"Converted {converted} model(s).")
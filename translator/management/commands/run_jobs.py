@@ -0,0 +1,28 @@
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from translator.jobs import JobQueue
+
+
+class Command(BaseCommand):
+    help = "Run queued data-processing and training jobs outside the web process."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=settings.JOB_WORKERS, help="Number of concurrent jobs")
+
+    def handle(self, *args, **options):
+        queue = JobQueue(
+            options['workers'],
+            poll_interval=settings.JOB_POLL_INTERVAL,
+            progress_interval=settings.JOB_PROGRESS_INTERVAL,
+            heartbeat_interval=settings.JOB_HEARTBEAT_INTERVAL,
+            heartbeat_timeout=settings.JOB_HEARTBEAT_TIMEOUT,
+        )
+        queue.start()
+        self.stdout.write(f"Running jobs with {queue.workers} worker(s); press Ctrl+C to stop.")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping; waiting for running jobs to finish...")
+            queue.stop()
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.10 on 2026-10-17 19:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0002_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='translator.trainedmodel'),
+        ),
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='training_params',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='training_seconds',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='training_timings',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
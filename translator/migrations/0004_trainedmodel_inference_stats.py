@@ -0,0 +1,28 @@
+# Generated by Django 4.2.10 on 2026-10-17 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0003_trainedmodel_training_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='backend',
+            field=models.CharField(default='forest', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='inference_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='trainedmodel',
+            name='model_size',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-17 19:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0004_trainedmodel_inference_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationPrediction',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('word', models.CharField(max_length=100)),
+                ('confidence', models.FloatField(blank=True, null=True)),
+                ('predicted_at', models.DateTimeField()),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='predictions', to='translator.translationsession')),
+            ],
+            options={
+                'ordering': ['predicted_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.10 on 2026-10-17 19:50
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('translator', '0005_translationprediction'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='signvideo',
+            index=models.Index(fields=['uploaded_by', 'uploaded_at'], name='translator__uploade_4e514a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='trainedmodel',
+            index=models.Index(fields=['created_by', 'created_at'], name='translator__created_3703af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translationsession',
+            index=models.Index(fields=['user', 'start_time'], name='translator__user_id_061c62_idx'),
+        ),
+    ]
@@ -0,0 +1,193 @@
+import os
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+from django.conf import settings
+from .artifacts import InvalidArtifact, is_artifact, load_artifact
+from .compiled_forest import compile_model
+
+logger = logging.getLogger(__name__)
+
+
+class LoadedModel:
+    """
+    A loaded TrainedModel file together with its label lookups.
+
+    `predictor` is what inference should call: a model artifact's rebuilt
+    predictor, the compiled form of a pickled RandomForest (see
+    compiled_forest), or the pickled model itself. `model` is the sklearn
+    estimator, e.g. for warm-starting a retrain; for artifacts it is
+    restored on first use and is None when the artifact cannot provide one.
+    """
+
+    def __init__(self, predictor, label_mapping, size, model=None, artifact=None):
+        self.predictor = predictor
+        self.label_mapping = label_mapping
+        self.inverse_label_mapping = {v: k for k, v in label_mapping.items()}
+        self.size = size
+        self.artifact = artifact
+        self._model = model
+
+    @property
+    def model(self):
+        if self._model is None and self.artifact is not None:
+            self._model = self.artifact.estimator()
+        return self._model
+
+
+def load_model_file(model_path):
+    """
+    Read a model file from disk and return a LoadedModel.
+
+    Model artifacts are memory-mapped and never unpickled. Legacy pickles
+    are only read while MODEL_ALLOW_PICKLE is on (`manage.py convert_models`
+    converts them).
+    """
+    size = os.path.getsize(model_path)
+    if is_artifact(model_path):
+        artifact = load_artifact(model_path, mmap_mode='r')
+        return LoadedModel(artifact.predictor(), artifact.label_mapping, size, artifact=artifact)
+
+    if not settings.MODEL_ALLOW_PICKLE:
+        raise InvalidArtifact(f"{os.path.basename(model_path)} is a legacy pickle; run `manage.py convert_models`")
+    logger.warning(f"Loading legacy pickled model {model_path}; convert it with `manage.py convert_models`")
+    with open(model_path, 'rb') as f:
+        model_data = pickle.load(f)
+    model = model_data['model']
+    predictor = model
+    if settings.MODEL_COMPILE_FORESTS:
+        predictor = compile_model(model)
+        # The node arrays live next to the estimator
+        size += getattr(predictor, 'nbytes', 0)
+    return LoadedModel(predictor, model_data.get('label_mapping', {}), size, model=model)
+
+
+class ModelCache:
+    """
+    Process-wide LRU cache of loaded TrainedModel files.
+
+    Entries are keyed by TrainedModel.id and remember the file fingerprint
+    (name, mtime, size) they were loaded from, so a model whose file changed
+    on disk is reloaded on the next lookup. The on-disk size of each file is
+    used as the memory estimate for the byte budget, plus the node arrays of
+    a compiled forest.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def model_path(model_obj):
+        return os.path.join(settings.MEDIA_ROOT, model_obj.file.name)
+
+    def _fingerprint(self, model_obj):
+        stat = os.stat(self.model_path(model_obj))
+        return (model_obj.file.name, stat.st_mtime_ns, stat.st_size)
+
+    def _lookup(self, model_id, fingerprint):
+        with self._lock:
+            entry = self._entries.get(model_id)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(model_id)
+                self.hits += 1
+                return entry[1]
+        return None
+
+    def get(self, model_obj):
+        """
+        Return the LoadedModel for a TrainedModel row, loading it on a miss.
+        Raises FileNotFoundError if the model file is missing, InvalidArtifact if it is unusable.
+        """
+        fingerprint = self._fingerprint(model_obj)
+        loaded = self._lookup(model_obj.id, fingerprint)
+        if loaded is not None:
+            return loaded
+
+        # Only one thread loads a given model; the others wait and reuse it
+        with self._lock:
+            load_lock = self._load_locks.setdefault(model_obj.id, threading.Lock())
+        with load_lock:
+            try:
+                loaded = self._lookup(model_obj.id, fingerprint)
+                if loaded is not None:
+                    return loaded
+
+                loaded = load_model_file(self.model_path(model_obj))
+                with self._lock:
+                    self.misses += 1
+                    self._entries[model_obj.id] = (fingerprint, loaded)
+                    self._entries.move_to_end(model_obj.id)
+                    self._evict()
+                logger.debug(f"Loaded model {model_obj.id} into cache ({loaded.size} bytes)")
+                return loaded
+            finally:
+                # Load locks only exist while a load is in flight; threads already
+                # waiting on this one still get it and then find the entry
+                with self._lock:
+                    if self._load_locks.get(model_obj.id) is load_lock:
+                        del self._load_locks[model_obj.id]
+
+    def get_cached(self, model_id):
+        """
+        The LoadedModel cached for a model id if its file is unchanged, else None.
+        Needs no TrainedModel row: the fingerprint remembers the file name, and
+        signals drop entries whose row changes.
+        """
+        try:
+            model_id = int(model_id)
+        except (TypeError, ValueError):
+            return None
+        with self._lock:
+            entry = self._entries.get(model_id)
+        if entry is None:
+            return None
+        name = entry[0][0]
+        try:
+            stat = os.stat(os.path.join(settings.MEDIA_ROOT, name))
+        except OSError:
+            return None
+        return self._lookup(model_id, (name, stat.st_mtime_ns, stat.st_size))
+
+    def _evict(self):
+        # Caller holds self._lock. Always keep the most recently used entry.
+        while len(self._entries) > 1 and self.current_bytes() > self.max_bytes:
+            model_id, _ = self._entries.popitem(last=False)
+            self.evictions += 1
+            logger.debug(f"Evicted model {model_id} from cache")
+
+    def current_bytes(self):
+        return sum(entry[1].size for entry in self._entries.values())
+
+    def invalidate(self, model_id):
+        with self._lock:
+            if self._entries.pop(model_id, None) is not None:
+                self.invalidations += 1
+                logger.debug(f"Invalidated cached model {model_id}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes(),
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'loading': len(self._load_locks),
+            }
+
+
+model_cache = ModelCache(getattr(settings, 'MODEL_CACHE_MAX_BYTES', 512 * 1024 * 1024))
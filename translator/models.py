@@ -1,4 +1,5 @@
 from django.db import models
+from django.conf import settings
 from django.contrib.auth.models import User
 import os
 import uuid
@@ -20,6 +21,48 @@ class TrainedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE)
     accuracy = models.FloatField(default=0.0)
+    parent = models.ForeignKey('self', null=True, blank=True, on_delete=models.SET_NULL, related_name='children')
+    training_seconds = models.FloatField(null=True, blank=True)
+    training_timings = models.JSONField(default=dict, blank=True)
+    training_params = models.JSONField(default=dict, blank=True)
+    backend = models.CharField(max_length=32, default='forest')
+    inference_ms = models.FloatField(null=True, blank=True)
+    model_size = models.BigIntegerField(null=True, blank=True)
+    
+    # model_id that asks the realtime paths for the fastest accurate-enough model
+    AUTO = 'auto'
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', 'created_at']),
+        ]
+    
+    @classmethod
+    def fastest(cls, min_accuracy, user=None):
+        """The measured model with the lowest latency that reaches min_accuracy (%), or None."""
+        candidates = cls.objects.filter(accuracy__gte=min_accuracy, inference_ms__isnull=False)
+        if user is not None:
+            candidates = candidates.filter(created_by=user)
+        return candidates.order_by('inference_ms', '-accuracy').first()
+    
+    @classmethod
+    def resolve(cls, model_id, user=None, min_accuracy=None):
+        """
+        The model a realtime request asked for. model_id 'auto' picks the
+        fastest model reaching min_accuracy (default REALTIME_MIN_ACCURACY).
+        Raises DoesNotExist when nothing matches, including for a malformed id.
+        """
+        if model_id != cls.AUTO:
+            try:
+                return cls.objects.get(id=model_id)
+            except (TypeError, ValueError):
+                raise cls.DoesNotExist(f"Invalid model id {model_id!r}")
+        if min_accuracy is None:
+            min_accuracy = settings.REALTIME_MIN_ACCURACY
+        model = cls.fastest(min_accuracy, user)
+        if model is None:
+            raise cls.DoesNotExist(f"No measured model reaches {min_accuracy}% accuracy")
+        return model
     
     def __str__(self):
         return self.name
@@ -30,6 +73,11 @@ class SignVideo(models.Model):
     uploaded_at = models.DateTimeField(auto_now_add=True)
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['uploaded_by', 'uploaded_at']),
+        ]
+    
     def __str__(self):
         return self.word
 
@@ -40,5 +88,90 @@ class TranslationSession(models.Model):
     end_time = models.DateTimeField(null=True, blank=True)
     translation_text = models.TextField(blank=True)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'start_time']),
+        ]
+    
     def __str__(self):
         return f"Session by {self.user.username} at {self.start_time}"
+
+class TranslationPrediction(models.Model):
+    """One word recognized during a realtime session; written in batches by SessionRecorder."""
+    session = models.ForeignKey(TranslationSession, on_delete=models.CASCADE, related_name='predictions')
+    word = models.CharField(max_length=100)
+    confidence = models.FloatField(null=True, blank=True)  # probability of the predicted class, where the model has one
+    predicted_at = models.DateTimeField()
+    
+    class Meta:
+        ordering = ['predicted_at']
+    
+    def __str__(self):
+        return self.word
+
+class Job(models.Model):
+    KIND_PROCESS_DATA = 'process_data'
+    KIND_TRAIN_MODEL = 'train_model'
+    KIND_CHOICES = [
+        (KIND_PROCESS_DATA, 'Process data'),
+        (KIND_TRAIN_MODEL, 'Train model'),
+    ]
+    
+    STATE_QUEUED = 'queued'
+    STATE_RUNNING = 'running'
+    STATE_SUCCEEDED = 'succeeded'
+    STATE_FAILED = 'failed'
+    STATE_CANCELLED = 'cancelled'
+    STATE_CHOICES = [
+        (STATE_QUEUED, 'Queued'),
+        (STATE_RUNNING, 'Running'),
+        (STATE_SUCCEEDED, 'Succeeded'),
+        (STATE_FAILED, 'Failed'),
+        (STATE_CANCELLED, 'Cancelled'),
+    ]
+    FINISHED_STATES = (STATE_SUCCEEDED, STATE_FAILED, STATE_CANCELLED)
+    
+    kind = models.CharField(max_length=32, choices=KIND_CHOICES)
+    state = models.CharField(max_length=16, choices=STATE_CHOICES, default=STATE_QUEUED)
+    progress = models.FloatField(default=0.0)
+    message = models.CharField(max_length=255, blank=True)
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+    cancel_requested = models.BooleanField(default=False)
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Worker process ("host:pid") running the job and its last sign of life
+    owner = models.CharField(max_length=255, blank=True)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['state', 'created_at']),
+        ]
+    
+    @property
+    def is_finished(self):
+        return self.state in self.FINISHED_STATES
+    
+    def as_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'state': self.state,
+            'progress': round(self.progress, 4),
+            'message': self.message,
+            'result': self.result,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'owner': self.owner,
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+        }
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} job #{self.id} ({self.state})"
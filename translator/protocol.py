@@ -0,0 +1,186 @@
+"""
+Compact binary frame payload for the realtime translator WebSocket.
+
+Instead of sending back a re-encoded JPEG with the skeleton drawn on it, the
+server can send only the detected landmarks and let the browser draw the
+overlay. All values are little-endian:
+
+    header (16 bytes)
+        magic        2s   b'SL'
+        version      B    PROTOCOL_VERSION
+        flags        B    FLAG_* bits
+        width        H    source frame width in pixels
+        height       H    source frame height in pixels
+        seq          I    per-session frame sequence number
+        n_hands      B    number of hands that follow
+        n_boxes      B    number of bounding boxes that follow
+        word_len     H    length of the UTF-8 prediction word
+    hands          n_hands * 21 * 2 float16   normalized (x, y) per landmark
+    pose           33 * 2 float16             normalized (x, y), if FLAG_POSE
+    boxes          n_boxes * 4 int16          x_min, y_min, x_max, y_max in pixels
+    word           word_len bytes             UTF-8, if FLAG_PREDICTION
+
+Frames sent by the browser carry a small header in front of the JPEG so the
+server can acknowledge them and detect stale frames:
+
+    frame header (16 bytes)
+        magic        2s   b'SF'
+        version      B    PROTOCOL_VERSION
+        reserved     B
+        seq          I    client frame sequence number
+        captured_at  d    client capture time in milliseconds
+    jpeg           remaining bytes
+
+Flow control is credit based: on connect the server announces a window of N
+frames, the client spends one credit per frame sent, and every frame is
+answered by exactly one binary response or one {"type": "ack"} message, each
+of which returns the credit.
+"""
+import time
+import struct
+import numpy as np
+
+PROTOCOL_VERSION = 1
+MAGIC = b'SL'
+HEADER = struct.Struct('<2sBBHHIBBH')
+
+FRAME_MAGIC = b'SF'
+FRAME_HEADER = struct.Struct('<2sBBId')
+
+FLAG_HANDS = 0x01
+FLAG_POSE = 0x02
+FLAG_PREDICTION = 0x04
+
+HAND_LANDMARKS = 21
+POSE_LANDMARKS = 33
+
+# Protocol modes a client can select with {"type": "set_protocol"}
+PROTOCOL_JPEG = 'jpeg'
+PROTOCOL_LANDMARKS = 'landmarks'
+PROTOCOLS = (PROTOCOL_JPEG, PROTOCOL_LANDMARKS)
+
+
+def pack_frame(width, height, seq, hands=(), pose=None, boxes=(), word=None):
+    """
+    Pack one frame's landmarks into the binary payload.
+
+    `hands` is a sequence of (21, 2) arrays, `pose` a (33, 2) array or None,
+    `boxes` a sequence of (x_min, y_min, x_max, y_max) tuples.
+    """
+    flags = 0
+    if len(hands):
+        flags |= FLAG_HANDS
+    if pose is not None:
+        flags |= FLAG_POSE
+    word_bytes = word.encode('utf-8') if word else b''
+    if word_bytes:
+        flags |= FLAG_PREDICTION
+
+    parts = [HEADER.pack(
+        MAGIC, PROTOCOL_VERSION, flags, width, height, seq & 0xFFFFFFFF,
+        len(hands), len(boxes), len(word_bytes)
+    )]
+    if len(hands):
+        parts.append(np.asarray(hands, dtype='<f2').tobytes())
+    if pose is not None:
+        parts.append(np.asarray(pose, dtype='<f2').tobytes())
+    if len(boxes):
+        parts.append(np.clip(np.asarray(boxes), -32768, 32767).astype('<i2').tobytes())
+    parts.append(word_bytes)
+    return b''.join(parts)
+
+
+def unpack_frame(payload):
+    """Decode a payload produced by pack_frame (mirrors the browser decoder)."""
+    magic, version, flags, width, height, seq, n_hands, n_boxes, word_len = HEADER.unpack_from(payload)
+    if magic != MAGIC or version != PROTOCOL_VERSION:
+        raise ValueError(f"Unsupported landmark payload (magic={magic!r}, version={version})")
+
+    offset = HEADER.size
+    count = n_hands * HAND_LANDMARKS * 2
+    hands = np.frombuffer(payload, dtype='<f2', count=count, offset=offset).reshape(n_hands, HAND_LANDMARKS, 2)
+    offset += count * 2
+
+    pose = None
+    if flags & FLAG_POSE:
+        count = POSE_LANDMARKS * 2
+        pose = np.frombuffer(payload, dtype='<f2', count=count, offset=offset).reshape(POSE_LANDMARKS, 2)
+        offset += count * 2
+
+    boxes = np.frombuffer(payload, dtype='<i2', count=n_boxes * 4, offset=offset).reshape(n_boxes, 4)
+    offset += n_boxes * 8
+
+    word = payload[offset:offset + word_len].decode('utf-8') if word_len else None
+    return {
+        'width': width,
+        'height': height,
+        'seq': seq,
+        'hands_detected': bool(flags & FLAG_HANDS),
+        'hands': hands,
+        'pose': pose,
+        'boxes': boxes,
+        'word': word,
+    }
+
+
+def pack_frame_header(seq, captured_at):
+    return FRAME_HEADER.pack(FRAME_MAGIC, PROTOCOL_VERSION, 0, seq & 0xFFFFFFFF, captured_at)
+
+
+def unpack_client_frame(data):
+    """
+    Split a client frame into (seq, captured_at, jpeg_bytes).
+
+    Bare JPEG frames (no header) are accepted for older clients and return
+    (None, None, data).
+    """
+    if len(data) >= FRAME_HEADER.size and data[:2] == FRAME_MAGIC:
+        _, version, _, seq, captured_at = FRAME_HEADER.unpack_from(data)
+        if version != PROTOCOL_VERSION:
+            raise ValueError(f"Unsupported frame header version {version}")
+        return seq, captured_at, data[FRAME_HEADER.size:]
+    return None, None, data
+
+
+class FrameAgeTracker:
+    """
+    Estimates how long a client frame waited before the server got to it.
+
+    Client and server clocks are not synchronized, so the smallest observed
+    (server time - capture time) is taken as the baseline transit offset and
+    a frame's age is measured relative to it.
+    """
+
+    def __init__(self):
+        self.offset = None
+
+    def age(self, captured_at, now=None):
+        if captured_at is None:
+            return 0.0
+        if now is None:
+            now = time.time() * 1000
+        delta = now - captured_at
+        if self.offset is None or delta < self.offset:
+            self.offset = delta
+        return (delta - self.offset) / 1000
+
+
+class PayloadStats:
+    """Running encode-time and payload-size totals for one session."""
+
+    def __init__(self):
+        self.frames = 0
+        self.bytes_total = 0
+        self.encode_total = 0.0
+
+    def record(self, payload, started):
+        self.frames += 1
+        self.bytes_total += len(payload)
+        self.encode_total += time.perf_counter() - started
+
+    def as_dict(self):
+        return {
+            'frames': self.frames,
+            'avg_payload_bytes': round(self.bytes_total / self.frames, 1) if self.frames else 0.0,
+            'avg_encode_ms': round(self.encode_total * 1000 / self.frames, 3) if self.frames else 0.0,
+        }
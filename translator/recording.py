@@ -0,0 +1,103 @@
+"""
+Buffered persistence of realtime translation sessions.
+
+Words predicted by a WebSocket session are kept in memory and written in
+batches: one bulk insert of TranslationPrediction rows plus one update of
+the TranslationSession text, in a single transaction. A batch is written
+once `flush_words` words are waiting, `flush_interval` seconds after the
+first of them arrived, or when the session closes. The session row is
+created with the first batch, so sessions without predictions leave no row;
+its start time is still the moment recording started.
+"""
+import asyncio
+import logging
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.utils import timezone
+from .models import TranslationSession, TranslationPrediction
+
+logger = logging.getLogger(__name__)
+
+
+class SessionRecorder:
+    """Records one realtime session for one model; see the module docstring."""
+
+    def __init__(self, user, model_obj, flush_words, flush_interval):
+        self.user = user
+        self.model_obj = model_obj
+        self.flush_words = max(1, flush_words)
+        self.flush_interval = flush_interval
+        self.started_at = timezone.now()
+        self.session_id = None
+        self.words = []
+        self.pending = []  # (word, confidence, predicted_at)
+        self.timer = None
+        self.tasks = set()
+        self.lock = asyncio.Lock()
+        self.flushes = 0
+        self.written = 0
+
+    def record(self, word, confidence=None):
+        """Buffer one predicted word; never waits for the database."""
+        self.pending.append((word, confidence, timezone.now()))
+        self.words.append(word)
+        if len(self.pending) >= self.flush_words:
+            self._schedule()
+        elif self.timer is None:
+            self.timer = asyncio.get_running_loop().call_later(self.flush_interval, self._schedule)
+
+    def _schedule(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def flush(self, close=False):
+        """Write the buffered words in one transaction; with close, also set the end time."""
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        async with self.lock:
+            batch, self.pending = self.pending, []
+            if not batch and not (close and self.session_id is not None):
+                return
+            try:
+                await self._write(batch, ' '.join(self.words), close)
+            except Exception as e:
+                logger.error(f"Error recording {len(batch)} predictions: {e}")
+                # Kept for the next flush
+                self.pending = batch + self.pending
+                return
+            self.flushes += 1
+            self.written += len(batch)
+
+    async def close(self):
+        await self.flush(close=True)
+
+    @sync_to_async
+    def _write(self, batch, text, close):
+        end = {'end_time': timezone.now()} if close else {}
+        with transaction.atomic():
+            if self.session_id is None:
+                session = TranslationSession.objects.create(
+                    user=self.user, model=self.model_obj, translation_text=text, **end
+                )
+                self.session_id = session.id
+                # start_time is auto_now_add, so create() would record this flush instead
+                TranslationSession.objects.filter(pk=self.session_id).update(start_time=self.started_at)
+            else:
+                TranslationSession.objects.filter(pk=self.session_id).update(translation_text=text, **end)
+            TranslationPrediction.objects.bulk_create([
+                TranslationPrediction(session_id=self.session_id, word=word, confidence=confidence, predicted_at=predicted_at)
+                for word, confidence, predicted_at in batch
+            ])
+
+    def stats(self):
+        return {
+            'session_id': self.session_id,
+            'buffered': len(self.pending),
+            'flushes': self.flushes,
+            'written': self.written,
+        }
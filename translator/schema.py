@@ -0,0 +1,149 @@
+"""
+Schema checks and the auto-login user.
+
+The app's tables are looked up once (a single introspection query) and the
+result is kept in memory, so request handlers never query sqlite_master.
+Pending migrations are found by comparing the migration files with the
+applied-migration table, read in one query; migrations are applied, never
+created, at runtime. The default user is resolved once and reused by the
+auto-login middleware and the realtime endpoints. translator.startup runs
+these when the server boots; anything not checked yet is checked lazily.
+"""
+import logging
+import threading
+import traceback
+from django.db import connection, DatabaseError
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.contrib.auth.models import User
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_TABLES = ('translator_trainedmodel', 'translator_signvideo', 'translator_translationsession')
+
+DEFAULT_USERNAME = 'BEKFURR'
+
+_lock = threading.Lock()
+_tables = None
+_default_user = None
+
+
+def _load_tables():
+    global _tables
+    try:
+        _tables = frozenset(connection.introspection.table_names())
+    except Exception as e:
+        # Not cached: the next call tries again
+        logger.error(f"Error checking tables: {e}")
+        return frozenset()
+    return _tables
+
+
+def missing_tables(refresh=False):
+    """Required tables that do not exist, from the cached table list."""
+    with _lock:
+        tables = _tables if _tables is not None and not refresh else _load_tables()
+    return [table for table in REQUIRED_TABLES if table not in tables]
+
+
+def table_exists(table_name):
+    with _lock:
+        tables = _tables if _tables is not None else _load_tables()
+    return table_name in tables
+
+
+def pending_migrations():
+    """(app, name) of the migration files not yet applied; all of them if nothing was ever migrated."""
+    graph = MigrationLoader(None, ignore_no_migrations=True).graph
+    try:
+        applied = set(MigrationRecorder(connection).migration_qs.values_list('app', 'name'))
+    except DatabaseError:
+        applied = set()
+    pending = []
+    for key, migration in graph.nodes.items():
+        # A squashed migration counts as applied once everything it replaces is
+        if key in applied or (migration.replaces and all(tuple(r) in applied for r in migration.replaces)):
+            continue
+        pending.append(key)
+    return sorted(pending)
+
+
+def migrate_if_needed():
+    """Apply pending migrations, if any; returns the ones that were pending."""
+    pending = pending_migrations()
+    if pending:
+        from django.core.management import call_command
+
+        logger.info(f"Applying {len(pending)} migrations: {', '.join(f'{app}.{name}' for app, name in pending)}")
+        call_command('migrate', interactive=False, verbosity=0)
+        with _lock:
+            _load_tables()
+    return pending
+
+
+def ensure_tables_exist():
+    """Create missing tables by applying migrations; a no-op once they are known to exist."""
+    if not missing_tables():
+        return True
+    try:
+        with _lock:
+            missing = [table for table in REQUIRED_TABLES if table not in _load_tables()]
+            if not missing:
+                return True
+            logger.warning(f"Missing tables detected: {missing}")
+        migrate_if_needed()
+        with _lock:
+            missing = [table for table in REQUIRED_TABLES if table not in _load_tables()]
+        if missing:
+            logger.error(f"Failed to create tables: {missing}")
+            return False
+        logger.info("All required tables created successfully!")
+        return True
+    except Exception as e:
+        logger.error(f"Error ensuring tables exist: {e}")
+        logger.error(traceback.format_exc())
+        return False
+
+
+def _resolve_default_user():
+    try:
+        user, created = User.objects.get_or_create(
+            username=DEFAULT_USERNAME,
+            defaults={
+                'email': 'bekfurr@example.com',
+                'is_staff': True,
+                'is_superuser': True,
+            }
+        )
+        if created:
+            user.set_password(DEFAULT_USERNAME)
+            user.save()
+            logger.debug(f"Created default user {DEFAULT_USERNAME}")
+        return user
+    except Exception as e:
+        logger.error(f"Error getting default user: {e}")
+        # Fallback to first superuser or create one if none exists
+        try:
+            return User.objects.filter(is_superuser=True).first() or User.objects.create_superuser(
+                'admin', 'admin@example.com', 'admin'
+            )
+        except Exception:
+            return None
+
+
+def default_user():
+    """The user every visitor is logged in as, resolved on first use and cached."""
+    global _default_user
+    user = _default_user
+    if user is None:
+        with _lock:
+            if _default_user is None:
+                _default_user = _resolve_default_user()
+            user = _default_user
+    return user
+
+
+def forget_default_user():
+    global _default_user
+    with _lock:
+        _default_user = None
@@ -0,0 +1,196 @@
+import cv2
+import numpy as np
+from .features import extract_features, FEATURE_LENGTH
+
+# Same motion thresholds as detect_hand_and_elbow_movement
+SMOOTHING_FACTOR = 0.7
+MOTION_START = 0.01
+MOTION_END = 0.002
+MIN_FRAMES = 30
+# Windows shorter than this are treated as jitter, not a sign
+MIN_WINDOW_FRAMES = 5
+
+
+def iter_video_features(video_path, hands, pose):
+    """
+    Decode a video once and yield (frame_index, timestamp, features) per frame.
+
+    Features are exponentially smoothed exactly like the training path.
+    """
+    cap = cv2.VideoCapture(video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    prev_features = None
+    index = 0
+    try:
+        while cap.isOpened():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            h, w, _ = frame.shape
+            frame_rgb = cv2.convertScaleAbs(frame_rgb, alpha=1.5, beta=15)
+
+            features = extract_features(hands.process(frame_rgb), pose.process(frame_rgb), w, h)
+            if len(features) == FEATURE_LENGTH:
+                if prev_features is not None:
+                    features = SMOOTHING_FACTOR * prev_features + (1 - SMOOTHING_FACTOR) * features
+                prev_features = features
+                yield index, index / fps, features
+            index += 1
+    finally:
+        cap.release()
+
+
+class SignWindow:
+    """A run of frames between motion start and motion end, kept as a running sum."""
+
+    def __init__(self, start_frame, start_time):
+        self.start_frame = start_frame
+        self.start_time = start_time
+        self.end_frame = start_frame
+        self.end_time = start_time
+        self.total = np.zeros(FEATURE_LENGTH)
+        self.count = 0
+
+    def add(self, index, timestamp, features):
+        self.end_frame = index
+        self.end_time = timestamp
+        self.total += features
+        self.count += 1
+
+    def mean(self):
+        return self.total / self.count
+
+
+class LandmarkHistory:
+    """
+    The last `window` feature vectors of a realtime session in a preallocated
+    ring buffer, with an O(1) running mean.
+
+    With a smoothing_factor, frames are exponentially smoothed before they are
+    stored, like detect_hand_and_elbow_movement (SMOOTHING_FACTOR matches it);
+    None or 0 stores them as they are. It must lie in [0, 1). The running sum is recomputed from the
+    buffer every RESYNC_INTERVAL frames so rounding errors cannot accumulate.
+    """
+
+    RESYNC_INTERVAL = 1024
+
+    def __init__(self, window=MIN_FRAMES, smoothing_factor=None, width=FEATURE_LENGTH):
+        self.window = max(1, int(window))
+        if smoothing_factor is not None and not 0 <= smoothing_factor < 1:
+            raise ValueError(f"smoothing_factor must be in [0, 1), got {smoothing_factor}")
+        self.smoothing_factor = smoothing_factor or None
+        self.buffer = np.zeros((self.window, width))
+        self.total = np.zeros(width)
+        self.count = 0
+        self.position = 0
+        self.updates = 0
+        self.prev_features = None
+
+    def __len__(self):
+        return self.count
+
+    def add(self, features):
+        """Store one frame, replacing the oldest once the window is full; returns False for a wrong length."""
+        features = np.asarray(features, dtype=np.float64)
+        if features.shape != self.total.shape:
+            return False
+        if self.smoothing_factor and self.prev_features is not None:
+            features = self.smoothing_factor * self.prev_features + (1 - self.smoothing_factor) * features
+        self.prev_features = features
+
+        row = self.buffer[self.position]
+        if self.count == self.window:
+            self.total -= row
+        else:
+            self.count += 1
+        row[:] = features
+        self.total += row
+        self.position = (self.position + 1) % self.window
+
+        self.updates += 1
+        if self.updates % self.RESYNC_INTERVAL == 0:
+            self.total = self.buffer[:self.count].sum(axis=0)
+        return True
+
+    def mean(self):
+        """Mean of the stored frames, or None while empty."""
+        if not self.count:
+            return None
+        return self.total / self.count
+
+    def clear(self):
+        self.buffer[:] = 0.0
+        self.total[:] = 0.0
+        self.count = 0
+        self.position = 0
+        self.prev_features = None
+
+
+class SignSegmenter:
+    """
+    Splits a stream of smoothed feature vectors into sign windows.
+
+    A window opens when the frame-to-frame difference rises above
+    MOTION_START and closes when it falls below MOTION_END, as in
+    detect_hand_and_elbow_movement, but segmentation continues after the
+    first window. If no motion is found the whole clip is one window.
+    Memory use is constant in the clip length.
+    """
+
+    def __init__(self, min_frames=MIN_FRAMES, min_window_frames=MIN_WINDOW_FRAMES):
+        self.min_frames = min_frames
+        self.min_window_frames = min_window_frames
+        self.frames = 0
+        self.windows_found = 0
+        self.window = None
+        self.prev_features = None
+        self.clip = None
+
+    def feed(self, index, timestamp, features):
+        """Add one frame; returns a SignWindow when one closes on this frame."""
+        self.frames += 1
+        if self.clip is None:
+            self.clip = SignWindow(index, timestamp)
+        self.clip.add(index, timestamp, features)
+
+        closed = None
+        if self.prev_features is not None and self.frames >= self.min_frames:
+            diff = np.linalg.norm(features - self.prev_features)
+            if self.window is None:
+                if diff > MOTION_START:
+                    self.window = SignWindow(index, timestamp)
+            elif diff < MOTION_END:
+                self.window.add(index, timestamp, features)
+                closed = self._close()
+
+        if self.window is not None:
+            self.window.add(index, timestamp, features)
+        self.prev_features = features
+        return closed
+
+    def _close(self):
+        window, self.window = self.window, None
+        if window.count < self.min_window_frames:
+            return None
+        self.windows_found += 1
+        return window
+
+    def finish(self):
+        """Close the stream; returns the last open window or the whole-clip fallback."""
+        if self.window is not None:
+            window = self._close()
+            if window is not None:
+                return window
+        if self.windows_found == 0 and self.clip is not None:
+            self.windows_found += 1
+            return self.clip
+        return None
+
+
+def predict_windows(model, inverse_label_mapping, windows):
+    """Predict one word per window with a single batched model call."""
+    if not windows:
+        return []
+    predictions = model.predict(np.stack([window.mean() for window in windows]))
+    return [inverse_label_mapping.get(idx, "Unknown") for idx in predictions]
@@ -0,0 +1,38 @@
+import logging
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.contrib.auth.models import User
+from .models import TrainedModel
+from .model_cache import model_cache
+from .schema import forget_default_user
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=TrainedModel)
+@receiver(post_delete, sender=TrainedModel)
+def invalidate_cached_model(sender, instance, **kwargs):
+    """Drop the cached copy of a model when its row is re-saved or deleted."""
+    model_cache.invalidate(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def forget_deleted_user(sender, instance, **kwargs):
+    """Resolve the auto-login user again if the cached one may have been deleted."""
+    forget_default_user()
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """Apply SQLITE_PRAGMAS (WAL, busy timeout, mmap, page cache) to each new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            try:
+                cursor.execute(f"PRAGMA {name} = {value}")
+            except Exception as e:
+                # e.g. switching journal mode while another process holds the lock; retried on the next connection
+                logger.warning(f"Could not set PRAGMA {name} = {value}: {e}")
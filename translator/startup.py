@@ -0,0 +1,115 @@
+"""
+Server startup, shared by every entry point (ASGI, WSGI, init_db.py).
+
+Startup.run() is idempotent and cheap when nothing changed: it applies
+migrations only when the applied-migration table is behind the migration
+files (one query), resolves the default user, then warms the detector
+pools and the most recent models on a background thread so the server can
+bind immediately. Every phase is timed; wait() blocks until warm-up is done,
+which is what the readiness endpoint reports.
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+from .schema import migrate_if_needed, default_user
+
+logger = logging.getLogger(__name__)
+
+
+def warm_models(count):
+    """Load the `count` newest models and the realtime 'auto' model into the model cache; returns their ids."""
+    from .models import TrainedModel
+    from .model_cache import model_cache
+
+    candidates = list(TrainedModel.objects.only('id', 'file').order_by('-created_at')[:count])
+    fastest = TrainedModel.fastest(settings.REALTIME_MIN_ACCURACY)
+    if fastest is not None and fastest.id not in {model_obj.id for model_obj in candidates}:
+        candidates.append(fastest)
+
+    warmed = []
+    for model_obj in candidates:
+        try:
+            model_cache.get(model_obj)
+            warmed.append(model_obj.id)
+        except Exception as e:
+            logger.warning(f"Could not warm up model {model_obj.id}: {e}")
+    return warmed
+
+
+class Startup:
+    """Startup phases, their timings and the readiness flag; see the module docstring."""
+
+    def __init__(self):
+        self.phases = {}
+        self.migrations_applied = []
+        self.warmed_models = []
+        self.errors = []
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._started = False
+
+    @contextmanager
+    def phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            logger.error(f"Startup phase {name} failed: {e}")
+            self.errors.append(f"{name}: {e}")
+        finally:
+            self.phases[name] = round(time.perf_counter() - started, 3)
+
+    def run(self, warm=True):
+        """Prepare the database and start warm-up, once per process."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        with self.phase('migrations'):
+            self.migrations_applied = [f"{app}.{name}" for app, name in migrate_if_needed()]
+        with self.phase('default_user'):
+            default_user()
+        logger.info(f"Startup: {len(self.migrations_applied)} migrations applied, phases {self.phases}")
+
+        if warm:
+            threading.Thread(target=self.warm_up, name='startup-warmup', daemon=True).start()
+        else:
+            self._ready.set()
+
+    def warm_up(self):
+        try:
+            if settings.DETECTOR_WARMUP:
+                from .detectors import warm_up as warm_detectors
+                with self.phase('detectors'):
+                    warm_detectors()
+            with self.phase('models'):
+                self.warmed_models = warm_models(settings.MODEL_WARMUP_COUNT)
+        finally:
+            # This thread's connection would otherwise stay open until the process exits
+            connections.close_all()
+            self._ready.set()
+            logger.info(f"Warm-up finished: phases {self.phases}")
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def wait(self, timeout=None):
+        """Block until warm-up has finished or `timeout` seconds passed; returns readiness."""
+        return self._ready.wait(timeout)
+
+    def report(self):
+        return {
+            'ready': self.ready,
+            'phases': dict(self.phases),
+            'migrations_applied': self.migrations_applied,
+            'warmed_models': self.warmed_models,
+            'errors': self.errors,
+        }
+
+
+startup = Startup()
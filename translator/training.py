@@ -0,0 +1,223 @@
+import copy
+import time
+import logging
+import warnings
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.linear_model import LogisticRegression
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+logger = logging.getLogger(__name__)
+
+MODE_SCRATCH = 'scratch'
+MODE_WARM_START = 'warm_start'
+MODE_REFIT = 'refit'
+
+BACKEND_FOREST = 'forest'
+BACKEND_PRUNED_FOREST = 'pruned_forest'
+BACKEND_LOGISTIC = 'logistic'
+BACKEND_KNN = 'knn'
+BACKEND_MLP = 'mlp'
+BACKEND_CHOICES = [
+    (BACKEND_FOREST, 'Random forest'),
+    (BACKEND_PRUNED_FOREST, 'Depth-limited random forest'),
+    (BACKEND_LOGISTIC, 'Logistic regression'),
+    (BACKEND_KNN, 'k-nearest neighbours'),
+    (BACKEND_MLP, 'Small neural network (MLP)'),
+]
+FOREST_BACKENDS = (BACKEND_FOREST, BACKEND_PRUNED_FOREST)
+
+# Depth-limited forest defaults: shallow trees are far smaller and faster to walk
+PRUNED_MAX_DEPTH = 12
+PRUNED_MIN_SAMPLES_LEAF = 2
+
+KNN_NEIGHBORS = 5
+MLP_HIDDEN_LAYERS = (64,)
+
+# Single-sample predictions timed per model after training
+LATENCY_SAMPLES = 50
+
+
+class TrainingOptions:
+    """Hyperparameters of a RandomForest training run."""
+
+    def __init__(self, n_estimators=200, n_jobs=-1, early_stopping=True, step=25,
+                 patience=2, min_delta=0.001, random_state=42,
+                 backend=BACKEND_FOREST, max_depth=None, min_samples_leaf=1):
+        self.backend = backend
+        self.max_depth = max_depth
+        self.min_samples_leaf = min_samples_leaf
+        self.n_estimators = n_estimators
+        self.n_jobs = n_jobs
+        self.early_stopping = early_stopping
+        self.step = step
+        self.patience = patience
+        self.min_delta = min_delta
+        self.random_state = random_state
+
+    @classmethod
+    def from_dict(cls, values):
+        return cls(**{key: value for key, value in (values or {}).items() if key in cls().as_dict()})
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def tree_params(self):
+        """Per-tree size limits; the depth-limited backend has its own defaults."""
+        if self.backend == BACKEND_PRUNED_FOREST:
+            return {
+                'max_depth': self.max_depth or PRUNED_MAX_DEPTH,
+                'min_samples_leaf': max(self.min_samples_leaf, PRUNED_MIN_SAMPLES_LEAF),
+            }
+        return {'max_depth': self.max_depth, 'min_samples_leaf': self.min_samples_leaf}
+
+
+def _oob_score(model):
+    return float(model.oob_score_) if hasattr(model, 'oob_score_') else None
+
+
+def _grow(model, x, y, options, minimum, limit, progress):
+    """
+    Add trees to a warm-startable forest in `step` increments.
+
+    Growth continues to at least `minimum` trees and at most `limit`. With
+    early stopping it ends once the OOB score has not improved by min_delta
+    for `patience` rounds. Returns the OOB curve as [(n_estimators, oob_score), ...].
+    """
+    curve = []
+    best, stale = None, 0
+    while True:
+        model.n_estimators = min(len(getattr(model, 'estimators_', [])) + options.step, limit)
+        with warnings.catch_warnings():
+            # Small datasets leave some samples without OOB predictions early on
+            warnings.simplefilter('ignore', UserWarning)
+            model.fit(x, y)
+        score = _oob_score(model)
+        curve.append((model.n_estimators, score))
+        if progress:
+            progress(model.n_estimators / limit, f"{model.n_estimators} trees, OOB {score:.3f}")
+        if model.n_estimators >= limit:
+            break
+        if options.early_stopping:
+            if best is None or score > best + options.min_delta:
+                best, stale = score, 0
+            else:
+                stale += 1
+                if stale >= options.patience and model.n_estimators >= minimum:
+                    break
+    return curve
+
+
+def train_forest(x, y, options, parent=None, parent_label_mapping=None, label_mapping=None, progress=None):
+    """
+    Fit a RandomForest on (x, y); returns (model, info).
+
+    Without a parent the forest is grown from scratch: to n_estimators trees,
+    or with early stopping until the OOB score plateaus (at most
+    n_estimators), with the tree limits of options.tree_params(). With a parent whose class table matches
+    `label_mapping`, a copy of it is warm-started: at least `step` new trees
+    are trained on the new data and added to the existing ones, up to
+    n_estimators in total with early stopping. If the class
+    table changed, existing trees cannot learn the new classes, so the
+    forest is refit from scratch at the parent's size.
+
+    info has the mode, final tree count, OOB curve and fit seconds.
+    """
+    started = time.perf_counter()
+    if parent is not None and parent_label_mapping == label_mapping:
+        mode = MODE_WARM_START
+        model = copy.deepcopy(parent)
+        model.set_params(warm_start=True, n_jobs=options.n_jobs, oob_score=True, bootstrap=True)
+        minimum = len(model.estimators_) + options.step
+        limit = max(options.n_estimators, minimum) if options.early_stopping else minimum
+        curve = _grow(model, x, y, options, minimum, limit, progress)
+    else:
+        mode = MODE_SCRATCH if parent is None else MODE_REFIT
+        target = options.n_estimators if parent is None else len(parent.estimators_)
+        model = RandomForestClassifier(
+            n_estimators=target, warm_start=options.early_stopping, oob_score=True, bootstrap=True,
+            n_jobs=options.n_jobs, random_state=options.random_state, **options.tree_params(),
+        )
+        if options.early_stopping:
+            curve = _grow(model, x, y, options, 0, target, progress)
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', UserWarning)
+                model.fit(x, y)
+            curve = [(target, _oob_score(model))]
+
+    # Plain forest for inference: single-sample predictions are slower when fanned
+    # out over threads, and the per-sample OOB matrix is not needed in the artifact
+    model.set_params(warm_start=False, n_jobs=None)
+    if hasattr(model, 'oob_decision_function_'):
+        del model.oob_decision_function_
+    info = {
+        'mode': mode,
+        'n_estimators': len(model.estimators_),
+        'oob_score': curve[-1][1],
+        'oob_curve': curve,
+        'fit_seconds': round(time.perf_counter() - started, 3),
+    }
+    logger.info(f"Trained forest ({mode}): {info['n_estimators']} trees, OOB {info['oob_score']}, {info['fit_seconds']}s")
+    return model, info
+
+
+def build_estimator(options, n_samples):
+    """An unfitted estimator for one of the non-forest backends."""
+    if options.backend == BACKEND_LOGISTIC:
+        return make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000, random_state=options.random_state))
+    if options.backend == BACKEND_KNN:
+        # The ball tree is built by fit() and stored with the model, so lookups do not scan every sample
+        return make_pipeline(StandardScaler(), KNeighborsClassifier(
+            n_neighbors=max(1, min(KNN_NEIGHBORS, n_samples)), algorithm='ball_tree',
+        ))
+    if options.backend == BACKEND_MLP:
+        return make_pipeline(StandardScaler(), MLPClassifier(
+            hidden_layer_sizes=MLP_HIDDEN_LAYERS, max_iter=500, random_state=options.random_state,
+        ))
+    raise ValueError(f"Unknown classifier backend: {options.backend}")
+
+
+def train_classifier(x, y, options, parent=None, parent_label_mapping=None, label_mapping=None, progress=None):
+    """
+    Fit the classifier selected by options.backend; returns (model, info).
+
+    Forest backends go through train_forest and can continue from a forest
+    parent. The other backends are always fit from scratch; a parent of a
+    different kind is only recorded as lineage.
+    """
+    if options.backend in FOREST_BACKENDS:
+        if not isinstance(parent, RandomForestClassifier):
+            parent = None
+        model, info = train_forest(x, y, options, parent, parent_label_mapping, label_mapping, progress)
+        info['backend'] = options.backend
+        return model, info
+
+    started = time.perf_counter()
+    model = build_estimator(options, len(x))
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', ConvergenceWarning)
+        model.fit(x, y)
+    if progress:
+        progress(1.0, f"Fitted {options.backend}")
+    info = {
+        'backend': options.backend,
+        'mode': MODE_SCRATCH,
+        'fit_seconds': round(time.perf_counter() - started, 3),
+    }
+    logger.info(f"Trained {options.backend} classifier in {info['fit_seconds']}s")
+    return model, info
+
+
+def measure_latency(model, x, samples=LATENCY_SAMPLES):
+    """Median single-sample predict time in milliseconds, the realtime access pattern."""
+    timings = []
+    for row in np.asarray(x[:samples], dtype=np.float64):
+        started = time.perf_counter()
+        model.predict(row[None, :])
+        timings.append(time.perf_counter() - started)
+    return round(float(np.median(timings)) * 1000, 4) if timings else None
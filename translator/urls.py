@@ -13,5 +13,11 @@ urlpatterns = [
     path('process-data/', views.process_data, name='process_data'),
     path('train-model/', views.train_model, name='train_model'),
     path('translate-video/', views.translate_video, name='translate_video'),
+    path('api/translate-video-stream/', views.translate_video_stream, name='translate_video_stream'),
     path('api/translate-frame/', views.translate_frame, name='translate_frame'),
+    path('api/stats/', views.runtime_stats, name='runtime_stats'),
+    path('api/ready/', views.readiness, name='readiness'),
+    path('api/jobs/', views.job_list, name='job_list'),
+    path('api/jobs/<int:job_id>/', views.job_status, name='job_status'),
+    path('api/jobs/<int:job_id>/cancel/', views.cancel_job, name='cancel_job'),
 ]
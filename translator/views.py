@@ -1,29 +1,42 @@
 import os
 import cv2
 import json
-import pickle
 import numpy as np
 import mediapipe as mp
 import logging
 import uuid
-import threading
+import time
 import base64
+import shutil
 import traceback
+import functools
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.contrib.auth import login
-from django.contrib.auth.models import User
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
 from django.core.files.storage import FileSystemStorage
-from django.db import connection
-from sklearn.ensemble import RandomForestClassifier
+from django.core.paginator import Paginator
+from django.db.models import Count
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import accuracy_score
-from sklearn.preprocessing import LabelEncoder
 from .forms import VideoUploadForm, ModelUploadForm, DataProcessorForm, ModelTrainerForm
-from .models import SignVideo, TrainedModel, TranslationSession
+from .models import SignVideo, TrainedModel, TranslationSession, Job
+from .model_cache import model_cache
+from .detectors import static_detectors, tracking_detectors, detector_stats, acquire_on
+from .inference import inference_executor
+from .batching import prediction_batcher
+from .features import extract_features, FEATURE_LENGTH
+from .segmentation import iter_video_features, SignSegmenter, predict_windows
+from .jobs import job_queue, job_handler, job_cleanup, JobCancelled
+from .extraction import detect_hand_and_elbow_movement, extract_videos, extraction_config, stage_video
+from .landmark_cache import LandmarkCache
+from .datasets import Dataset, DATASET_EXTENSION, save_dataset, load_dataset
+from .training import TrainingOptions, train_classifier, measure_latency, LATENCY_SAMPLES
+from .artifacts import MODEL_EXTENSION, save_artifact, load_artifact
+from .schema import table_exists, ensure_tables_exist, default_user
+from .startup import startup
 
 # Logging setup
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -34,89 +47,12 @@ mp_hands = mp.solutions.hands
 mp_pose = mp.solutions.pose
 mp_drawing = mp.solutions.drawing_utils
 
-# Function to get or create default user
-def get_default_user():
-    try:
-        user, created = User.objects.get_or_create(
-            username='BEKFURR',
-            defaults={
-                'email': 'bekfurr@example.com',
-                'is_staff': True,
-                'is_superuser': True,
-            }
-        )
-        if created:
-            user.set_password('BEKFURR')
-            user.save()
-            logger.debug("Created default user BEKFURR")
-        return user
-    except Exception as e:
-        logger.error(f"Error getting default user: {e}")
-        # Fallback to first superuser or create one if none exists
-        try:
-            return User.objects.filter(is_superuser=True).first() or User.objects.create_superuser(
-                'admin', 'admin@example.com', 'admin'
-            )
-        except:
-            return None
-
-# Auto-login middleware for all views
-def auto_login(request):
-    if not request.user.is_authenticated:
-        user = get_default_user()
-        if user:
-            login(request, user)
-            logger.debug(f"Auto-logged in as {user.username}")
-    return request
-
-# Function to check if a table exists
-def table_exists(table_name):
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute(
-                "SELECT name FROM sqlite_master WHERE type='table' AND name=%s",
-                [table_name]
-            )
-            return cursor.fetchone() is not None
-    except Exception as e:
-        logger.error(f"Error checking if table exists: {e}")
-        return False
-
-# Function to create tables if they don't exist
-def ensure_tables_exist():
-    try:
-        from django.core.management import call_command
-        
-        # Check if tables exist
-        required_tables = ['translator_trainedmodel', 'translator_signvideo', 'translator_translationsession']
-        missing_tables = [table for table in required_tables if not table_exists(table)]
-        
-        if missing_tables:
-            logger.warning(f"Missing tables detected: {missing_tables}")
-            
-            # Create migrations
-            logger.info("Creating migrations...")
-            call_command('makemigrations', 'translator', interactive=False)
-            
-            # Apply migrations
-            logger.info("Applying migrations...")
-            call_command('migrate', interactive=False)
-            
-            # Verify tables were created
-            missing_tables = [table for table in required_tables if not table_exists(table)]
-            if missing_tables:
-                logger.error(f"Failed to create tables: {missing_tables}")
-                return False
-            else:
-                logger.info("All required tables created successfully!")
-                return True
-        else:
-            logger.info("All required tables exist!")
-            return True
-    except Exception as e:
-        logger.error(f"Error ensuring tables exist: {e}")
-        logger.error(traceback.format_exc())
-        return False
+# Columns the list pages render; everything else stays in the database
+MODEL_LIST_FIELDS = (
+    'id', 'name', 'created_at', 'accuracy', 'backend', 'inference_ms', 'model_size',
+    'training_seconds', 'training_params', 'parent__name',
+)
+VIDEO_LIST_FIELDS = ('id', 'word', 'video', 'uploaded_at')
 
 # Function to safely get models without crashing if table doesn't exist
 def safe_get_models(user):
@@ -125,77 +61,105 @@ def safe_get_models(user):
             logger.warning("Table translator_trainedmodel does not exist")
             ensure_tables_exist()
             return []
-        return TrainedModel.objects.filter(created_by=user)
+        # Newest first, served by the (created_by, created_at) index
+        return (TrainedModel.objects.filter(created_by=user)
+                .select_related('parent').only(*MODEL_LIST_FIELDS).order_by('-created_at'))
     except Exception as e:
         logger.error(f"Error getting models: {e}")
         return []
 
 # Function to safely get videos without crashing if table doesn't exist
-def safe_get_videos(user):
+def safe_get_videos(user, ordering='-uploaded_at'):
     try:
         if not table_exists('translator_signvideo'):
             logger.warning("Table translator_signvideo does not exist")
             ensure_tables_exist()
             return []
-        return SignVideo.objects.filter(uploaded_by=user)
+        # Newest first by default, served by the (uploaded_by, uploaded_at) index
+        return SignVideo.objects.filter(uploaded_by=user).only(*VIDEO_LIST_FIELDS).order_by(ordering)
     except Exception as e:
         logger.error(f"Error getting videos: {e}")
         return []
 
+def video_word_counts(user):
+    # Videos per word, counted by the database
+    try:
+        if not table_exists('translator_signvideo'):
+            return []
+        return list(SignVideo.objects.filter(uploaded_by=user).values('word').annotate(count=Count('id')).order_by('word'))
+    except Exception as e:
+        logger.error(f"Error counting videos: {e}")
+        return []
+
+def paginate(request, items, param='page'):
+    # One page of a list; the page number is read from request.GET[param].
+    # Its links keep the rest of the query string, e.g. the other list's page
+    page = Paginator(items, settings.LIST_PAGE_SIZE).get_page(request.GET.get(param))
+    query = request.GET.copy()
+    if page.has_previous():
+        query[param] = page.previous_page_number()
+        page.previous_query = query.urlencode()
+    if page.has_next():
+        query[param] = page.next_page_number()
+        page.next_query = query.urlencode()
+    return page
+
 # Add this decorator to the home view
 @ensure_csrf_cookie
 def home(request):
-    # Auto-login
-    request = auto_login(request)
     return render(request, 'translator/home.html')
 
 def dashboard(request):
-    # Auto-login
-    request = auto_login(request)
-    
     user = request.user
     
-    # Safely get models and videos
-    user_models = safe_get_models(user)
-    user_videos = safe_get_videos(user)
+    # One page each of models and videos
+    user_models = paginate(request, safe_get_models(user), 'models_page')
+    user_videos = paginate(request, safe_get_videos(user), 'videos_page')
     
     # Safely get sessions
     user_sessions = []
     try:
         if table_exists('translator_translationsession'):
-            user_sessions = TranslationSession.objects.filter(user=user).order_by('-start_time')[:5]
+            user_sessions = list(
+                TranslationSession.objects.filter(user=user)
+                .select_related('model').only('id', 'start_time', 'end_time', 'translation_text', 'model__name')
+                .annotate(words=Count('predictions')).order_by('-start_time')[:5]
+            )
     except Exception as e:
         logger.error(f"Error getting sessions: {e}")
     
+    # Recent background jobs; the page polls api/jobs/ for progress
+    user_jobs = []
+    try:
+        user_jobs = Job.objects.filter(created_by=user).order_by('-created_at')[:5]
+    except Exception as e:
+        logger.error(f"Error getting jobs: {e}")
+    
     context = {
         'user_models': user_models,
         'user_videos': user_videos,
         'user_sessions': user_sessions,
+        'user_jobs': user_jobs,
+        'word_counts': video_word_counts(user),
     }
     return render(request, 'translator/dashboard.html', context)
 
 def data_processor(request):
-    # Auto-login
-    request = auto_login(request)
-    
-    videos = safe_get_videos(request.user)
+    videos = paginate(request, safe_get_videos(request.user))
     
-    return render(request, 'translator/data_processor.html', {'videos': videos})
+    return render(request, 'translator/data_processor.html', {
+        'videos': videos,
+        'word_counts': video_word_counts(request.user),
+    })
 
 def model_trainer(request):
-    # Auto-login
-    request = auto_login(request)
-    
-    models = safe_get_models(request.user)
+    models = paginate(request, safe_get_models(request.user))
     
     return render(request, 'translator/model_trainer.html', {'models': models})
 
 # Add this decorator to the realtime_translator view
 @ensure_csrf_cookie
 def realtime_translator(request):
-    # Auto-login
-    request = auto_login(request)
-    
     # Use empty list if models can't be retrieved
     try:
         models = safe_get_models(request.user)
@@ -207,12 +171,12 @@ def realtime_translator(request):
     if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
         return JsonResponse({'status': 'ok', 'message': 'Session refreshed'})
     
-    return render(request, 'translator/realtime_translator.html', {'models': models})
+    return render(request, 'translator/realtime_translator.html', {
+        'models': models,
+        'min_accuracy': settings.REALTIME_MIN_ACCURACY,
+    })
 
 def upload_video(request):
-    # Auto-login
-    request = auto_login(request)
-    
     # Ensure tables exist before trying to save
     ensure_tables_exist()
     
@@ -234,9 +198,6 @@ def upload_video(request):
     return render(request, 'translator/upload_video.html', {'form': form})
 
 def upload_model(request):
-    # Auto-login
-    request = auto_login(request)
-    
     # Ensure tables exist before trying to save
     ensure_tables_exist()
     
@@ -246,6 +207,13 @@ def upload_model(request):
             try:
                 model = form.save(commit=False)
                 model.created_by = request.user
+                # Validated by the form; record what the manifest and a timing run say about it
+                artifact = form.artifact
+                model.backend = artifact.backend
+                model.model_size = request.FILES['file'].size
+                model.inference_ms = measure_latency(
+                    artifact.predictor(), np.random.default_rng(0).random((LATENCY_SAMPLES, FEATURE_LENGTH))
+                )
                 model.save()
                 messages.success(request, 'Model uploaded successfully!')
                 return redirect('model_trainer')
@@ -258,273 +226,224 @@ def upload_model(request):
     return render(request, 'translator/upload_model.html', {'form': form})
 
 def process_data(request):
-    # Auto-login
-    request = auto_login(request)
-    
-    # Get all videos from the user
-    videos = safe_get_videos(request.user)
+    # Get all videos from the user, in upload order so datasets are reproducible
+    videos = safe_get_videos(request.user, ordering='id')
     
     if request.method == 'POST':
-        # Create temporary directory for processing
-        temp_dir = os.path.join(settings.MEDIA_ROOT, f'temp_{uuid.uuid4().hex}')
-        os.makedirs(temp_dir, exist_ok=True)
-        
         if not videos:
             messages.error(request, 'You need to upload videos first before processing data.')
             return redirect('upload_video')
         
-        # Create words.json file
-        words_data = []
-        for video in videos:
-            video_path = os.path.join(settings.MEDIA_ROOT, video.video.name)
-            dest_path = os.path.join(temp_dir, os.path.basename(video.video.name))
-            
-            # Copy video file to temp directory
-            with open(video_path, 'rb') as src, open(dest_path, 'wb') as dst:
-                dst.write(src.read())
-            
-            words_data.append({
-                "word_uz": video.word,
-                "video": os.path.basename(video.video.name)
-            })
-        
-        # Save words.json
-        with open(os.path.join(temp_dir, 'words.json'), 'w', encoding='utf-8') as f:
-            json.dump(words_data, f, ensure_ascii=False, indent=2)
+        # Snapshot the videos as a manifest; files are hard-linked, never copied
+        staging_dir = os.path.join(settings.MEDIA_ROOT, f'temp_{uuid.uuid4().hex}')
+        manifest = [
+            {
+                'video_id': video.id,
+                'word': video.word,
+                'path': stage_video(os.path.join(settings.MEDIA_ROOT, video.video.name), staging_dir),
+            }
+            for video in videos
+        ]
         
-        # Process data in background
-        threading.Thread(target=process_data_background, args=(temp_dir, request.user.id)).start()
+        # Process data on the job queue
+        job = job_queue.submit(Job.KIND_PROCESS_DATA, request.user, {'manifest': manifest, 'staging_dir': staging_dir})
         
-        messages.success(request, 'Data processing started. This may take a few minutes.')
+        messages.success(request, f'Data processing queued as job #{job.id}. Progress is shown on the dashboard.')
         return redirect('data_processor')
     
     return render(request, 'translator/process_data.html', {'videos': videos})
 
-def process_data_background(temp_dir, user_id):
+@job_handler(Job.KIND_PROCESS_DATA)
+def process_data_job(context):
+    try:
+        return process_data_background(context.payload['manifest'], context.job.created_by_id, context.progress)
+    finally:
+        # The job will not run again, so the staged links are no longer needed
+        remove_staging_dir(context.job)
+
+@job_cleanup(Job.KIND_PROCESS_DATA)
+def remove_staging_dir(job):
+    # The hard links keep the source videos on disk, even deleted ones, until removed
+    staging_dir = job.payload.get('staging_dir')
+    if staging_dir and os.path.isdir(staging_dir):
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+def process_data_background(manifest, user_id, progress=None):
     try:
-        # Initialize MediaPipe
-        hands = mp_hands.Hands(static_image_mode=False, min_detection_confidence=0.3, max_num_hands=2)
-        pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.3)
-        
-        # Load words.json
-        with open(os.path.join(temp_dir, 'words.json'), 'r', encoding='utf-8') as f:
-            words_data = json.load(f)
-        
         data = []
         labels = []
-        class_names = []
+        sample_keys = []
         
-        for item in words_data:
-            word = item["word_uz"]
-            video_path = os.path.join(temp_dir, item["video"])
-            if not os.path.exists(video_path):
-                logger.warning(f"Video file not found: {video_path}")
-                continue
-            
-            logger.info(f"Processing video: {video_path} for class: {word}")
-            start_frame, end_frame, landmarks_history = detect_hand_and_elbow_movement(video_path, hands, pose)
-            
-            if landmarks_history:
-                frame_features = landmarks_history[start_frame:end_frame + 1] if start_frame is not None and end_frame is not None else landmarks_history
-                if frame_features:
-                    expected_length = len(frame_features[0])
-                    frame_features = [f for f in frame_features if len(f) == expected_length]
-                    if len(frame_features) == 0:
-                        logger.warning(f"No consistent features extracted from video: {video_path}, using default zero features.")
-                        frame_features = [np.zeros(88).tolist()]
-                    avg_features = np.mean(frame_features, axis=0)
-                    data.append(avg_features)
-                    labels.append(word)
-                    class_names.append(word)
-                    logger.info(f"Successfully processed video: {video_path}, class: {word}")
-                else:
-                    logger.warning(f"No valid features extracted from video: {video_path}, using default zero features.")
-                    data.append(np.zeros(88).tolist())
-                    labels.append(word)
-                    class_names.append(word)
-                    logger.info(f"Added default features for video: {video_path}, class: {word}, label: {word}")
+        # Cached videos are assembled from the landmark cache, the rest fan out
+        # over worker processes; reports come back in manifest order
+        items = [(item['path'], item['word']) for item in manifest]
+        workers = settings.DATA_PROCESSING_WORKERS
+        cache = LandmarkCache(settings.LANDMARK_CACHE_DIR, extraction_config()) if settings.LANDMARK_CACHE_DIR else None
         
-        # Save processed data
-        pickle_path = os.path.join(settings.MEDIA_ROOT, 'data', f'data_mixed_{uuid.uuid4().hex}.pickle')
-        os.makedirs(os.path.dirname(pickle_path), exist_ok=True)
+        def report_progress(done, total):
+            if progress:
+                progress(done / total, f"Extracted {done}/{total} videos")
         
-        with open(pickle_path, 'wb') as f:
-            pickle.dump({'data': data, 'labels': labels, 'class_names': class_names}, f)
+        started = time.perf_counter()
+        reports = extract_videos(items, workers, tracking_detectors, report_progress, cache)
+        elapsed = time.perf_counter() - started
+        cache_stats = cache.stats() if cache else None
         
-        # Clean up
-        import shutil
-        shutil.rmtree(temp_dir)
+        for report in reports:
+            features = report.pop('features')
+            if features is None:
+                continue
+            data.append(features)
+            labels.append(report['word'])
+            sample_keys.append(report['key'])
+        failed = [report for report in reports if report['status'] in ('missing', 'error')]
+        if failed:
+            logger.warning(f"{len(failed)} of {len(reports)} videos could not be processed")
+        logger.info(f"Extracted {len(data)} samples from {len(items)} videos in {elapsed:.1f}s with {workers} worker(s), landmark cache: {cache_stats}")
         
-        logger.info(f"Data processing completed. Saved to {pickle_path}")
+        # Save processed data in the columnar dataset format
+        dataset = Dataset.from_samples(data, labels, metadata={
+            'videos': reports,
+            'timings': {'workers': workers, 'total_seconds': round(elapsed, 3)},
+            'landmark_cache': cache_stats,
+        }, sample_keys=sample_keys)
+        dataset_path = os.path.join(settings.MEDIA_ROOT, 'data', f'dataset_{uuid.uuid4().hex}{DATASET_EXTENSION}')
+        os.makedirs(os.path.dirname(dataset_path), exist_ok=True)
+        save_dataset(dataset, dataset_path)
+        
+        logger.info(f"Data processing completed. Saved to {dataset_path}")
+        return {
+            'dataset_path': os.path.relpath(dataset_path, settings.MEDIA_ROOT),
+            'samples': len(dataset),
+            'failed': [{'video': r['video'], 'status': r['status'], 'error': r['error']} for r in failed],
+            'workers': workers,
+            'seconds': round(elapsed, 3),
+            'landmark_cache': cache_stats,
+        }
+    except JobCancelled:
+        raise
     except Exception as e:
         logger.error(f"Error in data processing: {str(e)}")
         logger.error(traceback.format_exc())
-
-def detect_hand_and_elbow_movement(video_path, hands, pose):
-    cap = cv2.VideoCapture(video_path)
-    cap.set(cv2.CAP_PROP_FPS, 60)
-    landmarks_history = []
-    motion_detected = False
-    start_frame = None
-    end_frame = None
-    expected_length = None
-    min_frames = 30
-    prev_landmarks = None
-    smoothing_factor = 0.7
-
-    while cap.isOpened():
-        ret, frame = cap.read()
-        if not ret:
-            break
-        frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        h, w, _ = frame.shape
-        frame_rgb = cv2.convertScaleAbs(frame_rgb, alpha=1.5, beta=15)
-
-        hand_results = hands.process(frame_rgb)
-        pose_results = pose.process(frame_rgb)
-
-        data_aux = []
-        if hand_results.multi_hand_landmarks:
-            for hand_landmarks in hand_results.multi_hand_landmarks:
-                x_ = [landmark.x for landmark in hand_landmarks.landmark]
-                y_ = [landmark.y for landmark in hand_landmarks.landmark]
-                if x_ and y_:
-                    for i in range(len(hand_landmarks.landmark)):
-                        x = hand_landmarks.landmark[i].x
-                        y = hand_landmarks.landmark[i].y
-                        data_aux.append(x - min(x_))
-                        data_aux.append(y - min(y_))
-
-        if pose_results.pose_landmarks:
-            pose_landmarks = pose_results.pose_landmarks.landmark
-            left_elbow = pose_landmarks[13]
-            data_aux.append(left_elbow.x * w)
-            data_aux.append(left_elbow.y * h)
-            right_elbow = pose_landmarks[14]
-            data_aux.append(right_elbow.x * w)
-            data_aux.append(right_elbow.y * h)
-
-        if len(data_aux) < 88:
-            data_aux.extend([0.0] * (88 - len(data_aux)))
-
-        if expected_length is None and data_aux:
-            expected_length = len(data_aux)
-        if len(data_aux) == expected_length:
-            if prev_landmarks is not None:
-                smoothed_landmarks = smoothing_factor * prev_landmarks + (1 - smoothing_factor) * np.array(data_aux)
-                data_aux = smoothed_landmarks.tolist()
-            landmarks_history.append(data_aux)
-            if len(landmarks_history) > 1 and len(landmarks_history) >= min_frames:
-                prev_data = np.array(landmarks_history[-2])
-                curr_data = np.array(data_aux)
-                if len(curr_data) == len(prev_data):
-                    diff = np.linalg.norm(curr_data - prev_data)
-                    if diff > 0.01:
-                        if not motion_detected:
-                            start_frame = len(landmarks_history) - 1
-                            motion_detected = True
-                    elif motion_detected and diff < 0.002:
-                        end_frame = len(landmarks_history) - 1
-                        break
-            prev_landmarks = np.array(data_aux)
-        else:
-            if motion_detected and end_frame is None and len(landmarks_history) >= min_frames:
-                end_frame = len(landmarks_history) - 1
-                break
-
-    cap.release()
-    if not motion_detected:
-        if landmarks_history:
-            start_frame = 0
-            end_frame = len(landmarks_history) - 1
-        else:
-            landmarks_history = [np.zeros(88).tolist()]
-            start_frame = 0
-            end_frame = 0
-            logger.warning(f"No landmarks detected in video: {video_path}, using default zero features.")
-
-    return start_frame, end_frame, landmarks_history
+        raise
 
 def train_model(request):
-    # Auto-login
-    request = auto_login(request)
-    
     # Ensure tables exist before trying to save
     ensure_tables_exist()
     
     if request.method == 'POST':
-        form = ModelTrainerForm(request.POST, request.FILES)
+        form = ModelTrainerForm(request.POST, request.FILES, user=request.user)
         if form.is_valid():
-            pickle_file = request.FILES['pickle_file']
+            dataset_file = request.FILES['pickle_file']
             fs = FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'data'))
-            filename = fs.save(pickle_file.name, pickle_file)
-            pickle_path = os.path.join(settings.MEDIA_ROOT, 'data', filename)
+            filename = fs.save(dataset_file.name, dataset_file)
+            dataset_path = os.path.join(settings.MEDIA_ROOT, 'data', filename)
+            
+            parent = form.cleaned_data.get('parent_model')
+            options = TrainingOptions(
+                backend=form.cleaned_data.get('backend') or 'forest',
+                max_depth=form.cleaned_data.get('max_depth'),
+                n_estimators=form.cleaned_data.get('n_estimators') or 200,
+                early_stopping=form.cleaned_data.get('early_stopping', False),
+                n_jobs=settings.TRAINING_N_JOBS,
+            )
             
-            # Train model in background
-            threading.Thread(target=train_model_background, args=(pickle_path, request.user.id)).start()
+            # Train model on the job queue
+            job = job_queue.submit(Job.KIND_TRAIN_MODEL, request.user, {
+                'dataset_path': dataset_path,
+                'parent_id': parent.id if parent else None,
+                'options': options.as_dict(),
+            })
             
-            messages.success(request, 'Model training started. This may take a few minutes.')
+            messages.success(request, f'Model training queued as job #{job.id}. Progress is shown on the dashboard.')
             return redirect('model_trainer')
     else:
-        form = ModelTrainerForm()
+        form = ModelTrainerForm(user=request.user)
     
     return render(request, 'translator/train_model.html', {'form': form})
 
-def train_model_background(pickle_path, user_id):
+@job_handler(Job.KIND_TRAIN_MODEL)
+def train_model_job(context):
+    payload = context.payload
+    return train_model_background(
+        payload['dataset_path'], context.job.created_by_id, context.progress,
+        parent_id=payload.get('parent_id'), options=TrainingOptions.from_dict(payload.get('options')),
+    )
+
+def train_model_background(dataset_path, user_id, progress=None, parent_id=None, options=None):
     try:
         from django.contrib.auth.models import User
         user = User.objects.get(id=user_id)
+        options = options or TrainingOptions(n_jobs=settings.TRAINING_N_JOBS)
+        timings = {}
+        started = time.perf_counter()
+        stage_started = started
+        
+        def stage(name):
+            nonlocal stage_started
+            now = time.perf_counter()
+            timings[name] = round(now - stage_started, 3)
+            stage_started = now
         
         # Load data
-        data_dict = pickle.load(open(pickle_path, 'rb'))
-        data = data_dict['data']
-        labels = data_dict['labels']
+        if progress:
+            progress(0.0, "Loading data")
+        # Columnar datasets are memory-mapped; legacy pickles are converted on load
+        dataset = load_dataset(dataset_path, mmap_mode='r')
+        
+        # Optional parent model to warm-start from
+        parent_obj = parent = parent_label_mapping = None
+        if parent_id:
+            parent_obj = TrainedModel.objects.get(pk=parent_id, created_by=user)
+            loaded_parent = model_cache.get(parent_obj)
+            parent, parent_label_mapping = loaded_parent.model, loaded_parent.label_mapping
+        stage('load')
         
-        if not data:
-            logger.error("No data found in the pickle file!")
-            return
+        if not len(dataset):
+            raise ValueError("No data found in the dataset file!")
         
-        unique_classes = len(set(labels))
+        unique_classes = len(dataset.classes)
         if unique_classes < 2:
             logger.warning(f"Only {unique_classes} class found! Training with limited data might not be effective.")
-            if unique_classes == 0:
-                logger.error("No classes found!")
-                return
+        logger.info(f"Feature length: {dataset.feature_length}")
         
-        feature_lengths = [len(d) for d in data]
-        if not feature_lengths:
-            logger.error("No valid feature lengths found in data!")
-            return
-        most_common_length = max(set(feature_lengths), key=feature_lengths.count)
-        logger.info(f"Most common feature length: {most_common_length}")
+        data = dataset.features
+        label_mapping = dataset.label_mapping
         
-        filtered_data = [d for d in data if len(d) == most_common_length]
-        filtered_labels = [labels[i] for i, d in enumerate(data) if len(d) == most_common_length]
+        x_train, x_test, y_train, y_test = train_test_split(data, dataset.labels, test_size=0.1, shuffle=True)
+        stage('split')
+        if progress:
+            progress(0.1, f"Training on {len(x_train)} samples")
         
-        if not filtered_data:
-            logger.error("No valid data for training after filtering!")
-            return
+        def fit_progress(fraction, message):
+            if progress:
+                progress(0.1 + 0.75 * fraction, message)
         
-        data = np.asarray(filtered_data)
-        labels = np.asarray(filtered_labels)
-        
-        le = LabelEncoder()
-        labels_encoded = le.fit_transform(labels)
-        label_mapping = dict(zip(le.classes_, range(len(le.classes_))))
-        
-        x_train, x_test, y_train, y_test = train_test_split(data, labels_encoded, test_size=0.1, shuffle=True)
-        model = RandomForestClassifier(n_estimators=200, random_state=42)
-        model.fit(x_train, y_train)
+        model, fit_info = train_classifier(
+            x_train, y_train, options, parent=parent, parent_label_mapping=parent_label_mapping,
+            label_mapping=label_mapping, progress=fit_progress,
+        )
+        stage('fit')
         y_predict = model.predict(x_test)
         score = accuracy_score(y_predict, y_test)
+        stage('evaluate')
         logger.info(f'Hand + Elbow: {score * 100:.2f}% of samples classified correctly!')
         
         # Save model
-        model_path = os.path.join(settings.MEDIA_ROOT, 'models', f'model_mixed_{uuid.uuid4().hex}.p')
+        if progress:
+            progress(0.9, "Saving model")
+        model_path = os.path.join(settings.MEDIA_ROOT, 'models', f'model_mixed_{uuid.uuid4().hex}{MODEL_EXTENSION}')
         os.makedirs(os.path.dirname(model_path), exist_ok=True)
         
-        with open(model_path, 'wb') as f:
-            pickle.dump({'model': model, 'label_mapping': label_mapping}, f)
+        save_artifact(model, label_mapping, model_path, options.backend, metadata={
+            'samples': len(data),
+            'dataset': os.path.basename(dataset_path),
+        })
+        stage('save')
+        
+        # Latency of what the realtime paths will serve: the predictor rebuilt from the artifact
+        inference_ms = measure_latency(load_artifact(model_path).predictor(), x_test if len(x_test) else x_train)
+        stage('measure')
         
         # Ensure tables exist before saving model
         ensure_tables_exist()
@@ -532,28 +451,50 @@ def train_model_background(pickle_path, user_id):
         # Create model record
         model_name = f"Model {uuid.uuid4().hex[:8]}"
         model_file = os.path.relpath(model_path, settings.MEDIA_ROOT)
+        model_size = os.path.getsize(model_path)
+        training_seconds = round(time.perf_counter() - started, 3)
         
         try:
-            TrainedModel.objects.create(
+            trained_model = TrainedModel.objects.create(
                 name=model_name,
                 description=f"Trained with {len(data)} samples, {unique_classes} classes",
                 file=model_file,
                 created_by=user,
-                accuracy=score * 100
+                accuracy=score * 100,
+                backend=options.backend,
+                inference_ms=inference_ms,
+                model_size=model_size,
+                parent=parent_obj,
+                training_seconds=training_seconds,
+                training_timings=timings,
+                training_params=dict(options.as_dict(), **fit_info),
             )
             logger.info(f"Model training completed and saved to database. File: {model_path}")
         except Exception as e:
             logger.error(f"Error saving model to database: {e}")
             logger.error(traceback.format_exc())
+            raise
+        return {
+            'model_id': trained_model.id,
+            'model_name': model_name,
+            'accuracy': score * 100,
+            'backend': options.backend,
+            'mode': fit_info['mode'],
+            'n_estimators': fit_info.get('n_estimators'),
+            'oob_score': fit_info.get('oob_score'),
+            'inference_ms': inference_ms,
+            'model_size': model_size,
+            'training_seconds': training_seconds,
+        }
+    except JobCancelled:
+        raise
     except Exception as e:
         logger.error(f"Error in model training: {str(e)}")
         logger.error(traceback.format_exc())
+        raise
 
 @ensure_csrf_cookie
 def translate_video(request):
-    # Auto-login
-    request = auto_login(request)
-    
     if request.method == 'POST':
         try:
             video_file = request.FILES.get('video')
@@ -570,10 +511,9 @@ def translate_video(request):
             # Get model
             try:
                 model_obj = TrainedModel.objects.get(id=model_id)
-                model_path = os.path.join(settings.MEDIA_ROOT, model_obj.file.name)
                 
                 # Process video
-                result = translate_video_background(video_path, model_path)
+                result = translate_video_background(video_path, model_obj)
                 
                 # Clean up
                 if os.path.exists(video_path):
@@ -595,21 +535,16 @@ def translate_video(request):
     
     return render(request, 'translator/translate_video.html', {'models': models})
 
-def translate_video_background(video_path, model_path):
+def translate_video_background(video_path, model_obj):
     try:
-        # Load model
-        with open(model_path, 'rb') as f:
-            model_data = pickle.load(f)
-            model = model_data['model']
-            label_mapping = model_data.get('label_mapping', {})
-            inverse_label_mapping = {v: k for k, v in label_mapping.items()}
-        
-        # Initialize MediaPipe
-        hands = mp_hands.Hands(static_image_mode=False, min_detection_confidence=0.3, max_num_hands=2)
-        pose = mp_pose.Pose(static_image_mode=False, min_detection_confidence=0.3)
+        # Load model (shared cache)
+        loaded = model_cache.get(model_obj)
+        model = loaded.predictor
+        inverse_label_mapping = loaded.inverse_label_mapping
         
-        # Process video
-        start_frame, end_frame, landmarks_history = detect_hand_and_elbow_movement(video_path, hands, pose)
+        # Process video with a pooled tracking detector
+        with tracking_detectors.checkout() as detector:
+            start_frame, end_frame, landmarks_history = detect_hand_and_elbow_movement(video_path, detector.hands, detector.pose)
         
         if start_frame < len(landmarks_history) and (end_frame is None or start_frame < end_frame):
             if end_frame is None:
@@ -634,12 +569,119 @@ def translate_video_background(video_path, model_path):
         logger.error(traceback.format_exc())
         return f"Error: {str(e)}"
 
+def translate_video_stream(request):
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+    
+    video_file = request.FILES.get('video')
+    model_id = request.POST.get('model_id')
+    if not video_file or not model_id:
+        return JsonResponse({'error': 'Please provide both video and model.'}, status=400)
+    
+    try:
+        model_obj = TrainedModel.objects.get(id=model_id)
+        loaded = model_cache.get(model_obj)
+    except TrainedModel.DoesNotExist:
+        return JsonResponse({'error': 'Model not found.'}, status=404)
+    except FileNotFoundError:
+        return JsonResponse({'error': 'Model file not found'}, status=404)
+    
+    # Large uploads are already on disk; only in-memory ones need a temp file
+    if hasattr(video_file, 'temporary_file_path'):
+        video_path, temp_path = video_file.temporary_file_path(), None
+    else:
+        fs = FileSystemStorage(location=os.path.join(settings.MEDIA_ROOT, 'temp'))
+        filename = fs.save(video_file.name, video_file)
+        video_path = temp_path = os.path.join(settings.MEDIA_ROOT, 'temp', filename)
+    
+    # Async iterators are buffered whole under WSGI, so WSGI gets a sync one
+    if isinstance(request, ASGIRequest):
+        stream = stream_video_translation(video_path, temp_path, loaded)
+    else:
+        stream = stream_video_translation_sync(video_path, temp_path, loaded)
+    response = StreamingHttpResponse(stream, content_type='application/x-ndjson')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+async def stream_video_translation(video_path, temp_path, loaded):
+    # Drive the sync generator on one inference worker so the detector it
+    # uses is always checked out, used and returned by the same thread
+    session_key = f'video-{uuid.uuid4().hex}'
+    run = functools.partial(inference_executor.run, session_key)
+    detector = events = None
+    try:
+        # Waits for a free detector off the worker shared with other sessions
+        detector = await acquire_on(tracking_detectors, run)
+        events = video_translation_events(video_path, loaded, detector)
+        while True:
+            event = await run(next, events, None)
+            if event is None:
+                break
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+    except Exception as e:
+        logger.error(f"Error in streaming video translation: {str(e)}")
+        logger.error(traceback.format_exc())
+        yield json.dumps({'type': 'error', 'error': str(e)}) + "\n"
+    finally:
+        if events is not None:
+            await run(events.close)
+        if detector is not None:
+            await run(tracking_detectors.release, detector)
+        inference_executor.release_session(session_key)
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def stream_video_translation_sync(video_path, temp_path, loaded):
+    # WSGI: the request thread owns the detector, the inference workers are not involved
+    try:
+        with tracking_detectors.checkout() as detector:
+            for event in video_translation_events(video_path, loaded, detector):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+    except Exception as e:
+        logger.error(f"Error in streaming video translation: {str(e)}")
+        logger.error(traceback.format_exc())
+        yield json.dumps({'type': 'error', 'error': str(e)}) + "\n"
+    finally:
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def video_translation_events(video_path, loaded, detector):
+    """Decode a video once with a checked-out tracking detector, segment it into signs and yield one event per word."""
+    words = []
+    frames = 0
+    segmenter = SignSegmenter()
+    for index, timestamp, features in iter_video_features(video_path, detector.hands, detector.pose):
+        frames += 1
+        window = segmenter.feed(index, timestamp, features)
+        if window is not None:
+            words.append(word_event(loaded, window))
+            yield words[-1]
+    window = segmenter.finish()
+    if window is not None:
+        words.append(word_event(loaded, window))
+        yield words[-1]
+    
+    yield {
+        'type': 'done',
+        'frames': frames,
+        'translation': " ".join(event['word'] for event in words),
+    }
+
+def word_event(loaded, window):
+    word = predict_windows(loaded.predictor, loaded.inverse_label_mapping, [window])[0]
+    return {
+        'type': 'word',
+        'word': word,
+        'start': round(window.start_time, 3),
+        'end': round(window.end_time, 3),
+        'start_frame': window.start_frame,
+        'end_frame': window.end_frame,
+    }
+
 @csrf_exempt
 @ensure_csrf_cookie
 def translate_frame(request):
-    # Auto-login
-    request = auto_login(request)
-    
     if request.method == 'POST':
         try:
             # Get frame data
@@ -652,42 +694,34 @@ def translate_frame(request):
             # Read frame
             frame = cv2.imdecode(np.frombuffer(frame_data.read(), np.uint8), cv2.IMREAD_COLOR)
             
-            # Get model
-            try:
-                # First check if the model exists at all
-                model_obj = TrainedModel.objects.get(id=model_id)
-                model_path = os.path.join(settings.MEDIA_ROOT, model_obj.file.name)
+            # A model already in the cache is served without any database access
+            loaded = model_cache.get_cached(model_id)
+            if loaded is None:
+                min_accuracy = request.POST.get('min_accuracy')
+                try:
+                    min_accuracy = float(min_accuracy) if min_accuracy else None
+                except ValueError:
+                    return JsonResponse({'error': 'Invalid min_accuracy'}, status=400)
                 
-                # Check if the model file exists
-                if not os.path.exists(model_path):
-                    logger.error(f"Model file not found: {model_path}")
-                    return JsonResponse({'error': 'Model file not found'}, status=404)
+                # Get model
+                try:
+                    # First check if the model exists at all ('auto': fastest model meeting min_accuracy)
+                    model_obj = TrainedModel.resolve(model_id, user=default_user(), min_accuracy=min_accuracy)
+                except TrainedModel.DoesNotExist:
+                    logger.error(f"Model with ID {model_id} not found")
+                    return JsonResponse({'error': 'Model not found. Please select a valid model.'}, status=404)
                 
-            except TrainedModel.DoesNotExist:
-                logger.error(f"Model with ID {model_id} not found")
-                return JsonResponse({'error': 'Model not found. Please select a valid model.'}, status=404)
-            
-            # Load model
-            try:
-                with open(model_path, 'rb') as f:
-                    model_data = pickle.load(f)
-                    model = model_data['model']
-                    label_mapping = model_data.get('label_mapping', {})
-                    inverse_label_mapping = {v: k for k, v in label_mapping.items()}
-            except Exception as e:
-                logger.error(f"Error loading model file: {str(e)}")
-                return JsonResponse({'error': 'Error loading model file'}, status=500)
-            
-            # Initialize MediaPipe with lower detection confidence
-            hands = mp_hands.Hands(
-                static_image_mode=True,  # Set to True for better accuracy with still images
-                max_num_hands=2,
-                min_detection_confidence=0.2  # Lower threshold for better detection
-            )
-            pose = mp_pose.Pose(
-                static_image_mode=True,  # Set to True for better accuracy with still images
-                min_detection_confidence=0.2  # Lower threshold for better detection
-            )
+                # Load model (shared cache, only read from disk on a miss)
+                try:
+                    loaded = model_cache.get(model_obj)
+                except FileNotFoundError:
+                    logger.error(f"Model file not found: {model_cache.model_path(model_obj)}")
+                    return JsonResponse({'error': 'Model file not found'}, status=404)
+                except Exception as e:
+                    logger.error(f"Error loading model file: {str(e)}")
+                    return JsonResponse({'error': 'Error loading model file'}, status=500)
+            model = loaded.predictor
+            inverse_label_mapping = loaded.inverse_label_mapping
             
             # Extract landmarks
             frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -696,8 +730,9 @@ def translate_frame(request):
             # Enhance image for better detection
             frame_rgb = cv2.convertScaleAbs(frame_rgb, alpha=1.5, beta=15)
             
-            hand_results = hands.process(frame_rgb)
-            pose_results = pose.process(frame_rgb)
+            # Static-image detectors (lower detection confidence) from the shared pool
+            with static_detectors.checkout() as detector:
+                hand_results, pose_results = detector.process(frame_rgb)
             
             # Draw landmarks on frame
             frame_with_skeleton = frame.copy()
@@ -738,29 +773,7 @@ def translate_frame(request):
                 )
             
             # Extract features
-            data_aux = []
-            if hand_results.multi_hand_landmarks:
-                for hand_landmarks in hand_results.multi_hand_landmarks:
-                    x_ = [landmark.x for landmark in hand_landmarks.landmark]
-                    y_ = [landmark.y for landmark in hand_landmarks.landmark]
-                    if x_ and y_:
-                        for i in range(len(hand_landmarks.landmark)):
-                            x = hand_landmarks.landmark[i].x
-                            y = hand_landmarks.landmark[i].y
-                            data_aux.append(x - min(x_))
-                            data_aux.append(y - min(y_))
-            
-            if pose_results.pose_landmarks:
-                pose_landmarks = pose_results.pose_landmarks.landmark
-                left_elbow = pose_landmarks[13]
-                data_aux.append(left_elbow.x * w)
-                data_aux.append(left_elbow.y * h)
-                right_elbow = pose_landmarks[14]
-                data_aux.append(right_elbow.x * w)
-                data_aux.append(right_elbow.y * h)
-            
-            if len(data_aux) < 88:
-                data_aux.extend([0.0] * (88 - len(data_aux)))
+            data_aux = extract_features(hand_results, pose_results, w, h)
             
             # Make prediction
             if model and len(data_aux) == 88 and hands_detected:
@@ -828,3 +841,46 @@ def translate_frame(request):
             return JsonResponse({'error': str(e)}, status=500)
     
     return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+
+def runtime_stats(request):
+    # Process-level inference metrics
+    return JsonResponse({
+        'model_cache': model_cache.stats(),
+        'detectors': detector_stats(),
+        'inference': inference_executor.stats(),
+        'prediction_batching': prediction_batcher.stats(),
+        'jobs': job_queue.stats(),
+        'startup': startup.report(),
+    })
+
+def readiness(request):
+    # Waits (up to ?timeout= seconds) until detectors and models are warmed up; 503 until then
+    try:
+        timeout = min(float(request.GET.get('timeout', settings.READINESS_TIMEOUT)), settings.READINESS_TIMEOUT)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid timeout'}, status=400)
+    ready = startup.wait(max(timeout, 0.0))
+    return JsonResponse(startup.report(), status=200 if ready else 503)
+
+def job_list(request):
+    # Recent jobs of the current user, newest first
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 0), 100)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit'}, status=400)
+    jobs = Job.objects.filter(created_by=request.user).order_by('-created_at')[:limit]
+    return JsonResponse({'jobs': [job.as_dict() for job in jobs]})
+
+def job_status(request, job_id):
+    job = get_object_or_404(Job, pk=job_id, created_by=request.user)
+    return JsonResponse(job.as_dict())
+
+def cancel_job(request, job_id):
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Only POST method is allowed'}, status=405)
+    job = get_object_or_404(Job, pk=job_id, created_by=request.user)
+    if job.is_finished:
+        return JsonResponse({'error': f'Job already {job.state}'}, status=409)
+    job_queue.cancel(job)
+    job.refresh_from_db()
+    return JsonResponse(job.as_dict())